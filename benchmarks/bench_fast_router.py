@@ -0,0 +1,128 @@
+"""
+Benchmark: fast-path router latency and agreement with the LLM router.
+
+Trains a RoutingClassifier on routed tickets and, on held-out tickets,
+reports the latency of a local routing decision and, per confidence
+threshold, the share of tickets answered locally (coverage) and how often
+those answers agree with the LLM's team, priority and escalation.
+
+By default the tickets are synthetic: per-team issue phrasings with shared
+filler, tickets mixing two teams' issues, and LLM labels that disagree
+with themselves on a share of tickets. With --database, the completed
+tickets stored in SQLITE_PATH and their LLM routing results are used
+instead.
+
+Usage:
+    python benchmarks/bench_fast_router.py [--tickets 20000] [--database] [--holdout 0.2]
+"""
+import sys
+import time
+import random
+import argparse
+from pathlib import Path
+
+import numpy as np
+
+# Add the project root to sys.path
+root_dir = Path(__file__).parent.parent
+sys.path.append(str(root_dir))
+
+from src.utils.fast_router import FastRouter, RoutingClassifier, TEAMS
+
+ISSUES = {
+    "Technical Support": [
+        "the app crashes when I open {thing}", "I get error {code} when saving {thing}",
+        "{thing} has been very slow since the update", "the integration with {thing} stopped syncing",
+    ],
+    "Billing": [
+        "I was charged twice for {thing}", "I need a refund for {thing}",
+        "my invoice for {thing} shows the wrong amount", "how do I change the card used for {thing}",
+    ],
+    "Product": [
+        "is there a way to export {thing}", "can you add dark mode to {thing}",
+        "how do I use the new {thing} feature", "the documentation for {thing} is unclear",
+    ],
+    "Security": [
+        "someone logged into my account from {thing}", "I need to reset two factor authentication",
+        "I got a suspicious password reset email about {thing}", "please delete my personal data from {thing}",
+    ],
+    "Customer Success": [
+        "we are onboarding a new team to {thing}", "I want to talk about renewing our contract for {thing}",
+        "who is our account manager for {thing}", "we are considering cancelling {thing}",
+    ],
+}
+THINGS = ["the dashboard", "reports", "the mobile app", "our workspace", "the API", "the premium plan"]
+PRIORITIES = {"Technical Support": "high", "Billing": "medium", "Product": "low",
+              "Security": "critical", "Customer Success": "medium"}
+
+
+def synthetic_tickets(count: int, label_noise: float = 0.08, mixed: float = 0.1, seed: int = 0):
+    """Conversations with the routing an LLM would (mostly) give them."""
+    rng = random.Random(seed)
+    conversations, labels = [], []
+    for n in range(count):
+        team = rng.choice(TEAMS)
+        issue = rng.choice(ISSUES[team]).format(thing=rng.choice(THINGS), code=rng.randint(100, 599))
+        if rng.random() < mixed:
+            other = rng.choice(TEAMS)
+            issue += ", also " + rng.choice(ISSUES[other]).format(thing=rng.choice(THINGS), code=rng.randint(100, 599))
+        conversations.append(
+            f"Customer: Hi, {issue}. My account is customer{n}@example.com. "
+            f"Agent: Thanks for reaching out, could you share more details? Customer: It started {rng.randint(1, 9)} days ago."
+        )
+        if rng.random() < label_noise:
+            team = rng.choice(TEAMS)
+        labels.append({
+            "team": team,
+            "priority": PRIORITIES[team],
+            "escalation_needed": team == "Security",
+            "skills_required": [team.lower()],
+        })
+    return conversations, labels
+
+
+def stored_tickets(limit: int):
+    """Conversations and LLM routing labels of the completed tickets in the database."""
+    router = FastRouter(max_training_tickets=limit)
+    return router.training_data()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--tickets", type=int, default=20000)
+    parser.add_argument("--database", action="store_true", help="use the stored tickets instead of synthetic ones")
+    parser.add_argument("--holdout", type=float, default=0.2)
+    args = parser.parse_args()
+
+    conversations, labels = stored_tickets(args.tickets) if args.database else synthetic_tickets(args.tickets)
+    if len(labels) < 50:
+        sys.exit(f"Only {len(labels)} usable routed tickets")
+    order = np.random.default_rng(0).permutation(len(labels))
+    split = int(len(labels) * (1 - args.holdout))
+    train, test = order[:split], order[split:]
+
+    start = time.perf_counter()
+    classifier = RoutingClassifier.train([conversations[i] for i in train], [labels[i] for i in train])
+    print(f"Trained on {len(train):,} tickets in {time.perf_counter() - start:.1f}s; testing on {len(test):,}")
+
+    latencies, predictions = [], []
+    for i in test:
+        start = time.perf_counter()
+        predictions.append(classifier.predict(conversations[i]))
+        latencies.append((time.perf_counter() - start) * 1e6)
+    print(f"Local routing latency: p50 {np.percentile(latencies, 50):.0f} us, p99 {np.percentile(latencies, 99):.0f} us")
+
+    print(f"{'threshold':>10}{'coverage':>10}{'team':>8}{'priority':>10}{'escalation':>12}")
+    for threshold in (0.0, 0.5, 0.6, 0.7, 0.8, 0.9):
+        covered = [(routing, labels[i]) for (routing, confidence), i in zip(predictions, test) if confidence >= threshold]
+        if not covered:
+            print(f"{threshold:>10.1f}{0:>10.1%}")
+            continue
+        agree = {field: np.mean([routing[field] == label[field] for routing, label in covered])
+                 for field in ("team", "priority", "escalation_needed")}
+        print(f"{threshold:>10.1f}{len(covered) / len(test):>10.1%}{agree['team']:>8.1%}"
+              f"{agree['priority']:>10.1%}{agree['escalation_needed']:>12.1%}")
+
+
+if __name__ == "__main__":
+    main()
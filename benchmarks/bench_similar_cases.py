@@ -0,0 +1,91 @@
+"""
+Benchmark: similar-case retrieval latency and recall at scale.
+
+Fills a SimilarCaseIndex with synthetic clustered embeddings (tickets about
+the same issue lie close together, as real embeddings do) and times top-k
+searches with the exact scan against the IVF index the index switches to
+past SIMILAR_CASES_CONFIG["ivf_threshold"], reporting recall@k of the IVF
+results against the exact ones.
+
+Usage:
+    python benchmarks/bench_similar_cases.py [--rows 1000000] [--dimensions 256] [--probes 8]
+"""
+import sys
+import time
+import argparse
+from pathlib import Path
+
+import numpy as np
+
+# Add the project root to sys.path
+root_dir = Path(__file__).parent.parent
+sys.path.append(str(root_dir))
+
+from src.utils.similar_cases import HashingEmbedder, SimilarCaseIndex
+
+
+def clustered_vectors(centers: np.ndarray, rows: int, noise: float, seed: int) -> np.ndarray:
+    """Normalized vectors spread around random topic directions."""
+    rng = np.random.default_rng(seed)
+    vectors = np.empty((rows, centers.shape[1]), dtype=np.float32)
+    for start in range(0, rows, 100000):
+        count = min(100000, rows - start)
+        chunk = centers[rng.integers(0, len(centers), count)]
+        chunk += noise * rng.standard_normal((count, centers.shape[1])).astype(np.float32)
+        vectors[start:start + count] = chunk / np.linalg.norm(chunk, axis=1, keepdims=True)
+    return vectors
+
+
+def time_searches(index: SimilarCaseIndex, queries: np.ndarray, k: int):
+    """Per-query latencies in milliseconds and the returned ticket IDs."""
+    latencies, results = [], []
+    for query in queries:
+        start = time.perf_counter()
+        matches = index.search_vector(query, k=k)
+        latencies.append((time.perf_counter() - start) * 1000)
+        results.append([case["ticket_id"] for _, case in matches])
+    return np.array(latencies), results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=1000000)
+    parser.add_argument("--dimensions", type=int, default=256)
+    parser.add_argument("--topics", type=int, default=2000)
+    parser.add_argument("--noise", type=float, default=0.6, help="spread of tickets around their topic")
+    parser.add_argument("--probes", type=int, default=8)
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--k", type=int, default=3)
+    args = parser.parse_args()
+
+    print(f"Generating {args.rows:,} x {args.dimensions} embeddings...")
+    centers = np.random.default_rng(0).standard_normal((args.topics, args.dimensions)).astype(np.float32)
+    vectors = clustered_vectors(centers, args.rows, args.noise, seed=1)
+    ids = [str(n) for n in range(args.rows)]
+    cases = [{"ticket_id": ticket_id} for ticket_id in ids]
+    # New tickets about the same topics
+    queries = clustered_vectors(centers, args.queries, args.noise, seed=2)
+
+    exact = SimilarCaseIndex(HashingEmbedder(args.dimensions), ivf_threshold=args.rows + 1)
+    exact.add_vectors(ids, vectors, cases)
+    exact_ms, exact_ids = time_searches(exact, queries, args.k)
+    del exact
+
+    start = time.perf_counter()
+    ivf = SimilarCaseIndex(HashingEmbedder(args.dimensions), ivf_threshold=1, ivf_probes=args.probes)
+    ivf.add_vectors(ids, vectors, cases)
+    build = time.perf_counter() - start
+    ivf_ms, ivf_ids = time_searches(ivf, queries, args.k)
+
+    recall = np.mean([len(set(a) & set(b)) / len(a) for a, b in zip(exact_ids, ivf_ids)])
+    stats = ivf.stats()
+    print(f"Index: {stats['tickets']:,} tickets, {stats['ivf_lists']} IVF lists, "
+          f"{stats['memory_bytes'] / 2 ** 20:.0f} MiB of vectors, IVF built in {build:.1f}s")
+    print(f"{'search':<14}{'p50 ms':>10}{'p99 ms':>10}")
+    print(f"{'exact scan':<14}{np.percentile(exact_ms, 50):>10.2f}{np.percentile(exact_ms, 99):>10.2f}")
+    print(f"{'ivf':<14}{np.percentile(ivf_ms, 50):>10.2f}{np.percentile(ivf_ms, 99):>10.2f}")
+    print(f"IVF recall@{args.k} vs exact: {recall:.3f} ({args.probes} probes)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+"""
+Comparison harness: staged vs. fused ticket pipeline.
+
+Runs the same tickets through Orchestrator.process_ticket in both modes and
+reports the wall-clock latency and the field completeness of the results
+(the share of SummaryResult/RoutingResult/RecommendationResult/
+EstimationResult fields, plus final_insights, that came back non-empty).
+Needs a reachable Ollama backend (OLLAMA_BASE_URL). Run with
+LLM_CACHE_ENABLED=false so that repeated runs hit the model.
+
+Usage:
+    python benchmarks/compare_pipeline_modes.py [--runs N] [--tickets tickets.json]
+"""
+import sys
+import json
+import time
+import argparse
+import statistics
+from pathlib import Path
+
+# Add the project root to sys.path
+root_dir = Path(__file__).parent.parent
+sys.path.append(str(root_dir))
+
+from src.agents.orchestrator import Orchestrator
+from src.agents.fused_agent import SECTIONS
+
+
+SAMPLE_TICKETS = [
+    {
+        "ticket_id": "compare-001",
+        "conversation": """
+        Customer: Hi, I've been trying to access the admin dashboard for our company account, but I keep getting an error message saying 'Access Denied'.
+        Agent: Could you please provide me with your account details so I can look into this issue?
+        Customer: Our company account is ABC Corp, and I'm the admin user john.doe@abccorp.com. I was able to log in yesterday, but today it's not working.
+        Agent: There was a system update last night which might be affecting admin access. How urgent is this?
+        Customer: It's quite urgent. I need to generate reports for a meeting this afternoon.
+        """,
+        "metadata": {"subscription_tier": "enterprise"},
+    },
+    {
+        "ticket_id": "compare-002",
+        "conversation": """
+        Customer: I was charged twice for my monthly subscription this month. Can you refund one of the charges?
+        Agent: I'm sorry about that. Can you share the last four digits of the card and the dates of the charges?
+        Customer: Card ending 4242, both charges on the 3rd.
+        """,
+        "metadata": {"subscription_tier": "basic"},
+    },
+]
+
+
+def is_filled(value) -> bool:
+    return value not in (None, "", [], {}, "unknown")
+
+
+def completeness(results) -> float:
+    """Share of expected result fields that are non-empty."""
+    filled = total = 0
+    for section, schema_class in SECTIONS.items():
+        section_result = results.get(section) or {}
+        for field in schema_class.__annotations__:
+            total += 1
+            filled += is_filled(section_result.get(field))
+    total += 1
+    filled += is_filled(results.get("final_insights"))
+    return filled / total
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=3, help="Runs per ticket and mode")
+    parser.add_argument("--tickets", help="JSON file with a list of tickets (defaults to built-in samples)")
+    args = parser.parse_args()
+
+    tickets = json.loads(Path(args.tickets).read_text()) if args.tickets else SAMPLE_TICKETS
+    orchestrator = Orchestrator()
+
+    for mode in Orchestrator.MODES:
+        latencies, scores = [], []
+        for _ in range(args.runs):
+            for ticket in tickets:
+                start = time.perf_counter()
+                results = orchestrator.process_ticket(ticket, mode=mode)
+                latencies.append(time.perf_counter() - start)
+                scores.append(completeness(results))
+        print(
+            f"{mode:>7}: latency mean {statistics.mean(latencies):6.2f} s, "
+            f"median {statistics.median(latencies):6.2f} s, max {max(latencies):6.2f} s | "
+            f"field completeness {statistics.mean(scores):6.1%} over {len(latencies)} tickets"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -11,6 +11,145 @@ LLM_CONFIG = {
     "api_key": os.getenv("OPENAI_API_KEY"),
     "temperature": 0.7,
     "max_tokens": 2048,
+    "base_url": os.getenv("OLLAMA_BASE_URL", "http://localhost:11434"),
+    # Shared client pool (see src/utils/llm_client.py)
+    "max_concurrency": int(os.getenv("LLM_MAX_CONCURRENCY", 8)),
+    "max_connections": int(os.getenv("LLM_MAX_CONNECTIONS", 16)),
+    "max_keepalive_connections": int(os.getenv("LLM_MAX_KEEPALIVE_CONNECTIONS", 16)),
+    # Constrain agent output to the JSON schema of their result models
+    # (falls back to prompt-described JSON if the backend rejects it)
+    "structured_output": os.getenv("LLM_STRUCTURED_OUTPUT", "False").lower() == "true",
+}
+
+# LLM Call Deadlines, Hedging and Circuit Breaking (see src/utils/resilience.py)
+LLM_RESILIENCE_CONFIG = {
+    # Deadline of one LLM call of an agent, in seconds (0 for none); agents
+    # may override it with a "timeout" in AGENT_CONFIG
+    "agent_timeout": float(os.getenv("LLM_AGENT_TIMEOUT", os.getenv("DEFAULT_TIMEOUT", 30))),
+    # Deadline of the final insights call, which writes the longest completion
+    "final_timeout": float(os.getenv("LLM_FINAL_TIMEOUT", 90)),
+    # Deadline of all LLM calls of one ticket together (0 for none)
+    "ticket_deadline": float(os.getenv("LLM_TICKET_DEADLINE", 180)),
+    # Second Ollama backend receiving a duplicate of calls that run past the
+    # chain's latency percentile, and the calls of an unhealthy primary ("" to disable)
+    "hedge_base_url": os.getenv("LLM_HEDGE_BASE_URL", ""),
+    "hedge_percentile": float(os.getenv("LLM_HEDGE_PERCENTILE", 95)),
+    # Latency samples needed before the percentile is trusted; until then
+    # calls are hedged after hedge_default_delay seconds
+    "hedge_min_samples": int(os.getenv("LLM_HEDGE_MIN_SAMPLES", 20)),
+    "hedge_default_delay": float(os.getenv("LLM_HEDGE_DEFAULT_DELAY", 10)),
+    # Threads running the attempts of hedged calls, shared by the whole process;
+    # attempts beyond it wait for a thread (within their deadline)
+    "hedge_max_workers": int(os.getenv("LLM_HEDGE_MAX_WORKERS", 32)),
+    # Consecutive failures opening a backend's circuit, and seconds before a trial call
+    "breaker_failure_threshold": int(os.getenv("LLM_BREAKER_FAILURE_THRESHOLD", 5)),
+    "breaker_reset_seconds": float(os.getenv("LLM_BREAKER_RESET_SECONDS", 30)),
+    # Coalesce concurrent calls rendering the identical prompt into one LLM call
+    "coalesce_calls": os.getenv("LLM_COALESCE_CALLS", "True").lower() == "true",
+}
+
+# LLM Response Cache Configuration
+LLM_CACHE_CONFIG = {
+    # Opt-in: a cached completion outlives changes to the prompt's template
+    # or the model served under the same name until its TTL expires
+    "enabled": os.getenv("LLM_CACHE_ENABLED", "False").lower() == "true",
+    "sqlite_path": os.getenv("LLM_CACHE_PATH", "data/llm_cache.db"),
+    "max_memory_entries": int(os.getenv("LLM_CACHE_MAX_MEMORY_ENTRIES", 1024)),
+    "max_disk_entries": int(os.getenv("LLM_CACHE_MAX_DISK_ENTRIES", 50000)),
+    "ttl_seconds": int(os.getenv("LLM_CACHE_TTL_SECONDS", 86400)),
+}
+
+# Prompt Context Budget Configuration
+CONTEXT_BUDGET_CONFIG = {
+    # Downstream prompts above this many (approximate) tokens get the summary
+    # instead of the raw conversation; 0 disables the swap
+    "max_prompt_tokens": int(os.getenv("PROMPT_TOKEN_BUDGET", 2048)),
+}
+
+# Ticket Pipeline Configuration
+PIPELINE_CONFIG = {
+    # Named agent graph of the orchestrator (see PIPELINE_GRAPHS in
+    # src/agents/orchestrator.py): "sequential" or "parallel"
+    "graph": os.getenv("PIPELINE_GRAPH", "sequential"),
+    # Default pipeline mode: "staged" (one call per agent) or "fused" (one
+    # call for the whole analysis); overridable per ticket
+    "mode": os.getenv("PIPELINE_MODE", "staged"),
+    # Batch submissions (POST /process_tickets/batch)
+    "batch_chunk_size": int(os.getenv("BATCH_CHUNK_SIZE", 64)),
+    "batch_max_concurrency": int(os.getenv("BATCH_MAX_CONCURRENCY", 8)),
+    "batch_max_tickets": int(os.getenv("BATCH_MAX_TICKETS", 50000)),
+    # Concurrent submissions of the same conversation share one pipeline run
+    "coalesce_tickets": os.getenv("PIPELINE_COALESCE_TICKETS", "True").lower() == "true",
+}
+
+# Similar-case retrieval for the recommender (see src/utils/similar_cases.py)
+SIMILAR_CASES_CONFIG = {
+    "enabled": os.getenv("SIMILAR_CASES_ENABLED", "True").lower() == "true",
+    # Local sentence-transformers model name or path; "" (or a model that
+    # cannot be loaded) uses feature hashing with `dimensions` dimensions
+    "embedding_model": os.getenv("SIMILAR_CASES_EMBEDDING_MODEL", ""),
+    "dimensions": int(os.getenv("SIMILAR_CASES_DIMENSIONS", 256)),
+    "top_k": int(os.getenv("SIMILAR_CASES_TOP_K", 3)),
+    "min_similarity": float(os.getenv("SIMILAR_CASES_MIN_SIMILARITY", 0.3)),
+    # Index size from which searches only scan the closest k-means lists
+    "ivf_threshold": int(os.getenv("SIMILAR_CASES_IVF_THRESHOLD", 50000)),
+    "ivf_probes": int(os.getenv("SIMILAR_CASES_IVF_PROBES", 8)),
+    # Seconds between catch-ups with tickets completed by other processes
+    "sync_interval": float(os.getenv("SIMILAR_CASES_SYNC_INTERVAL", 30)),
+}
+
+# Fast-path routing: a local classifier trained on stored routing results
+# answers the tickets it is confident about without the router's LLM call
+FAST_ROUTER_CONFIG = {
+    "enabled": os.getenv("FAST_ROUTER_ENABLED", "True").lower() == "true",
+    # Lowest probability of the predicted team, priority and escalation
+    # that is answered locally; below it the LLM routes the ticket
+    "min_confidence": float(os.getenv("FAST_ROUTER_MIN_CONFIDENCE", 0.8)),
+    # Routed tickets needed before the classifier is used, and the latest
+    # ones it is trained on
+    "min_training_tickets": int(os.getenv("FAST_ROUTER_MIN_TRAINING_TICKETS", 200)),
+    "max_training_tickets": int(os.getenv("FAST_ROUTER_MAX_TRAINING_TICKETS", 50000)),
+    # Seconds between retrainings on the latest stored results
+    "retrain_interval": float(os.getenv("FAST_ROUTER_RETRAIN_INTERVAL", 3600)),
+}
+
+# Resolution-time estimates from the history of resolved tickets
+RESOLUTION_MODEL_CONFIG = {
+    # "hybrid": the model's p50/p90 hours with the LLM's bottlenecks and
+    # suggestions; "fast": the model only, no LLM call; "llm": the LLM only.
+    # Without enough resolved tickets the LLM estimates in every mode.
+    "mode": os.getenv("RESOLUTION_MODEL_MODE", "hybrid"),
+    "min_training_tickets": int(os.getenv("RESOLUTION_MODEL_MIN_TRAINING_TICKETS", 200)),
+    "max_training_tickets": int(os.getenv("RESOLUTION_MODEL_MAX_TRAINING_TICKETS", 50000)),
+    "retrain_interval": float(os.getenv("RESOLUTION_MODEL_RETRAIN_INTERVAL", 3600)),
+}
+
+# Near-duplicate detection: a new ticket whose conversation is a near copy of
+# a completed ticket's reuses that ticket's results instead of the pipeline
+NEAR_DUPLICATE_CONFIG = {
+    "enabled": os.getenv("NEAR_DUPLICATE_ENABLED", "True").lower() == "true",
+    # Minimum estimated Jaccard similarity of the conversations' word shingles
+    "threshold": float(os.getenv("NEAR_DUPLICATE_THRESHOLD", 0.9)),
+    "shingle_size": int(os.getenv("NEAR_DUPLICATE_SHINGLE_SIZE", 3)),
+    # MinHash permutations, split into LSH bands of num_perm / bands rows
+    "num_perm": int(os.getenv("NEAR_DUPLICATE_NUM_PERM", 64)),
+    "bands": int(os.getenv("NEAR_DUPLICATE_BANDS", 8)),
+    "sync_interval": float(os.getenv("NEAR_DUPLICATE_SYNC_INTERVAL", 30)),
+}
+
+# Job Queue Configuration (see src/utils/job_queue.py)
+JOB_QUEUE_CONFIG = {
+    # "sqlite" (durable local queue), "rabbitmq" (shared across nodes) or "memory"
+    "backend": os.getenv("JOB_QUEUE_BACKEND", "sqlite"),
+    "sqlite_path": os.getenv("JOB_QUEUE_PATH", "data/job_queue.db"),
+    # Worker threads started by the API process (0 to only enqueue, with standalone workers)
+    "workers": int(os.getenv("JOB_WORKERS", 4)),
+    # Pending jobs beyond which submissions are rejected with 429
+    "max_depth": int(os.getenv("JOB_QUEUE_MAX_DEPTH", 10000)),
+    "poll_interval": float(os.getenv("JOB_POLL_INTERVAL", 0.5)),
+    # Seconds before a job claimed by a crashed or hung worker is handed out again
+    "lease_seconds": float(os.getenv("JOB_LEASE_SECONDS", 900)),
+    "max_attempts": int(os.getenv("JOB_MAX_ATTEMPTS", 3)),
 }
 
 # Agent Configuration
@@ -18,39 +157,55 @@ AGENT_CONFIG = {
     "summarizer": {
         "name": "Summarizer Agent",
         "description": "Analyzes customer conversations to generate concise summaries and extract actionable insights.",
+        "use_cache": LLM_CACHE_CONFIG["enabled"],
     },
     "router": {
         "name": "Router Agent",
         "description": "Intelligently routes tasks to appropriate teams based on content analysis and historical patterns.",
+        "use_cache": LLM_CACHE_CONFIG["enabled"],
     },
     "recommender": {
         "name": "Recommender Agent",
         "description": "Suggests resolutions by analyzing historical data and knowledge bases.",
+        "use_cache": LLM_CACHE_CONFIG["enabled"],
     },
     "estimator": {
         "name": "Estimator Agent",
         "description": "Predicts resolution times and optimizes workflows to minimize delays.",
+        "use_cache": LLM_CACHE_CONFIG["enabled"],
+    },
+    "fused": {
+        "name": "Fused Analysis Agent",
+        "description": "Summarizes, routes, recommends and estimates a ticket in a single call.",
+        "use_cache": LLM_CACHE_CONFIG["enabled"],
+        # One call does the work of four agents
+        "timeout": float(os.getenv("FUSED_AGENT_TIMEOUT", 2 * LLM_RESILIENCE_CONFIG["agent_timeout"])),
     },
     # Data Product Design Agents
     "use_case_analyzer": {
         "name": "Use Case Analyzer Agent",
         "description": "Analyzes business requirements and extracts key data product specifications.",
+        "use_cache": LLM_CACHE_CONFIG["enabled"],
     },
     "data_model_designer": {
         "name": "Data Model Designer Agent",
         "description": "Designs optimal data structures based on business requirements and use cases.",
+        "use_cache": LLM_CACHE_CONFIG["enabled"],
     },
     "source_mapping": {
         "name": "Source Mapping Agent",
         "description": "Identifies and maps source systems and attributes to target data models.",
+        "use_cache": LLM_CACHE_CONFIG["enabled"],
     },
     "data_flow": {
         "name": "Data Flow Agent",
         "description": "Designs ingress and egress processes for the data product.",
+        "use_cache": LLM_CACHE_CONFIG["enabled"],
     },
     "certification": {
         "name": "Certification Agent",
         "description": "Validates data products against quality standards and requirements.",
+        "use_cache": LLM_CACHE_CONFIG["enabled"],
     },
 }
 
@@ -58,6 +213,18 @@ AGENT_CONFIG = {
 DB_CONFIG = {
     "sqlite_path": os.getenv("SQLITE_PATH", "data/lightspeed.db"),
     "connect_args": {"check_same_thread": False},
+    # SQLite tuning applied to every pooled connection: WAL lets readers run
+    # alongside the writer, NORMAL sync only fsyncs at WAL checkpoints
+    "journal_mode": os.getenv("SQLITE_JOURNAL_MODE", "WAL"),
+    "synchronous": os.getenv("SQLITE_SYNCHRONOUS", "NORMAL"),
+    "busy_timeout_ms": int(os.getenv("SQLITE_BUSY_TIMEOUT_MS", 5000)),
+    "mmap_size": int(os.getenv("SQLITE_MMAP_SIZE", 268435456)),
+    "cache_size_kib": int(os.getenv("SQLITE_CACHE_SIZE_KIB", 65536)),
+    "pool_size": int(os.getenv("DB_POOL_SIZE", 8)),
+    "max_overflow": int(os.getenv("DB_MAX_OVERFLOW", 8)),
+    # Group commit of result and status writes (see src/utils/group_commit.py)
+    "write_batch_size": int(os.getenv("DB_WRITE_BATCH_SIZE", 64)),
+    "write_linger_ms": float(os.getenv("DB_WRITE_LINGER_MS", 2)),
 }
 
 # API Configuration
@@ -67,12 +234,38 @@ API_CONFIG = {
     "debug": os.getenv("DEBUG", "False").lower() == "true",
 }
 
+# Job Scheduling Configuration
+SCHEDULER_CONFIG = {
+    # Dispatch shares of the priority lanes under load (weighted fair queuing)
+    "lane_weights": {
+        "critical": float(os.getenv("SCHEDULER_WEIGHT_CRITICAL", 8)),
+        "high": float(os.getenv("SCHEDULER_WEIGHT_HIGH", 4)),
+        "normal": float(os.getenv("SCHEDULER_WEIGHT_NORMAL", 2)),
+        "bulk": float(os.getenv("SCHEDULER_WEIGHT_BULK", 1)),
+    },
+    # Subscription tiers whose tickets take the high lane
+    "priority_tiers": [tier.strip() for tier in os.getenv("SCHEDULER_PRIORITY_TIERS", "enterprise").split(",") if tier.strip()],
+    # Metadata fields identifying the tenant of a ticket, first match wins
+    "tenant_fields": [field.strip() for field in os.getenv("SCHEDULER_TENANT_FIELDS", "tenant_id,customer_id,company").split(",") if field.strip()],
+    # Jobs of one tenant running at once (0 for no cap)
+    "tenant_max_concurrency": int(os.getenv("SCHEDULER_TENANT_MAX_CONCURRENCY", 2)),
+    # Queue slots bulk jobs cannot take, kept for interactive tickets
+    "reserved_depth": int(os.getenv("SCHEDULER_RESERVED_DEPTH", 1000)),
+}
+
 # RabbitMQ Configuration
 RABBITMQ_CONFIG = {
     "host": os.getenv("RABBITMQ_HOST", "localhost"),
     "port": int(os.getenv("RABBITMQ_PORT", 5672)),
     "username": os.getenv("RABBITMQ_USERNAME", "guest"),
     "password": os.getenv("RABBITMQ_PASSWORD", "guest"),
+    "virtual_host": os.getenv("RABBITMQ_VHOST", "/"),
+    "queue": os.getenv("RABBITMQ_QUEUE", "ticket_jobs"),
+    # Unacknowledged jobs per consumer, which are also processed concurrently
+    "prefetch_count": int(os.getenv("RABBITMQ_PREFETCH_COUNT", 4)),
+    "heartbeat": int(os.getenv("RABBITMQ_HEARTBEAT", 60)),
+    # Priority queue levels for the scheduler lanes (0 for a plain FIFO queue)
+    "max_priority": int(os.getenv("RABBITMQ_MAX_PRIORITY", 0)),
 }
 
 # System Parameters
@@ -12,14 +12,6 @@ logger = logging.getLogger("lightspeed")
 # Ensure data directory exists
 os.makedirs("data", exist_ok=True)
 
-# Delete existing database if it exists (for testing)
-if os.path.exists("data/lightspeed.db"):
-    try:
-        os.remove("data/lightspeed.db")
-        logger.info("Removed existing database file")
-    except Exception as e:
-        logger.error(f"Failed to remove database file: {e}")
-
 # Start the server
 logger.info("Starting Lightspeed API server")
 uvicorn.run(
@@ -0,0 +1,13 @@
+#!/usr/bin/env python
+"""
+Lightspeed: AI-Driven Customer Support System
+Run script for starting a standalone ticket worker
+"""
+
+import os
+from src.worker import main
+
+if __name__ == "__main__":
+    # Create data directory if it doesn't exist
+    os.makedirs("data", exist_ok=True)
+    main()
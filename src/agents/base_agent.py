@@ -1,7 +1,9 @@
 from abc import ABC, abstractmethod
-from typing import Dict, Any, List, Optional, get_origin, get_args
-import json
-import re
+from typing import Dict, Any, List, Optional, Callable, Iterator, AsyncIterator, Type, get_origin, get_args
+from contextlib import nullcontext
+import time
+import asyncio
+import threading
 
 from langchain_ollama import OllamaLLM
 from langchain.prompts import PromptTemplate
@@ -9,42 +11,479 @@ from langchain.pydantic_v1 import BaseModel, Field
 from langchain.output_parsers import PydanticOutputParser
 from langchain.schema.output_parser import StrOutputParser
 
-from config.config import LLM_CONFIG
+from config.config import LLM_CONFIG, LLM_RESILIENCE_CONFIG
+from src.utils.llm_cache import LLMResponseCache, get_llm_cache
+from src.utils.llm_client import LLMConcurrencyLimiter, get_llm, get_llm_registry
+from src.utils.json_stream import JSONStreamExtractor, extract_first_json_object
+from src.utils.structured_output import json_schema_for, strip_format_instructions
+from src.utils.context_budget import prompt_tokens
+from src.utils.resilience import (
+    CircuitOpenError, HedgeCancelled, TicketDeadlineExceeded, LatencyTracker, call_deadline,
+    check_deadline, ticket_budget_spent, remaining, run_hedged, arun_hedged, get_circuit_breaker
+)
+from src.utils.single_flight import get_single_flight
+
+
+class ChainWrapper:
+    """
+    Chain-like wrapper around an LCEL runnable (prompt | llm | parser).
+
+    Keeps the older `chain.run(inputs)` interface and, when a cache is given,
+    serves byte-identical prompts from the LLM response cache instead of
+    calling the model again. Calls that do reach the model hold a slot of the
+    shared concurrency limiter, if one is given.
+
+    When an output schema is given, the LLM is bound to the backend's
+    format-constrained decoding; if the backend rejects the call, the chain
+    falls back to `fallback_prompt` without the constraint.
+
+    Every call is bounded by `timeout` and by the deadline of the ticket
+    being processed (see src/utils/resilience.py), and goes through the
+    circuit breaker of its backend, failing fast with CircuitOpenError while
+    the backend is unhealthy. With a `hedge_llm`, a call still running after
+    the chain's p95 latency is duplicated to that second backend and the
+    first completion wins; the hedge also takes over right away when the
+    primary fails or its circuit is open.
+
+    Concurrent calls rendering the identical prompt for the same model are
+    coalesced into one LLM call (see SingleFlight), so a retry storm does
+    not multiply the load on the backend.
+    """
+
+    def __init__(
+        self,
+        prompt: PromptTemplate,
+        llm: OllamaLLM,
+        cache: Optional[LLMResponseCache] = None,
+        limiter: Optional[LLMConcurrencyLimiter] = None,
+        output_schema: Optional[Dict[str, Any]] = None,
+        fallback_prompt: Optional[PromptTemplate] = None,
+        timeout: Optional[float] = None,
+        hedge_llm: Optional[OllamaLLM] = None,
+    ):
+        self.prompt = prompt
+        self.llm = llm
+        self.cache = cache
+        self.limiter = limiter
+        self.output_schema = output_schema
+        self.fallback_prompt = fallback_prompt
+        self.timeout = timeout
+        self.latency = LatencyTracker()
+        self.flight = get_single_flight("llm_calls") if LLM_RESILIENCE_CONFIG["coalesce_calls"] else None
+
+        self.runnable = self._compose(llm)
+        self.breaker = get_circuit_breaker(self._backend(llm))
+        # (runnable, breaker, limiter) per backend, primary first; the hedge
+        # backend is not behind the limiter, which bounds the primary's load
+        self.backends = [(self.runnable, self.breaker, limiter)]
+        if hedge_llm is not None:
+            self.backends.append((self._compose(hedge_llm), get_circuit_breaker(self._backend(hedge_llm)), None))
+
+    def _compose(self, llm: OllamaLLM):
+        if self.output_schema is None:
+            runnable = self.prompt | llm
+        else:
+            runnable = self.prompt | llm.bind(format=self.output_schema)
+            if self.fallback_prompt is not None:
+                runnable = runnable.with_fallbacks([self.fallback_prompt | llm])
+        return runnable | StrOutputParser()
+
+    @staticmethod
+    def _backend(llm: OllamaLLM) -> str:
+        return getattr(llm, "base_url", None) or LLM_CONFIG["base_url"]
+
+    def cache_key(self, inputs: Dict[str, Any], json_only: bool = False) -> str:
+        """
+        Build the cache key for the prompt rendered from the given inputs.
+
+        Completions cut off after their JSON object (run_json) are stored
+        under their own key, so run never gets a truncated completion back.
+        """
+        key = LLMResponseCache.make_key(
+            self.prompt.format(**inputs),
+            model=getattr(self.llm, "model", type(self.llm).__name__),
+            temperature=getattr(self.llm, "temperature", None),
+        )
+        return key + ":json" if json_only else key
+
+    def hedge_delay(self) -> float:
+        """Seconds after which a running call is duplicated to the hedge backend."""
+        delay = self.latency.percentile(
+            LLM_RESILIENCE_CONFIG["hedge_percentile"], LLM_RESILIENCE_CONFIG["hedge_min_samples"]
+        )
+        return LLM_RESILIENCE_CONFIG["hedge_default_delay"] if delay is None else delay
+
+    @staticmethod
+    def _generate(
+        runnable,
+        inputs: Dict[str, Any],
+        json_only: bool,
+        deadline: Optional[float],
+        cancel: threading.Event,
+    ) -> str:
+        extractor = JSONStreamExtractor() if json_only else None
+        chunks = []
+        stream = runnable.stream(inputs)
+        try:
+            for chunk in stream:
+                chunks.append(chunk)
+                if extractor is not None and extractor.feed(chunk):
+                    break
+                check_deadline(deadline)
+                if cancel.is_set():
+                    raise HedgeCancelled()
+        finally:
+            # Closing the stream early cancels the rest of the generation
+            stream.close()
+        return extractor.text if extractor is not None and extractor.complete else "".join(chunks)
+
+    @staticmethod
+    async def _agenerate(runnable, inputs: Dict[str, Any], json_only: bool, deadline: Optional[float]) -> str:
+        extractor = JSONStreamExtractor() if json_only else None
+        chunks = []
+        stream = runnable.astream(inputs)
+        try:
+            async for chunk in stream:
+                chunks.append(chunk)
+                if extractor is not None and extractor.feed(chunk):
+                    break
+                check_deadline(deadline)
+        finally:
+            await stream.aclose()
+        return extractor.text if extractor is not None and extractor.complete else "".join(chunks)
+
+    def _attempt(self, backend, inputs: Dict[str, Any], json_only: bool, deadline: Optional[float], cancel) -> str:
+        runnable, breaker, limiter = backend
+        breaker.check()
+        start = time.perf_counter()
+        try:
+            if limiter is None:
+                text = self._generate(runnable, inputs, json_only, deadline, cancel)
+            else:
+                with limiter.slot():
+                    text = self._generate(runnable, inputs, json_only, deadline, cancel)
+        except (HedgeCancelled, TicketDeadlineExceeded):
+            breaker.release()
+            raise
+        except Exception:
+            breaker.record_failure()
+            raise
+        breaker.record_success()
+        if backend is self.backends[0]:
+            self.latency.record(time.perf_counter() - start)
+        return text
+
+    async def _aattempt(self, backend, inputs: Dict[str, Any], json_only: bool, deadline: Optional[float]) -> str:
+        runnable, breaker, limiter = backend
+        breaker.check()
+        start = time.perf_counter()
+        try:
+            if limiter is None:
+                text = await self._agenerate(runnable, inputs, json_only, deadline)
+            else:
+                async with limiter.aslot():
+                    text = await self._agenerate(runnable, inputs, json_only, deadline)
+        except asyncio.CancelledError:
+            # Cancelled at the call's deadline counts against the backend; cancelled
+            # by a faster hedge or at the end of the ticket's budget it does not
+            if remaining(deadline) == 0 and not ticket_budget_spent():
+                breaker.record_failure()
+            else:
+                breaker.release()
+            raise
+        except TicketDeadlineExceeded:
+            breaker.release()
+            raise
+        except Exception:
+            breaker.record_failure()
+            raise
+        breaker.record_success()
+        if backend is self.backends[0]:
+            self.latency.record(time.perf_counter() - start)
+        return text
+
+    def _call(self, inputs: Dict[str, Any], json_only: bool) -> str:
+        # Attempts run on their own threads, so the caller gets its answer at
+        # the deadline even while a backend has not sent a single chunk
+        deadline = call_deadline(self.timeout)
+        attempts = [
+            lambda cancel, backend=backend: self._attempt(backend, inputs, json_only, deadline, cancel)
+            for backend in self.backends
+        ]
+        call = lambda: run_hedged(attempts, self.hedge_delay(), deadline)
+        if self.flight is None:
+            return call()
+        return self.flight.do(self.cache_key(inputs, json_only), call, deadline)
+
+    async def _acall(self, inputs: Dict[str, Any], json_only: bool) -> str:
+        deadline = call_deadline(self.timeout)
+        attempts = [
+            lambda backend=backend: self._aattempt(backend, inputs, json_only, deadline)
+            for backend in self.backends
+        ]
+        call = lambda: arun_hedged(attempts, self.hedge_delay(), deadline)
+        if self.flight is None:
+            return await call()
+        return await self.flight.ado(self.cache_key(inputs, json_only), call, deadline)
+
+    def run(self, inputs: Dict[str, Any]) -> str:
+        if self.cache is None:
+            return self._call(inputs, json_only=False)
+
+        key = self.cache_key(inputs)
+        cached = self.cache.get(key)
+        if cached is not None:
+            return cached
+
+        result = self._call(inputs, json_only=False)
+        self.cache.set(key, result)
+        return result
+
+    async def arun(self, inputs: Dict[str, Any]) -> str:
+        """Async counterpart of run built on the runnable's astream."""
+        if self.cache is None:
+            return await self._acall(inputs, json_only=False)
+
+        key = self.cache_key(inputs)
+        cached = self.cache.get(key)
+        if cached is not None:
+            return cached
+
+        result = await self._acall(inputs, json_only=False)
+        self.cache.set(key, result)
+        return result
+
+    def run_json(self, inputs: Dict[str, Any]) -> str:
+        """
+        Run the chain only until the first top-level JSON object is complete.
+
+        The completion is streamed through a JSONStreamExtractor and the
+        generation is cancelled as soon as the object closes, so tokens the
+        model emits after the JSON are never waited for.
+
+        Returns:
+            The text of the JSON object, or the whole completion if it never
+            contains a complete object
+        """
+        if self.cache is None:
+            return self._call(inputs, json_only=True)
+
+        key = self.cache_key(inputs, json_only=True)
+        cached = self.cache.get(key)
+        if cached is not None:
+            return cached
+
+        result = self._call(inputs, json_only=True)
+        self.cache.set(key, result)
+        return result
+
+    async def arun_json(self, inputs: Dict[str, Any]) -> str:
+        """Async counterpart of run_json built on the runnable's astream."""
+        if self.cache is None:
+            return await self._acall(inputs, json_only=True)
+
+        key = self.cache_key(inputs, json_only=True)
+        cached = self.cache.get(key)
+        if cached is not None:
+            return cached
+
+        result = await self._acall(inputs, json_only=True)
+        self.cache.set(key, result)
+        return result
+
+    def batch(self, inputs_list: List[Dict[str, Any]], max_concurrency: Optional[int] = None) -> List[Any]:
+        """
+        Run the chain on many inputs through the runnable's batch API.
+
+        Cached completions are served from the cache; the rest are sent in one
+        `runnable.batch` call with at most `max_concurrency` (default: the
+        limiter's bound) generations in flight. Batches are neither hedged
+        nor bounded by the chain's timeout (only by the HTTP client's), but
+        fail fast while the backend's circuit is open.
+
+        Returns:
+            One completion per input, or the exception raised for that input
+        """
+        results: List[Any] = [None] * len(inputs_list)
+        keys: List[Optional[str]] = [None] * len(inputs_list)
+        misses = []
+        for index, inputs in enumerate(inputs_list):
+            if self.cache is not None:
+                keys[index] = self.cache_key(inputs)
+                cached = self.cache.get(keys[index])
+                if cached is not None:
+                    results[index] = cached
+                    continue
+            misses.append(index)
+
+        if misses:
+            if max_concurrency is None and self.limiter is not None:
+                max_concurrency = self.limiter.max_concurrency
+            try:
+                self.breaker.check()
+            except CircuitOpenError as e:
+                for index in misses:
+                    results[index] = e
+                return results
+            outputs = self.runnable.batch(
+                [inputs_list[index] for index in misses],
+                config={"max_concurrency": max_concurrency},
+                return_exceptions=True,
+            )
+            if all(isinstance(output, Exception) for output in outputs):
+                self.breaker.record_failure()
+            else:
+                self.breaker.record_success()
+            for index, output in zip(misses, outputs):
+                results[index] = output
+                if keys[index] is not None and not isinstance(output, Exception):
+                    self.cache.set(keys[index], output)
+        return results
+
+    def stream(self, inputs: Dict[str, Any]) -> Iterator[str]:
+        """
+        Run the chain and yield the completion chunk by chunk as it is generated.
+
+        A cached completion is yielded as a single chunk; a fresh one is stored
+        in the cache once the stream has been fully consumed. The stream is
+        cut off with LLMTimeoutError at the first chunk past the deadline;
+        streams are not hedged, since part of the completion is already out.
+        """
+        key = self.cache_key(inputs) if self.cache is not None else None
+        if key is not None:
+            cached = self.cache.get(key)
+            if cached is not None:
+                yield cached
+                return
+
+        deadline = call_deadline(self.timeout)
+        self.breaker.check()
+        chunks = []
+        try:
+            with self.limiter.slot() if self.limiter is not None else nullcontext():
+                for chunk in self.runnable.stream(inputs):
+                    check_deadline(deadline)
+                    chunks.append(chunk)
+                    yield chunk
+        except (GeneratorExit, TicketDeadlineExceeded):
+            self.breaker.release()
+            raise
+        except Exception:
+            self.breaker.record_failure()
+            raise
+        self.breaker.record_success()
+
+        if key is not None:
+            self.cache.set(key, "".join(chunks))
+
+    async def astream(self, inputs: Dict[str, Any]) -> AsyncIterator[str]:
+        """Async counterpart of stream built on the runnable's astream."""
+        key = self.cache_key(inputs) if self.cache is not None else None
+        if key is not None:
+            cached = self.cache.get(key)
+            if cached is not None:
+                yield cached
+                return
+
+        deadline = call_deadline(self.timeout)
+        self.breaker.check()
+        chunks = []
+        try:
+            async with self.limiter.aslot() if self.limiter is not None else nullcontext():
+                async for chunk in self.runnable.astream(inputs):
+                    check_deadline(deadline)
+                    chunks.append(chunk)
+                    yield chunk
+        except (GeneratorExit, asyncio.CancelledError, TicketDeadlineExceeded):
+            self.breaker.release()
+            raise
+        except Exception:
+            self.breaker.record_failure()
+            raise
+        self.breaker.record_success()
+
+        if key is not None:
+            self.cache.set(key, "".join(chunks))
+
+
+def build_chain(
+    prompt_template: str,
+    llm: OllamaLLM,
+    use_cache: bool = False,
+    output_model: Optional[Type[Any]] = None,
+    timeout: Optional[float] = None,
+) -> ChainWrapper:
+    """
+    Build a ChainWrapper wired to the shared cache, concurrency limiter and
+    circuit breakers, hedged to LLM_RESILIENCE_CONFIG["hedge_base_url"] if set.
+
+    Args:
+        prompt_template: The prompt template string
+        llm: The (shared) LLM client to run the prompt against
+        use_cache: Whether completions may be served from the LLM response cache
+        output_model: Result model of the chain; when structured output is
+            enabled, its JSON schema constrains decoding and replaces the
+            prose format instructions of the prompt
+        timeout: Deadline of each call in seconds (defaults to
+            LLM_RESILIENCE_CONFIG["agent_timeout"]; 0 for none)
+
+    Returns:
+        The chain wrapper
+    """
+    prompt = PromptTemplate.from_template(prompt_template)
+    options = {
+        "cache": get_llm_cache() if use_cache else None,
+        "limiter": get_llm_registry().limiter,
+        "timeout": LLM_RESILIENCE_CONFIG["agent_timeout"] if timeout is None else timeout,
+    }
+    if LLM_RESILIENCE_CONFIG["hedge_base_url"]:
+        options["hedge_llm"] = get_llm(
+            model=getattr(llm, "model", None),
+            base_url=LLM_RESILIENCE_CONFIG["hedge_base_url"],
+            temperature=getattr(llm, "temperature", None),
+        )
+    if output_model is None or not LLM_CONFIG["structured_output"]:
+        return ChainWrapper(prompt, llm, **options)
+
+    return ChainWrapper(
+        PromptTemplate.from_template(strip_format_instructions(prompt_template)),
+        llm,
+        output_schema=json_schema_for(output_model),
+        fallback_prompt=prompt,
+        **options,
+    )
 
 
 class BaseAgent(ABC):
     """Base class for all agents in the system."""
 
-    def __init__(self, name: str, description: str):
+    # Chain batched by process_batch, declared by each agent not overriding it
+    BATCH_CHAIN: str
+
+    def __init__(self, name: str, description: str, use_cache: bool = False, timeout: Optional[float] = None):
         self.name = name
         self.description = description
+        self.use_cache = use_cache
+        # Deadline of each LLM call of the agent (None: LLM_RESILIENCE_CONFIG["agent_timeout"])
+        self.timeout = timeout
         self.llm = self._initialize_llm()
         self.chains = {}
 
     def _initialize_llm(self) -> OllamaLLM:
-        """Initialize the Ollama LLM with the llama3 model."""
-        return OllamaLLM(
+        """Get the shared Ollama LLM client for the configured model."""
+        return get_llm(
             model=LLM_CONFIG["model"],
             base_url=LLM_CONFIG["base_url"],
             temperature=LLM_CONFIG["temperature"],
         )
 
-    def create_chain(self, chain_name: str, prompt_template: str):
-        """Create a LangChain chain with the specified prompt template."""
-        prompt = PromptTemplate.from_template(prompt_template)
-        
+    def create_chain(self, chain_name: str, prompt_template: str, output_model: Optional[Type[Any]] = None):
+        """Create a LangChain chain with the specified prompt template and result model."""
         # Use the newer LCEL approach but wrap it in a chain-like interface
         # for backward compatibility
-        class ChainWrapper:
-            def __init__(self, prompt, llm):
-                self.prompt = prompt
-                self.llm = llm
-                self.runnable = prompt | llm | StrOutputParser()
-                
-            def run(self, inputs):
-                return self.runnable.invoke(inputs)
-        
-        chain = ChainWrapper(prompt, self.llm)
+        chain = build_chain(
+            prompt_template, self.llm, use_cache=self.use_cache, output_model=output_model, timeout=self.timeout
+        )
         self.chains[chain_name] = chain
         return chain
         
@@ -52,42 +491,17 @@ class BaseAgent(ABC):
         """
         Extract JSON from text even if it's not perfectly formatted.
         
+        Scans for the first top-level object that parses as JSON (see
+        JSONStreamExtractor), falling back to repairing single quotes and
+        trailing commas.
+        
         Args:
             text: The text containing JSON-like structure
             
         Returns:
             Extracted dictionary or empty dict if extraction fails
         """
-        # First, try to find JSON between triple backticks
-        json_match = re.search(r'```(?:json)?\s*([\s\S]*?)\s*```', text)
-        if json_match:
-            json_str = json_match.group(1)
-        else:
-            # Try to find JSON between curly braces
-            json_match = re.search(r'\{[\s\S]*\}', text)
-            if json_match:
-                json_str = json_match.group(0)
-            else:
-                return {}
-        
-        # Clean up the JSON string
-        json_str = json_str.strip()
-        
-        # Try to parse the JSON
-        try:
-            return json.loads(json_str)
-        except json.JSONDecodeError:
-            # If parsing fails, try to fix common issues
-            # Replace single quotes with double quotes
-            json_str = json_str.replace("'", '"')
-            # Handle trailing commas
-            json_str = re.sub(r',\s*}', '}', json_str)
-            json_str = re.sub(r',\s*]', ']', json_str)
-            
-            try:
-                return json.loads(json_str)
-            except json.JSONDecodeError:
-                return {}
+        return extract_first_json_object([text])
                 
     def parse_output_to_dict(self, output_text: str, schema_class: Any) -> Dict[str, Any]:
         """
@@ -103,6 +517,21 @@ class BaseAgent(ABC):
         """
         # Extract JSON if possible
         extracted_data = self.extract_json_from_text(output_text)
+        return self.dict_to_schema(extracted_data, schema_class)
+
+    def dict_to_schema(self, extracted_data: Dict[str, Any], schema_class: Any) -> Dict[str, Any]:
+        """
+        Fill a dictionary parsed from LLM output with defaults for missing fields.
+        
+        Args:
+            extracted_data: The parsed (possibly incomplete) dictionary
+            schema_class: The Pydantic model class defining the expected schema
+            
+        Returns:
+            Dictionary with every field of the schema
+        """
+        if not isinstance(extracted_data, dict):
+            extracted_data = {}
         
         # Create a basic default result dictionary based on the schema
         result = {}
@@ -133,10 +562,72 @@ class BaseAgent(ABC):
                 
         return result
 
+    def _build_chain_input(self, input_data: Dict[str, Any]) -> Dict[str, Any]:
+        """Map the agent input onto the prompt variables of the chain."""
+        return dict(input_data)
+
+    def _parse_output(self, output_text: str) -> Dict[str, Any]:
+        """Turn the chain's completion into the agent's result dictionary."""
+        return self.extract_json_from_text(output_text)
+
+    def _fallback_result(self, error: Exception) -> Dict[str, Any]:
+        """Result returned when the chain fails, so the pipeline can continue."""
+        return {"error": f"{self.name} failed: {str(error)}"}
+
+    def process_batch(self, inputs: List[Dict[str, Any]], max_concurrency: Optional[int] = None) -> List[Dict[str, Any]]:
+        """
+        Process many inputs with one batched call of the agent's BATCH_CHAIN.
+        
+        Args:
+            inputs: Input dictionaries as accepted by process
+            max_concurrency: Maximum number of generations in flight
+            
+        Returns:
+            One result dictionary per input, in order
+        """
+        return self._process_batch_with(self.BATCH_CHAIN, inputs, max_concurrency)
+
+    def _process_batch_with(
+        self,
+        chain_name: str,
+        inputs: List[Dict[str, Any]],
+        max_concurrency: Optional[int] = None,
+        parse: Optional[Callable[[str], Dict[str, Any]]] = None,
+    ) -> List[Dict[str, Any]]:
+        """Run one batched call of the named chain, parsing with `parse` (default: _parse_output)."""
+        parse = parse or self._parse_output
+        chain = self.chains[chain_name]
+        outputs = chain.batch([self._build_chain_input(data) for data in inputs], max_concurrency=max_concurrency)
+        results = []
+        for output in outputs:
+            if isinstance(output, Exception):
+                results.append(self._fallback_result(output))
+                continue
+            try:
+                results.append(parse(output))
+            except Exception as e:
+                results.append(self._fallback_result(e))
+        return results
+
+    def prompt_tokens(self, input_data: Dict[str, Any]) -> int:
+        """Approximate token count of the prompts this agent renders for the input."""
+        chain_input = self._build_chain_input(input_data)
+        return sum(prompt_tokens(chain, chain_input) for chain in self.chains.values())
+
     @abstractmethod
     def process(self, input_data: Dict[str, Any]) -> Dict[str, Any]:
         """Process the input data and return the results."""
         pass
 
+    async def aprocess(self, input_data: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Async counterpart of process.
+
+        Agents whose chains support arun override this to await the LLM call;
+        the default runs process in a worker thread so the event loop is never
+        blocked.
+        """
+        return await asyncio.to_thread(self.process, input_data)
+
     def __str__(self) -> str:
         return f"{self.name}: {self.description}" 
\ No newline at end of file
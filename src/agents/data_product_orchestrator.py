@@ -37,32 +37,65 @@ class DataProductOrchestrator:
         Returns:
             Dictionary with the results of this step's processing.
         """
+        prepared = self._prepare_step(step, input_data)
+        if "error" in prepared or "passthrough" in prepared:
+            return prepared.get("passthrough", prepared)
+
+        result = prepared["agent"].process(prepared["input"])
+        self.results[prepared["result_key"]] = result
+        return result
+
+    async def aprocess_step(self, step: str, input_data: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Async counterpart of process_step that awaits the agent instead of blocking.
+        
+        Args:
+            step: The step to process (see process_step)
+            input_data: Dictionary containing the input data for this step
+                
+        Returns:
+            Dictionary with the results of this step's processing.
+        """
+        prepared = self._prepare_step(step, input_data)
+        if "error" in prepared or "passthrough" in prepared:
+            return prepared.get("passthrough", prepared)
+
+        result = await prepared["agent"].aprocess(prepared["input"])
+        self.results[prepared["result_key"]] = result
+        return result
+
+    def _prepare_step(self, step: str, input_data: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Resolve the agent, its input and the result key for a workflow step.
+        
+        Args:
+            step: The step to process
+            input_data: Dictionary containing the input data for this step
+                
+        Returns:
+            Dictionary with 'agent', 'input' and 'result_key', a 'passthrough'
+            result for steps that need no agent, or an 'error'.
+        """
         if step == 'use_case':
-            result = self.use_case_analyzer.process(input_data)
-            self.results['use_case_analysis'] = result
-            return result
+            return {"agent": self.use_case_analyzer, "input": input_data, "result_key": 'use_case_analysis'}
             
         elif step == 'target_design':
             # Add use case analysis to the input if available
             if 'use_case_analysis' in self.results:
                 input_data['use_case_analysis'] = self.results['use_case_analysis']
-            result = self.data_model_designer.process(input_data)
-            self.results['data_model'] = result
-            return result
+            return {"agent": self.data_model_designer, "input": input_data, "result_key": 'data_model'}
             
         elif step == 'source_identification':
             # Process the source identification step
             # This step is mainly about selecting source systems
             # The actual mapping happens in the next step
-            return input_data
+            return {"passthrough": input_data}
             
         elif step == 'mapping':
             # Add data model to the input if available
             if 'data_model' in self.results:
                 input_data['data_model'] = self.results['data_model']
-            result = self.source_mapping.process(input_data)
-            self.results['source_mappings'] = result
-            return result
+            return {"agent": self.source_mapping, "input": input_data, "result_key": 'source_mappings'}
             
         elif step == 'data_flow':
             # Add data model and source mappings to the input if available
@@ -70,9 +103,7 @@ class DataProductOrchestrator:
                 input_data['data_model'] = self.results['data_model']
             if 'source_mappings' in self.results:
                 input_data['source_mappings'] = self.results['source_mappings']
-            result = self.data_flow.process(input_data)
-            self.results['data_flow'] = result
-            return result
+            return {"agent": self.data_flow, "input": input_data, "result_key": 'data_flow'}
             
         elif step == 'certification':
             # Prepare full input with all previous results
@@ -82,9 +113,7 @@ class DataProductOrchestrator:
                 'source_mappings': self.results.get('source_mappings', {}),
                 'data_flow': self.results.get('data_flow', {})
             }
-            result = self.certification.process(certification_input)
-            self.results['certification'] = result
-            return result
+            return {"agent": self.certification, "input": certification_input, "result_key": 'certification'}
             
         else:
             return {"error": f"Unknown step: {step}"}
@@ -1,9 +1,11 @@
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Optional
 from pydantic import BaseModel, Field
 from langchain.output_parsers import PydanticOutputParser
 
 from src.agents.base_agent import BaseAgent
-from config.config import AGENT_CONFIG
+from src.utils.context_budget import prompt_tokens
+from src.utils.resolution_time import get_resolution_estimator
+from config.config import AGENT_CONFIG, RESOLUTION_MODEL_CONFIG
 
 
 class EstimationResult(BaseModel):
@@ -15,14 +17,38 @@ class EstimationResult(BaseModel):
     resources_needed: List[str] = Field(description="Resources needed for efficient resolution")
 
 
+class EstimationNarrative(BaseModel):
+    """Model for parsing the estimation narrative when the resolution time comes from the model."""
+    bottlenecks: List[str] = Field(description="Potential bottlenecks that could delay resolution")
+    optimization_suggestions: List[str] = Field(description="Suggestions to optimize the resolution process")
+    resources_needed: List[str] = Field(description="Resources needed for efficient resolution")
+
+
 class EstimatorAgent(BaseAgent):
-    """Agent that predicts resolution times and optimizes workflows."""
+    """
+    Agent that predicts resolution times and optimizes workflows.
+
+    Once enough resolved tickets are stored, the resolution time comes from
+    the quantile model of ResolutionEstimator (estimated_hours_p50/p90,
+    estimated_by "model") instead of the LLM's guess. In "hybrid" mode the
+    LLM is then only asked for the bottlenecks, suggestions and resources
+    (narrative_chain); in "fast" mode it is not called (see
+    RESOLUTION_MODEL_CONFIG). Without a model, estimator_chain asks the LLM
+    for the whole estimation.
+    """
+
+    # Result model of each chain
+    CHAIN_SCHEMAS = {"estimator_chain": EstimationResult, "narrative_chain": EstimationNarrative}
 
     def __init__(self):
         super().__init__(
             name=AGENT_CONFIG["estimator"]["name"],
-            description=AGENT_CONFIG["estimator"]["description"]
+            description=AGENT_CONFIG["estimator"]["description"],
+            use_cache=AGENT_CONFIG["estimator"].get("use_cache", False),
+            timeout=AGENT_CONFIG["estimator"].get("timeout"),
         )
+        self.resolution_estimator = get_resolution_estimator()
+        self.mode = RESOLUTION_MODEL_CONFIG["mode"]
         self._setup_chains()
 
     def _setup_chains(self):
@@ -62,7 +88,44 @@ class EstimatorAgent(BaseAgent):
         
         self.create_chain(
             chain_name="estimator_chain",
-            prompt_template=estimation_template
+            prompt_template=estimation_template,
+            output_model=EstimationResult
+        )
+
+        narrative_template = """
+        You are an AI assistant specialized in optimizing the resolution of customer support issues.
+        The resolution time of this ticket has already been estimated. Your task is to analyze the
+        ticket content, summary, routing information, and recommendations to identify potential
+        bottlenecks, suggest optimizations, and determine necessary resources.
+
+        Ticket Content:
+        {ticket_content}
+
+        Ticket Summary:
+        {ticket_summary}
+
+        Routing Information:
+        {routing_info}
+
+        Recommendations:
+        {recommendations}
+        
+        Please provide your analysis in the following JSON format:
+        ```json
+        {{
+            "bottlenecks": ["Bottleneck 1", "Bottleneck 2", "..."],
+            "optimization_suggestions": ["Suggestion 1", "Suggestion 2", "..."],
+            "resources_needed": ["Resource 1", "Resource 2", "..."]
+        }}
+        ```
+        
+        Return only the JSON object with no other text before or after.
+        """
+        
+        self.create_chain(
+            chain_name="narrative_chain",
+            prompt_template=narrative_template,
+            output_model=EstimationNarrative
         )
 
     def process(self, input_data: Dict[str, Any]) -> Dict[str, Any]:
@@ -75,27 +138,121 @@ class EstimatorAgent(BaseAgent):
                 - ticket_summary: The summary from the summarizer agent
                 - routing_info: Information from the router agent
                 - recommendations: Recommendations from the recommender agent
+                - ticket_features: Optional team, priority, urgency,
+                  sentiment and conversation_chars of the ticket, for the
+                  resolution-time model
                 
         Returns:
             Dictionary with the estimation results.
         """
-        chain_input = {
+        estimate = self._model_estimate(input_data)
+        chain_name = self._chain_name(estimate)
+        if chain_name is None:
+            return self._model_result(estimate)
+        chain_input = self._build_chain_input(input_data)
+        
+        try:
+            result = self.chains[chain_name].run_json(chain_input)
+            return self._merge_estimate(self._parse_chain_output(chain_name, result), estimate)
+        except Exception as e:
+            return self._merge_estimate(self._fallback_result(e), estimate)
+
+    async def aprocess(self, input_data: Dict[str, Any]) -> Dict[str, Any]:
+        """Async counterpart of process that awaits the chain instead of blocking."""
+        estimate = self._model_estimate(input_data)
+        chain_name = self._chain_name(estimate)
+        if chain_name is None:
+            return self._model_result(estimate)
+        chain_input = self._build_chain_input(input_data)
+
+        try:
+            result = await self.chains[chain_name].arun_json(chain_input)
+            return self._merge_estimate(self._parse_chain_output(chain_name, result), estimate)
+        except Exception as e:
+            return self._merge_estimate(self._fallback_result(e), estimate)
+
+    def process_batch(self, inputs: List[Dict[str, Any]], max_concurrency: Optional[int] = None) -> List[Dict[str, Any]]:
+        """Batch the LLM calls per chain the inputs need and add the model's estimates."""
+        estimates = [self._model_estimate(data) for data in inputs]
+        results: List[Optional[Dict[str, Any]]] = [None] * len(inputs)
+        indices_by_chain: Dict[str, List[int]] = {}
+        for index, estimate in enumerate(estimates):
+            chain_name = self._chain_name(estimate)
+            if chain_name is None:
+                results[index] = self._model_result(estimate)
+            else:
+                indices_by_chain.setdefault(chain_name, []).append(index)
+        for chain_name, indices in indices_by_chain.items():
+            outputs = self._process_batch_with(
+                chain_name,
+                [inputs[index] for index in indices],
+                max_concurrency=max_concurrency,
+                parse=lambda text, chain_name=chain_name: self._parse_chain_output(chain_name, text),
+            )
+            for index, output in zip(indices, outputs):
+                results[index] = self._merge_estimate(output, estimates[index])
+        return results
+
+    def prompt_tokens(self, input_data: Dict[str, Any]) -> int:
+        """Approximate token count of the one prompt the input is sent with, if any."""
+        chain_name = self._chain_name(self._model_estimate(input_data))
+        if chain_name is None:
+            return 0
+        return prompt_tokens(self.chains[chain_name], self._build_chain_input(input_data))
+
+    def _chain_name(self, estimate: Optional[Dict[str, Any]]) -> Optional[str]:
+        """The chain asked for the rest of the estimation, or None if the model's estimate is the result."""
+        if estimate is None:
+            return "estimator_chain"
+        return None if self.mode == "fast" else "narrative_chain"
+
+    def _model_estimate(self, input_data: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """The quantile model's estimate, or None without a model or ticket features."""
+        features = input_data.get("ticket_features")
+        if self.resolution_estimator is None or not features:
+            return None
+        try:
+            return self.resolution_estimator.estimate(features)
+        except Exception:
+            return None
+
+    @staticmethod
+    def _model_result(estimate: Dict[str, Any]) -> Dict[str, Any]:
+        """Estimation result of the model alone, without the LLM's narrative."""
+        return {**estimate, "bottlenecks": [], "optimization_suggestions": [], "resources_needed": []}
+
+    def _merge_estimate(self, result: Dict[str, Any], estimate: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+        """Add the model's estimate to the LLM's narrative; it also stands in for a failed LLM call."""
+        if estimate is None:
+            return result
+        if "error" in result:
+            return self._model_result(estimate)
+        return {**estimate, **result}
+
+    def _build_chain_input(self, input_data: Dict[str, Any]) -> Dict[str, Any]:
+        """Map the agent input onto the prompt variables of the chain."""
+        return {
             "ticket_content": input_data.get("ticket_content", ""),
             "ticket_summary": input_data.get("ticket_summary", ""),
             "routing_info": input_data.get("routing_info", ""),
             "recommendations": input_data.get("recommendations", ""),
         }
-        
-        try:
-            result = self.chains["estimator_chain"].run(chain_input)
-            parsed_result = self.parse_output_to_dict(result, EstimationResult)
-            return parsed_result
-        except Exception as e:
-            return {
-                "error": f"Failed to estimate resolution time: {str(e)}",
-                "estimated_time": "unknown",
-                "confidence_interval": "unknown",
-                "bottlenecks": [],
-                "optimization_suggestions": [],
-                "resources_needed": []
-            } 
\ No newline at end of file
+
+    def _parse_output(self, output_text: str) -> Dict[str, Any]:
+        """Parse the chain output into a EstimationResult dictionary."""
+        return self.parse_output_to_dict(output_text, EstimationResult)
+
+    def _parse_chain_output(self, chain_name: str, output_text: str) -> Dict[str, Any]:
+        """Parse the output of the named chain into a dictionary of its result model."""
+        return self.parse_output_to_dict(output_text, self.CHAIN_SCHEMAS[chain_name])
+
+    def _fallback_result(self, error: Exception) -> Dict[str, Any]:
+        """Result returned when the chain fails, so the pipeline can continue."""
+        return {
+            "error": f"Failed to estimate resolution time: {str(error)}",
+            "estimated_time": "unknown",
+            "confidence_interval": "unknown",
+            "bottlenecks": [],
+            "optimization_suggestions": [],
+            "resources_needed": []
+        }
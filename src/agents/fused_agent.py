@@ -0,0 +1,160 @@
+from typing import Dict, Any
+from pydantic import BaseModel, Field
+
+from src.agents.base_agent import BaseAgent
+from src.agents.summarizer_agent import SummaryResult
+from src.agents.router_agent import RoutingResult
+from src.agents.recommender_agent import RecommendationResult
+from src.agents.estimator_agent import EstimationResult
+from config.config import AGENT_CONFIG
+
+
+class FusedAnalysisResult(BaseModel):
+    """Model for parsing the single-call ticket analysis."""
+    summary: SummaryResult = Field(description="Summary of the customer conversation")
+    routing: RoutingResult = Field(description="Routing decision for the ticket")
+    recommendations: RecommendationResult = Field(description="Recommended solutions")
+    estimation: EstimationResult = Field(description="Resolution time estimate")
+    final_insights: str = Field(description="Short final report with assessment and next steps")
+
+
+# Sections of the fused result and the models their fields are filled from
+SECTIONS = {
+    "summary": SummaryResult,
+    "routing": RoutingResult,
+    "recommendations": RecommendationResult,
+    "estimation": EstimationResult,
+}
+
+
+class FusedAnalysisAgent(BaseAgent):
+    """Agent that produces the whole ticket analysis in a single LLM call."""
+
+    BATCH_CHAIN = "fused_chain"
+
+    def __init__(self):
+        super().__init__(
+            name=AGENT_CONFIG["fused"]["name"],
+            description=AGENT_CONFIG["fused"]["description"],
+            use_cache=AGENT_CONFIG["fused"].get("use_cache", False),
+            timeout=AGENT_CONFIG["fused"].get("timeout"),
+        )
+        self._setup_chains()
+
+    def _setup_chains(self):
+        """Set up the chain for the fused analysis."""
+
+        fused_template = """
+        You are an AI assistant analyzing a customer support ticket end to end.
+        Summarize the conversation, route the ticket to a team (Technical Support, Billing,
+        Product, Security or Customer Success), recommend solutions, estimate the resolution
+        time and write a short final report.
+
+        Ticket Content:
+        {ticket_content}
+
+        Historical Similar Cases:
+        {historical_data}
+
+        Please provide your analysis in the following JSON format:
+        ```json
+        {{
+            "summary": {{
+                "summary": "A concise summary of the customer conversation",
+                "key_points": ["Key point 1", "..."],
+                "action_items": ["Action item 1", "..."],
+                "sentiment": "positive/neutral/negative",
+                "urgency": "low/medium/high"
+            }},
+            "routing": {{
+                "team": "Name of the appropriate team",
+                "priority": "low/medium/high/critical",
+                "skills_required": ["Skill 1", "..."],
+                "justification": "Why this routing decision was made",
+                "escalation_needed": true/false
+            }},
+            "recommendations": {{
+                "recommended_solutions": ["Solution 1", "..."],
+                "knowledge_articles": ["Article 1", "..."],
+                "similar_cases": ["Case 1", "..."],
+                "estimated_resolution_time": "Time estimate (e.g., '2 hours', '1 day')",
+                "confidence_score": 0.85
+            }},
+            "estimation": {{
+                "estimated_time": "Time estimate (e.g., '2 hours', '1-2 days')",
+                "confidence_interval": "Range or confidence level",
+                "bottlenecks": ["Bottleneck 1", "..."],
+                "optimization_suggestions": ["Suggestion 1", "..."],
+                "resources_needed": ["Resource 1", "..."]
+            }},
+            "final_insights": "Overall assessment, next steps and key highlights"
+        }}
+        ```
+
+        Return only the JSON object with no other text before or after.
+        """
+
+        self.create_chain(
+            chain_name="fused_chain",
+            prompt_template=fused_template,
+            output_model=FusedAnalysisResult
+        )
+
+    def process(self, input_data: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Analyze a ticket with a single LLM call.
+
+        Args:
+            input_data: Dictionary containing the ticket information
+                - ticket_content: The full ticket content
+                - historical_data: Similar historical cases (optional)
+
+        Returns:
+            Dictionary with "summary", "routing", "recommendations" and
+            "estimation" results shaped like the staged agents' results, and
+            the "final_insights" text.
+        """
+        chain_input = self._build_chain_input(input_data)
+
+        try:
+            result = self.chains["fused_chain"].run_json(chain_input)
+            return self._parse_output(result)
+        except Exception as e:
+            return self._fallback_result(e)
+
+    async def aprocess(self, input_data: Dict[str, Any]) -> Dict[str, Any]:
+        """Async counterpart of process that awaits the chain instead of blocking."""
+        chain_input = self._build_chain_input(input_data)
+
+        try:
+            result = await self.chains["fused_chain"].arun_json(chain_input)
+            return self._parse_output(result)
+        except Exception as e:
+            return self._fallback_result(e)
+
+    def _build_chain_input(self, input_data: Dict[str, Any]) -> Dict[str, Any]:
+        """Map the agent input onto the prompt variables of the chain."""
+        return {
+            "ticket_content": input_data.get("ticket_content", ""),
+            "historical_data": input_data.get("historical_data") or "No historical data available.",
+        }
+
+    def _parse_output(self, output_text: str) -> Dict[str, Any]:
+        """Split the fused JSON document into per-agent results."""
+        extracted_data = self.extract_json_from_text(output_text)
+        results = {
+            section: self.dict_to_schema(extracted_data.get(section), schema_class)
+            for section, schema_class in SECTIONS.items()
+        }
+        results["final_insights"] = extracted_data.get("final_insights") or ""
+        return results
+
+    def _fallback_result(self, error: Exception) -> Dict[str, Any]:
+        """Result returned when the chain fails, so the pipeline can continue."""
+        results = {
+            section: self.dict_to_schema({}, schema_class)
+            for section, schema_class in SECTIONS.items()
+        }
+        results["error"] = f"Failed to analyze ticket: {str(error)}"
+        results["final_insights"] = ""
+        return results
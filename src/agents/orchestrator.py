@@ -1,14 +1,59 @@
-from typing import Dict, Any
+import copy
+import json
+import time
+import hashlib
+from typing import Dict, Any, List, Callable, Optional, Tuple, Union
 from langchain.chains.sequential import SequentialChain
 from langchain.prompts import PromptTemplate
-from langchain_ollama import OllamaLLM
 
 from src.agents.summarizer_agent import SummarizerAgent
 from src.agents.router_agent import RouterAgent
 from src.agents.recommender_agent import RecommenderAgent
 from src.agents.estimator_agent import EstimatorAgent
-from src.agents.base_agent import BaseAgent
-from config.config import LLM_CONFIG
+from src.agents.fused_agent import FusedAnalysisAgent
+from src.agents.base_agent import build_chain
+from src.utils.llm_client import get_llm
+from src.utils.context_budget import ContextBudget, prompt_tokens, to_prompt_json
+from src.utils.dag import DAGNode, DAGExecutor
+from src.utils.resilience import ticket_deadline
+from src.utils.similar_cases import get_similar_cases
+from src.utils.near_duplicates import get_near_duplicates
+from src.utils.single_flight import get_single_flight
+from config.config import LLM_CONFIG, LLM_RESILIENCE_CONFIG, CONTEXT_BUDGET_CONFIG, PIPELINE_CONFIG
+
+
+# Fields of each agent result that downstream prompts need
+PROMPT_FIELDS = {
+    "summary": ["summary", "key_points", "action_items", "sentiment", "urgency"],
+    "routing": ["team", "priority", "skills_required", "escalation_needed"],
+    "recommendations": ["recommended_solutions", "estimated_resolution_time", "confidence_score"],
+    "estimation": ["estimated_time", "confidence_interval", "bottlenecks", "resources_needed"],
+}
+
+# Steps of the pipeline, in the order they are reported and stored
+STAGES = ("summary", "routing", "recommendations", "estimation", "final_insights")
+
+# Pipeline graphs: the upstream results each step waits for. Steps whose
+# requirements are met run concurrently.
+PIPELINE_GRAPHS = {
+    # Every agent sees every earlier result
+    "sequential": {
+        "summary": [],
+        "routing": ["summary"],
+        "recommendations": ["summary", "routing"],
+        "estimation": ["summary", "routing", "recommendations"],
+        "final_insights": ["summary", "routing", "recommendations", "estimation"],
+    },
+    # The router works on the raw content alongside the summarizer, and the
+    # estimator runs alongside the recommender
+    "parallel": {
+        "summary": [],
+        "routing": [],
+        "recommendations": ["summary", "routing"],
+        "estimation": ["summary", "routing"],
+        "final_insights": ["summary", "routing", "recommendations", "estimation"],
+    },
+}
 
 
 class Orchestrator:
@@ -16,14 +61,36 @@ class Orchestrator:
     Orchestrates the flow of data between different agents in the system.
     This class coordinates the processing of customer support tickets through
     the various specialized agents.
+
+    The agents run as a DAG: each step starts as soon as the results it
+    requires are available (see PIPELINE_GRAPHS), so wall-clock latency
+    follows the critical path of the graph rather than the sum of all calls.
+    In "fused" mode a single agent produces the whole analysis in one call
+    instead (see FusedAnalysisAgent).
+
+    All LLM calls of one ticket share LLM_RESILIENCE_CONFIG["ticket_deadline"];
+    once it has passed, the remaining agents return their fallback results.
+
+    A ticket that is a near copy of a completed ticket (see NEAR_DUPLICATE_CONFIG)
+    reuses that ticket's results without any LLM call; its results have mode
+    "duplicate" and name the source ticket under "duplicate_of". Identical
+    tickets submitted while one is being processed (client retries, double
+    webhooks) wait for that run and share its results, named under
+    "coalesced_with", instead of running the pipeline again.
     """
 
-    def __init__(self):
+    MODES = ("staged", "fused")
+
+    def __init__(self, graph: Optional[Union[str, Dict[str, List[str]]]] = None):
         self.summarizer = SummarizerAgent()
         self.router = RouterAgent()
         self.recommender = RecommenderAgent()
         self.estimator = EstimatorAgent()
-        self.llm = OllamaLLM(
+        self.fused = FusedAnalysisAgent()
+        self.similar_cases = get_similar_cases()
+        self.near_duplicates = get_near_duplicates()
+        self.flight = get_single_flight("tickets") if PIPELINE_CONFIG["coalesce_tickets"] else None
+        self.llm = get_llm(
             model=LLM_CONFIG["model"],
             base_url=LLM_CONFIG["base_url"],
             temperature=LLM_CONFIG["temperature"],
@@ -56,73 +123,591 @@ class Orchestrator:
         4. Any critical insights that might have been missed
         """
         
-        # Create a temporary base agent to use its create_chain method
-        temp_agent = type('TempAgent', (BaseAgent,), {'process': lambda self, x: x})('Temp', 'Temporary agent')
-        self.final_chain = temp_agent.create_chain('final_chain', final_template)
+        self.final_chain = build_chain(
+            final_template, self.llm, use_cache=True, timeout=LLM_RESILIENCE_CONFIG["final_timeout"]
+        )
+        self.budget = ContextBudget(max_prompt_tokens=CONTEXT_BUDGET_CONFIG["max_prompt_tokens"])
+        self.graph = self._resolve_graph(graph if graph is not None else PIPELINE_CONFIG["graph"])
+        self.executor = DAGExecutor(self._build_nodes(self.graph))
 
-    def process_ticket(self, ticket_data: Dict[str, Any]) -> Dict[str, Any]:
-        """
-        Process a customer support ticket through all agents.
-        
-        Args:
-            ticket_data: Dictionary containing the ticket information
-                - ticket_id: Unique identifier for the ticket
-                - conversation: The full conversation or ticket content
-                - metadata: Any additional relevant information
-                
-        Returns:
-            Dictionary with the complete processing results from all agents.
-        """
-        results = {}
-        
-        # Step 1: Summarize the conversation
+    @staticmethod
+    def _resolve_graph(graph: Union[str, Dict[str, List[str]]]) -> Dict[str, List[str]]:
+        """Look up a named pipeline graph, or validate an explicit one."""
+        if isinstance(graph, str):
+            if graph not in PIPELINE_GRAPHS:
+                raise ValueError(f"Unknown pipeline graph '{graph}', expected one of {sorted(PIPELINE_GRAPHS)}")
+            return PIPELINE_GRAPHS[graph]
+        steps = set(PIPELINE_GRAPHS["sequential"])
+        if set(graph) != steps:
+            raise ValueError(f"Pipeline graph must define exactly the steps {sorted(steps)}")
+        return graph
+
+    def _agent_steps(self) -> Dict[str, Any]:
+        """The agent of each pipeline step and the method building its input."""
+        return {
+            "summary": (self.summarizer, self._summary_input),
+            "routing": (self.router, self._routing_input),
+            "recommendations": (self.recommender, self._recommendation_input),
+            "estimation": (self.estimator, self._estimation_input),
+        }
+
+    def _build_nodes(self, graph: Dict[str, List[str]]) -> List[DAGNode]:
+        """Create the DAG nodes of the pipeline steps."""
+        nodes = []
+        for name, (agent, build_input) in self._agent_steps().items():
+            nodes.append(DAGNode(
+                name,
+                run=lambda context, upstream, agent=agent, build_input=build_input:
+                    agent.process(build_input(context, upstream)),
+                arun=lambda context, upstream, agent=agent, build_input=build_input:
+                    agent.aprocess(build_input(context, upstream)),
+                requires=graph[name],
+            ))
+        nodes.append(DAGNode(
+            "final_insights",
+            run=self._run_final,
+            arun=self._arun_final,
+            requires=graph["final_insights"],
+        ))
+        return nodes
+
+    def _summary_input(self, context: Dict[str, Any], upstream: Dict[str, Any]) -> Dict[str, Any]:
         summary_input = {
-            "conversation": ticket_data.get("conversation", "")
+            "conversation": context["ticket_data"].get("conversation", "")
         }
-        summary_result = self.summarizer.process(summary_input)
-        results["summary"] = summary_result
-        
-        # Step 2: Route the ticket
+        tokens = self.summarizer.prompt_tokens(summary_input)
+        context["usage"]["summary"] = tokens
+        self.budget.record("summary", tokens)
+        return summary_input
+
+    def _routing_input(self, context: Dict[str, Any], upstream: Dict[str, Any]) -> Dict[str, Any]:
+        ticket_data = context["ticket_data"]
+        summary_result = upstream.get("summary", {})
         routing_input = {
             "ticket_content": ticket_data.get("conversation", ""),
             "ticket_summary": summary_result.get("summary", "")
         }
-        routing_result = self.router.process(routing_input)
-        results["routing"] = routing_result
-        
-        # Step 3: Recommend solutions
+        routing_input, context["usage"]["routing"] = self.budget.fit(
+            "routing", routing_input, self.router.prompt_tokens, summary_result
+        )
+        # The fast router classifies the raw conversation it was trained on,
+        # even when the prompt's copy was condensed
+        routing_input["conversation"] = ticket_data.get("conversation", "")
+        return routing_input
+
+    def _historical_data(self, ticket_data: Dict[str, Any], summary_result: Dict[str, Any]) -> str:
+        """Historical data given with the ticket, or else the most similar completed tickets."""
+        if ticket_data.get("historical_data") or self.similar_cases is None:
+            return ticket_data.get("historical_data") or ""
+        try:
+            return self.similar_cases.find(
+                ticket_data.get("conversation", ""), summary_result, exclude=ticket_data.get("ticket_id")
+            )
+        except Exception:
+            # Retrieval only enriches the prompt; never fail the ticket over it
+            return ""
+
+    def _recommendation_input(self, context: Dict[str, Any], upstream: Dict[str, Any]) -> Dict[str, Any]:
+        ticket_data = context["ticket_data"]
+        summary_result = upstream.get("summary", {})
         recommendation_input = {
             "ticket_content": ticket_data.get("conversation", ""),
             "ticket_summary": summary_result.get("summary", ""),
-            "routing_info": routing_result,
-            "historical_data": ticket_data.get("historical_data", "")
+            "routing_info": to_prompt_json(upstream.get("routing"), PROMPT_FIELDS["routing"]),
+            "historical_data": self._historical_data(ticket_data, summary_result) or "No historical data available."
         }
-        recommendation_result = self.recommender.process(recommendation_input)
-        results["recommendations"] = recommendation_result
-        
-        # Step 4: Estimate resolution time
+        recommendation_input, context["usage"]["recommendations"] = self.budget.fit(
+            "recommendations", recommendation_input, self.recommender.prompt_tokens, summary_result
+        )
+        return recommendation_input
+
+    def _estimation_input(self, context: Dict[str, Any], upstream: Dict[str, Any]) -> Dict[str, Any]:
+        ticket_data = context["ticket_data"]
+        summary_result = upstream.get("summary", {})
         estimation_input = {
             "ticket_content": ticket_data.get("conversation", ""),
             "ticket_summary": summary_result.get("summary", ""),
-            "routing_info": routing_result,
-            "recommendations": recommendation_result
+            "routing_info": to_prompt_json(upstream.get("routing"), PROMPT_FIELDS["routing"]),
+            "recommendations": to_prompt_json(upstream.get("recommendations"), PROMPT_FIELDS["recommendations"]),
+            # Structured features of the resolution-time model
+            "ticket_features": {
+                "team": (upstream.get("routing") or {}).get("team"),
+                "priority": (upstream.get("routing") or {}).get("priority"),
+                "urgency": summary_result.get("urgency"),
+                "sentiment": summary_result.get("sentiment"),
+                "conversation_chars": len(ticket_data.get("conversation", "")),
+            },
         }
-        estimation_result = self.estimator.process(estimation_input)
-        results["estimation"] = estimation_result
-        
-        # Step 5: Generate final insights
+        estimation_input, context["usage"]["estimation"] = self.budget.fit(
+            "estimation", estimation_input, self.estimator.prompt_tokens, summary_result
+        )
+        return estimation_input
+
+    def _final_input(self, context: Dict[str, Any], upstream: Dict[str, Any]) -> Dict[str, Any]:
         final_input = {
+            "ticket_content": context["ticket_data"].get("conversation", ""),
+            "summary_result": to_prompt_json(upstream.get("summary"), PROMPT_FIELDS["summary"]),
+            "routing_result": to_prompt_json(upstream.get("routing"), PROMPT_FIELDS["routing"]),
+            "recommendation_result": to_prompt_json(upstream.get("recommendations"), PROMPT_FIELDS["recommendations"]),
+            "estimation_result": to_prompt_json(upstream.get("estimation"), PROMPT_FIELDS["estimation"])
+        }
+        final_input, context["usage"]["final_insights"] = self.budget.fit(
+            "final_insights",
+            final_input,
+            lambda chain_input: prompt_tokens(self.final_chain, chain_input),
+            upstream.get("summary", {}),
+        )
+        return final_input
+
+    def _run_final(self, context: Dict[str, Any], upstream: Dict[str, Any]) -> str:
+        final_input = self._final_input(context, upstream)
+        publish = context.get("publish")
+        if publish is None:
+            return self.final_chain.run(final_input)
+
+        chunks = []
+        for chunk in self.final_chain.stream(final_input):
+            chunks.append(chunk)
+            publish({"type": "final_token", "text": chunk})
+        return "".join(chunks)
+
+    async def _arun_final(self, context: Dict[str, Any], upstream: Dict[str, Any]) -> str:
+        final_input = self._final_input(context, upstream)
+        publish = context.get("publish")
+        if publish is None:
+            return await self.final_chain.arun(final_input)
+
+        chunks = []
+        async for chunk in self.final_chain.astream(final_input):
+            chunks.append(chunk)
+            publish({"type": "final_token", "text": chunk})
+        return "".join(chunks)
+
+    def _pipeline_mode(self, ticket_data: Dict[str, Any], mode: Optional[str]) -> str:
+        """Pick the pipeline mode: explicit argument, ticket field, metadata, then config."""
+        mode = (
+            mode
+            or ticket_data.get("mode")
+            or (ticket_data.get("metadata") or {}).get("pipeline_mode")
+            or PIPELINE_CONFIG["mode"]
+        )
+        if mode not in self.MODES:
+            raise ValueError(f"Unknown pipeline mode '{mode}', expected one of {list(self.MODES)}")
+        return mode
+
+    def _fused_input(self, context: Dict[str, Any]) -> Dict[str, Any]:
+        ticket_data = context["ticket_data"]
+        fused_input = {
             "ticket_content": ticket_data.get("conversation", ""),
-            "summary_result": summary_result,
-            "routing_result": routing_result,
-            "recommendation_result": recommendation_result,
-            "estimation_result": estimation_result
+            # No summary exists yet in fused mode, so cases are matched on the conversation
+            "historical_data": self._historical_data(ticket_data, {}),
         }
-        final_result = self.final_chain.runnable.invoke(final_input)
-        results["final_insights"] = final_result
-        
-        # Add the original ticket data
+        tokens = self.fused.prompt_tokens(fused_input)
+        context["usage"]["fused"] = tokens
+        self.budget.record("fused", tokens)
+        return fused_input
+
+    def _publish_fused(self, results: Dict[str, Any], publish: Optional[Callable[[Dict[str, Any]], None]]) -> None:
+        if publish is None:
+            return
+        for name in ("summary", "routing", "recommendations", "estimation"):
+            publish({"type": "agent_result", "agent": name, "result": results[name]})
+        publish({"type": "final_token", "text": results["final_insights"]})
+
+    @staticmethod
+    def stage_failed(result: Any) -> bool:
+        """Whether a stage result is missing or an agent's fallback result."""
+        return not result or (isinstance(result, dict) and "error" in result)
+
+    def _stage_recorder(
+        self,
+        publish: Optional[Callable[[Dict[str, Any]], None]],
+        checkpoint: Optional[Callable[[str, Any], None]],
+        completed: Dict[str, Any],
+    ) -> Callable[[str, Any], None]:
+        """
+        Build the on_result callback of a pipeline run.
+
+        Agent results are published as they land. A stage is checkpointed
+        only if it succeeded on successful upstream stages, so a resumed run
+        also redoes the stages that worked from a fallback result.
+        """
+        valid = set(completed)
+
+        def on_result(name: str, result: Any) -> None:
+            if publish is not None and name != "final_insights":
+                publish({"type": "agent_result", "agent": name, "result": result})
+            if self.stage_failed(result) or not all(dependency in valid for dependency in self.graph[name]):
+                return
+            valid.add(name)
+            if checkpoint is not None:
+                checkpoint(name, result)
+
+        return on_result
+
+    def _resume_context(
+        self,
+        context: Dict[str, Any],
+        completed: Optional[Dict[str, Any]],
+    ) -> Dict[str, Any]:
+        """
+        Keep the usable stage results of an earlier run and republish them.
+
+        A resumed ticket runs the staged pipeline whatever its mode, so only
+        the missing stages cost an LLM call.
+        """
+        completed = {
+            name: result for name, result in (completed or {}).items()
+            if name in self.graph and not self.stage_failed(result)
+        }
+        if completed:
+            context["mode"] = "staged"
+            context["resumed"] = sorted(completed)
+            publish = context.get("publish")
+            if publish is not None:
+                for name in STAGES[:-1]:
+                    if name in completed:
+                        publish({"type": "agent_result", "agent": name, "result": completed[name]})
+        return completed
+
+    def _duplicate_results(
+        self,
+        context: Dict[str, Any],
+        completed: Dict[str, Any],
+    ) -> Optional[Tuple[Dict[str, Any], Dict[str, Dict[str, float]]]]:
+        """
+        Reuse the results of a completed ticket this one is a near copy of.
+
+        Resumed tickets, and tickets whose metadata sets "deduplicate" to
+        false, always run the pipeline; so does a match whose stored results
+        include an agent's fallback result.
+
+        Returns:
+            (results, timings), or None if the pipeline has to run
+        """
+        ticket_data = context["ticket_data"]
+        if self.near_duplicates is None or completed or (ticket_data.get("metadata") or {}).get("deduplicate") is False:
+            return None
+        start = time.perf_counter()
+        try:
+            results = self.near_duplicates.stored_results(
+                ticket_data.get("conversation", ""), exclude=ticket_data.get("ticket_id")
+            )
+        except Exception:
+            return None
+        if results is None or any(self.stage_failed(results[name]) for name in STAGES):
+            return None
+        context["mode"] = "duplicate"
+        return results, {"duplicate": {"start": 0.0, "duration": round(time.perf_counter() - start, 4)}}
+
+    def _run_pipeline(
+        self,
+        context: Dict[str, Any],
+        completed: Dict[str, Any],
+        checkpoint: Optional[Callable[[str, Any], None]],
+    ) -> Tuple[Dict[str, Any], Dict[str, Dict[str, float]]]:
+        """Run the ticket's pipeline, or reuse a near duplicate's results; returns (results, timings)."""
+        publish = context["publish"]
+        duplicate = self._duplicate_results(context, completed)
+        if duplicate is not None:
+            results, timings = duplicate
+        elif context["mode"] == "fused":
+            start = time.perf_counter()
+            results = self.fused.process(self._fused_input(context))
+            timings = {"fused": {"start": 0.0, "duration": round(time.perf_counter() - start, 4)}}
+        else:
+            return self.executor.run(
+                context, on_result=self._stage_recorder(publish, checkpoint, completed), completed=completed
+            )
+        self._publish_fused(results, publish)
+        self._checkpoint_fused(results, checkpoint)
+        return results, timings
+
+    async def _arun_pipeline(
+        self,
+        context: Dict[str, Any],
+        completed: Dict[str, Any],
+        checkpoint: Optional[Callable[[str, Any], None]],
+    ) -> Tuple[Dict[str, Any], Dict[str, Dict[str, float]]]:
+        """Async counterpart of _run_pipeline."""
+        publish = context["publish"]
+        duplicate = self._duplicate_results(context, completed)
+        if duplicate is not None:
+            results, timings = duplicate
+        elif context["mode"] == "fused":
+            start = time.perf_counter()
+            results = await self.fused.aprocess(self._fused_input(context))
+            timings = {"fused": {"start": 0.0, "duration": round(time.perf_counter() - start, 4)}}
+        else:
+            return await self.executor.arun(
+                context, on_result=self._stage_recorder(publish, checkpoint, completed), completed=completed
+            )
+        self._publish_fused(results, publish)
+        self._checkpoint_fused(results, checkpoint)
+        return results, timings
+
+    def _flight_key(self, context: Dict[str, Any], completed: Dict[str, Any]) -> Optional[str]:
+        """
+        Key under which identical in-flight tickets share one pipeline run.
+
+        Tickets are identical when their conversations match up to case and
+        whitespace and their historical data, pipeline mode and graph, and
+        the model, are the same. Resumed tickets are never coalesced.
+
+        Returns:
+            The key, or None if the ticket runs on its own
+        """
+        if self.flight is None or completed:
+            return None
+        ticket_data = context["ticket_data"]
+        identity = [
+            " ".join(str(ticket_data.get("conversation", "")).split()).casefold(),
+            ticket_data.get("historical_data") or "",
+            context["mode"],
+            self.graph,
+            LLM_CONFIG["model"],
+            LLM_CONFIG["temperature"],
+        ]
+        return hashlib.sha256(json.dumps(identity, sort_keys=True).encode()).hexdigest()
+
+    @staticmethod
+    def _run_info(context: Dict[str, Any]) -> Dict[str, Any]:
+        # What the tickets sharing a pipeline run take over from its leader
+        return {
+            "mode": context["mode"],
+            "usage": context["usage"],
+            "ticket_id": context["ticket_data"].get("ticket_id", "unknown"),
+        }
+
+    def _follow(
+        self,
+        context: Dict[str, Any],
+        leader: Dict[str, Any],
+        results: Dict[str, Any],
+        checkpoint: Optional[Callable[[str, Any], None]],
+    ) -> None:
+        """Take over the outcome of the identical ticket whose pipeline run this one shared."""
+        context["mode"] = leader["mode"]
+        context["usage"] = leader["usage"]
+        results["coalesced_with"] = leader["ticket_id"]
+        self._publish_fused(results, context["publish"])
+        self._checkpoint_fused(results, checkpoint)
+
+    def _checkpoint_fused(self, results: Dict[str, Any], checkpoint: Optional[Callable[[str, Any], None]]) -> None:
+        if checkpoint is None or "error" in results:
+            return
+        for name in STAGES:
+            checkpoint(name, results[name])
+
+    def _finish_results(
+        self,
+        ticket_data: Dict[str, Any],
+        results: Dict[str, Any],
+        context: Dict[str, Any],
+        timings: Dict[str, Dict[str, float]],
+        total: float,
+    ) -> Dict[str, Any]:
+        # Add the original ticket data and the per-step statistics
         results["ticket_id"] = ticket_data.get("ticket_id", "unknown")
-        results["metadata"] = ticket_data.get("metadata", {})
+        results["metadata"] = ticket_data.get("metadata") or {}
+        results["mode"] = context["mode"]
+        results["prompt_tokens"] = context["usage"]
+        results["timings"] = {**timings, "total": round(total, 4)}
+        if context.get("resumed"):
+            results["resumed_stages"] = context["resumed"]
+        return results
+
+    def process_ticket(
+        self,
+        ticket_data: Dict[str, Any],
+        *,
+        mode: Optional[str] = None,
+        publish: Optional[Callable[[Dict[str, Any]], None]] = None,
+        completed: Optional[Dict[str, Any]] = None,
+        checkpoint: Optional[Callable[[str, Any], None]] = None,
+    ) -> Dict[str, Any]:
+        """
+        Process a customer support ticket through all agents.
+        
+        Args:
+            ticket_data: Dictionary containing the ticket information
+                - ticket_id: Unique identifier for the ticket
+                - conversation: The full conversation or ticket content
+                - metadata: Any additional relevant information
+                - mode: Optional pipeline mode ("staged" or "fused"), also
+                  read from metadata["pipeline_mode"]
+            mode: Pipeline mode overriding the ticket and the configuration
+            publish: Optional callback receiving progress events, as for
+                aprocess_ticket; may be called from worker threads
+            completed: Stage results stored by an earlier, interrupted run;
+                only the missing stages are run
+            checkpoint: Optional callback invoked with (stage, result) as
+                each stage succeeds, to store it for a later resume
+                
+        Returns:
+            Dictionary with the complete processing results from all agents,
+            including the approximate prompt tokens sent and the timing of
+            each step.
+        """
+        context = {
+            "ticket_data": ticket_data,
+            "usage": {},
+            "publish": publish,
+            "mode": self._pipeline_mode(ticket_data, mode),
+        }
+        completed = self._resume_context(context, completed)
+        start = time.perf_counter()
+        with ticket_deadline(LLM_RESILIENCE_CONFIG["ticket_deadline"]):
+            key = self._flight_key(context, completed)
+            if key is None:
+                results, timings = self._run_pipeline(context, completed, checkpoint)
+            else:
+                led = []
+
+                def lead():
+                    led.append(True)
+                    return self._run_pipeline(context, completed, checkpoint), self._run_info(context)
+                (results, timings), leader = copy.deepcopy(self.flight.do(key, lead))
+                if not led:
+                    self._follow(context, leader, results, checkpoint)
+        results = self._finish_results(ticket_data, results, context, timings, time.perf_counter() - start)
+        
+        if publish is not None:
+            publish({"type": "completed", "ticket_id": results["ticket_id"]})
+        
+        return results
+
+    async def aprocess_ticket(
+        self,
+        ticket_data: Dict[str, Any],
+        *,
+        mode: Optional[str] = None,
+        publish: Optional[Callable[[Dict[str, Any]], None]] = None,
+        completed: Optional[Dict[str, Any]] = None,
+        checkpoint: Optional[Callable[[str, Any], None]] = None,
+    ) -> Dict[str, Any]:
+        """
+        Async counterpart of process_ticket.
+        
+        Awaits every agent instead of blocking, so a single event loop can keep
+        many tickets in flight concurrently.
+        
+        Args:
+            ticket_data: Dictionary containing the ticket information
+            mode: Pipeline mode overriding the ticket and the configuration
+            publish: Optional callback receiving progress events: an
+                "agent_result" event as each agent finishes, a "final_token"
+                event per chunk of the final insights, and a "completed" event
+            completed: Stage results stored by an earlier run, as for process_ticket
+            checkpoint: Optional stage checkpoint callback, as for process_ticket
+                
+        Returns:
+            Dictionary with the complete processing results from all agents.
+        """
+        context = {
+            "ticket_data": ticket_data,
+            "usage": {},
+            "publish": publish,
+            "mode": self._pipeline_mode(ticket_data, mode),
+        }
+        completed = self._resume_context(context, completed)
+
+        start = time.perf_counter()
+        with ticket_deadline(LLM_RESILIENCE_CONFIG["ticket_deadline"]):
+            key = self._flight_key(context, completed)
+            if key is None:
+                results, timings = await self._arun_pipeline(context, completed, checkpoint)
+            else:
+                led = []
+
+                async def lead():
+                    led.append(True)
+                    return await self._arun_pipeline(context, completed, checkpoint), self._run_info(context)
+                (results, timings), leader = copy.deepcopy(await self.flight.ado(key, lead))
+                if not led:
+                    self._follow(context, leader, results, checkpoint)
+        results = self._finish_results(ticket_data, results, context, timings, time.perf_counter() - start)
         
-        return results 
\ No newline at end of file
+        if publish is not None:
+            publish({"type": "completed", "ticket_id": results["ticket_id"]})
+        
+        return results
+
+    def process_batch(
+        self,
+        tickets: List[Dict[str, Any]],
+        mode: Optional[str] = None,
+        max_concurrency: Optional[int] = None,
+    ) -> List[Dict[str, Any]]:
+        """
+        Process many tickets with batched LLM calls.
+        
+        Every pipeline step runs once for the whole batch, in dependency order,
+        through the agents' process_batch (the runnable batch API). A ticket
+        whose final insights fail gets an "error" entry instead of aborting
+        the batch.
+        
+        Args:
+            tickets: Ticket dictionaries as accepted by process_ticket
+            mode: Pipeline mode overriding the tickets and the configuration
+            max_concurrency: Maximum number of generations in flight per step
+                
+        Returns:
+            One result dictionary per ticket, in order
+        """
+        contexts = [
+            {"ticket_data": ticket, "usage": {}, "mode": self._pipeline_mode(ticket, mode)}
+            for ticket in tickets
+        ]
+        results: List[Dict[str, Any]] = [{} for _ in tickets]
+        timings: Dict[str, Dict[str, float]] = {}
+        start = time.perf_counter()
+
+        def run_step(name: str, indices: List[int], step: Callable[[List[int]], List[Any]]) -> None:
+            if not indices:
+                return
+            step_start = time.perf_counter()
+            for index, output in zip(indices, step(indices)):
+                if name == "fused":
+                    results[index].update(output)
+                else:
+                    results[index][name] = output
+            timings[name] = {
+                "start": round(step_start - start, 4),
+                "duration": round(time.perf_counter() - step_start, 4),
+            }
+
+        def upstream(index: int, name: str) -> Dict[str, Any]:
+            return {dependency: results[index][dependency] for dependency in self.graph[name]}
+
+        fused = [index for index, context in enumerate(contexts) if context["mode"] == "fused"]
+        staged = [index for index, context in enumerate(contexts) if context["mode"] == "staged"]
+
+        run_step("fused", fused, lambda indices: self.fused.process_batch(
+            [self._fused_input(contexts[index]) for index in indices], max_concurrency=max_concurrency
+        ))
+
+        agent_steps = self._agent_steps()
+        for name in self.executor.order:
+            if name in agent_steps:
+                agent, build_input = agent_steps[name]
+                run_step(name, staged, lambda indices: agent.process_batch(
+                    [build_input(contexts[index], upstream(index, name)) for index in indices],
+                    max_concurrency=max_concurrency,
+                ))
+            else:
+                run_step(name, staged, lambda indices: self.final_chain.batch(
+                    [self._final_input(contexts[index], upstream(index, name)) for index in indices],
+                    max_concurrency=max_concurrency,
+                ))
+
+        total = time.perf_counter() - start
+        for index, ticket in enumerate(tickets):
+            final_result = results[index].get("final_insights")
+            if isinstance(final_result, Exception):
+                results[index]["final_insights"] = ""
+                results[index]["error"] = f"Failed to generate final insights: {str(final_result)}"
+            steps = ["fused"] if contexts[index]["mode"] == "fused" else self.executor.order
+            step_timings = {name: timings[name] for name in steps if name in timings}
+            self._finish_results(ticket, results[index], contexts[index], step_timings, total)
+        return results
@@ -18,10 +18,14 @@ class RecommendationResult(BaseModel):
 class RecommenderAgent(BaseAgent):
     """Agent that suggests resolutions based on historical data and knowledge bases."""
 
+    BATCH_CHAIN = "recommender_chain"
+
     def __init__(self):
         super().__init__(
             name=AGENT_CONFIG["recommender"]["name"],
-            description=AGENT_CONFIG["recommender"]["description"]
+            description=AGENT_CONFIG["recommender"]["description"],
+            use_cache=AGENT_CONFIG["recommender"].get("use_cache", False),
+            timeout=AGENT_CONFIG["recommender"].get("timeout"),
         )
         self._setup_chains()
 
@@ -63,7 +67,8 @@ class RecommenderAgent(BaseAgent):
         
         self.create_chain(
             chain_name="recommender_chain",
-            prompt_template=recommendation_template
+            prompt_template=recommendation_template,
+            output_model=RecommendationResult
         )
 
     def process(self, input_data: Dict[str, Any]) -> Dict[str, Any]:
@@ -80,23 +85,44 @@ class RecommenderAgent(BaseAgent):
         Returns:
             Dictionary with the recommendation results.
         """
-        chain_input = {
+        chain_input = self._build_chain_input(input_data)
+        
+        try:
+            result = self.chains["recommender_chain"].run_json(chain_input)
+            return self._parse_output(result)
+        except Exception as e:
+            return self._fallback_result(e)
+
+    async def aprocess(self, input_data: Dict[str, Any]) -> Dict[str, Any]:
+        """Async counterpart of process that awaits the chain instead of blocking."""
+        chain_input = self._build_chain_input(input_data)
+
+        try:
+            result = await self.chains["recommender_chain"].arun_json(chain_input)
+            return self._parse_output(result)
+        except Exception as e:
+            return self._fallback_result(e)
+
+    def _build_chain_input(self, input_data: Dict[str, Any]) -> Dict[str, Any]:
+        """Map the agent input onto the prompt variables of the chain."""
+        return {
             "ticket_content": input_data.get("ticket_content", ""),
             "ticket_summary": input_data.get("ticket_summary", ""),
             "routing_info": input_data.get("routing_info", ""),
             "historical_data": input_data.get("historical_data", "No historical data available."),
         }
-        
-        try:
-            result = self.chains["recommender_chain"].run(chain_input)
-            parsed_result = self.parse_output_to_dict(result, RecommendationResult)
-            return parsed_result
-        except Exception as e:
-            return {
-                "error": f"Failed to generate recommendations: {str(e)}",
-                "recommended_solutions": ["Escalate to appropriate team for further analysis."],
-                "knowledge_articles": [],
-                "similar_cases": [],
-                "estimated_resolution_time": "unknown",
-                "confidence_score": 0.0
-            } 
\ No newline at end of file
+
+    def _parse_output(self, output_text: str) -> Dict[str, Any]:
+        """Parse the chain output into a RecommendationResult dictionary."""
+        return self.parse_output_to_dict(output_text, RecommendationResult)
+
+    def _fallback_result(self, error: Exception) -> Dict[str, Any]:
+        """Result returned when the chain fails, so the pipeline can continue."""
+        return {
+            "error": f"Failed to generate recommendations: {str(error)}",
+            "recommended_solutions": ["Escalate to appropriate team for further analysis."],
+            "knowledge_articles": [],
+            "similar_cases": [],
+            "estimated_resolution_time": "unknown",
+            "confidence_score": 0.0
+        }
@@ -1,8 +1,9 @@
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Optional
 from pydantic import BaseModel, Field
 from langchain.output_parsers import PydanticOutputParser
 
 from src.agents.base_agent import BaseAgent
+from src.utils.fast_router import get_fast_router
 from config.config import AGENT_CONFIG
 
 
@@ -16,13 +17,23 @@ class RoutingResult(BaseModel):
 
 
 class RouterAgent(BaseAgent):
-    """Agent that routes tasks to appropriate teams based on content analysis."""
+    """
+    Agent that routes tasks to appropriate teams based on content analysis.
+
+    Tickets the local classifier is confident about (see FastRouter) are
+    routed without an LLM call; their results carry routed_by "classifier".
+    """
+
+    BATCH_CHAIN = "router_chain"
 
     def __init__(self):
         super().__init__(
             name=AGENT_CONFIG["router"]["name"],
-            description=AGENT_CONFIG["router"]["description"]
+            description=AGENT_CONFIG["router"]["description"],
+            use_cache=AGENT_CONFIG["router"].get("use_cache", False),
+            timeout=AGENT_CONFIG["router"].get("timeout"),
         )
+        self.fast_router = get_fast_router()
         self._setup_chains()
 
     def _setup_chains(self):
@@ -63,7 +74,8 @@ class RouterAgent(BaseAgent):
         
         self.create_chain(
             chain_name="router_chain",
-            prompt_template=routing_template
+            prompt_template=routing_template,
+            output_model=RoutingResult
         )
 
     def process(self, input_data: Dict[str, Any]) -> Dict[str, Any]:
@@ -74,25 +86,74 @@ class RouterAgent(BaseAgent):
             input_data: Dictionary containing the ticket content and summary
                 - ticket_content: The full ticket content
                 - ticket_summary: The summary of the ticket from the summarizer agent
+                - conversation: Optional raw conversation for the local
+                  classifier, when ticket_content was condensed to fit the
+                  prompt budget
                 
         Returns:
             Dictionary with the routing results.
         """
-        chain_input = {
-            "ticket_content": input_data.get("ticket_content", ""),
-            "ticket_summary": input_data.get("ticket_summary", ""),
-        }
+        fast = self._fast_route(input_data)
+        if fast is not None:
+            return fast
+        chain_input = self._build_chain_input(input_data)
         
         try:
-            result = self.chains["router_chain"].run(chain_input)
-            parsed_result = self.parse_output_to_dict(result, RoutingResult)
-            return parsed_result
+            result = self.chains["router_chain"].run_json(chain_input)
+            return self._parse_output(result)
         except Exception as e:
-            return {
-                "error": f"Failed to route ticket: {str(e)}",
-                "team": "unassigned",
-                "priority": "medium",
-                "skills_required": [],
-                "justification": "Error in routing process",
-                "escalation_needed": False
-            } 
\ No newline at end of file
+            return self._fallback_result(e)
+
+    async def aprocess(self, input_data: Dict[str, Any]) -> Dict[str, Any]:
+        """Async counterpart of process that awaits the chain instead of blocking."""
+        fast = self._fast_route(input_data)
+        if fast is not None:
+            return fast
+        chain_input = self._build_chain_input(input_data)
+
+        try:
+            result = await self.chains["router_chain"].arun_json(chain_input)
+            return self._parse_output(result)
+        except Exception as e:
+            return self._fallback_result(e)
+
+    def process_batch(self, inputs: List[Dict[str, Any]], max_concurrency: Optional[int] = None) -> List[Dict[str, Any]]:
+        """Route the inputs the classifier is confident about locally and batch the rest through the LLM."""
+        results: List[Optional[Dict[str, Any]]] = [self._fast_route(data) for data in inputs]
+        misses = [index for index, result in enumerate(results) if result is None]
+        if misses:
+            outputs = super().process_batch([inputs[index] for index in misses], max_concurrency=max_concurrency)
+            for index, output in zip(misses, outputs):
+                results[index] = output
+        return results
+
+    def _fast_route(self, input_data: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """The classifier's routing, or None if the LLM has to route the ticket."""
+        if self.fast_router is None:
+            return None
+        try:
+            return self.fast_router.route(input_data.get("conversation") or input_data.get("ticket_content", ""))
+        except Exception:
+            return None
+
+    def _build_chain_input(self, input_data: Dict[str, Any]) -> Dict[str, Any]:
+        """Map the agent input onto the prompt variables of the chain."""
+        return {
+            "ticket_content": input_data.get("ticket_content", ""),
+            "ticket_summary": input_data.get("ticket_summary", ""),
+        }
+
+    def _parse_output(self, output_text: str) -> Dict[str, Any]:
+        """Parse the chain output into a RoutingResult dictionary."""
+        return self.parse_output_to_dict(output_text, RoutingResult)
+
+    def _fallback_result(self, error: Exception) -> Dict[str, Any]:
+        """Result returned when the chain fails, so the pipeline can continue."""
+        return {
+            "error": f"Failed to route ticket: {str(error)}",
+            "team": "unassigned",
+            "priority": "medium",
+            "skills_required": [],
+            "justification": "Error in routing process",
+            "escalation_needed": False
+        }
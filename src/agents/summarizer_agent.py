@@ -18,10 +18,14 @@ class SummaryResult(BaseModel):
 class SummarizerAgent(BaseAgent):
     """Agent that summarizes customer conversations and extracts key information."""
 
+    BATCH_CHAIN = "summarizer_chain"
+
     def __init__(self):
         super().__init__(
             name=AGENT_CONFIG["summarizer"]["name"],
-            description=AGENT_CONFIG["summarizer"]["description"]
+            description=AGENT_CONFIG["summarizer"]["description"],
+            use_cache=AGENT_CONFIG["summarizer"].get("use_cache", False),
+            timeout=AGENT_CONFIG["summarizer"].get("timeout"),
         )
         self._setup_chains()
 
@@ -53,7 +57,8 @@ class SummarizerAgent(BaseAgent):
         
         self.create_chain(
             chain_name="summarizer_chain",
-            prompt_template=summary_template
+            prompt_template=summary_template,
+            output_model=SummaryResult
         )
 
     def process(self, input_data: Dict[str, Any]) -> Dict[str, Any]:
@@ -67,20 +72,41 @@ class SummarizerAgent(BaseAgent):
         Returns:
             Dictionary with the summary results.
         """
-        chain_input = {
-            "conversation": input_data.get("conversation", ""),
-        }
+        chain_input = self._build_chain_input(input_data)
         
         try:
-            result = self.chains["summarizer_chain"].run(chain_input)
-            parsed_result = self.parse_output_to_dict(result, SummaryResult)
-            return parsed_result
+            result = self.chains["summarizer_chain"].run_json(chain_input)
+            return self._parse_output(result)
+        except Exception as e:
+            return self._fallback_result(e)
+
+    async def aprocess(self, input_data: Dict[str, Any]) -> Dict[str, Any]:
+        """Async counterpart of process that awaits the chain instead of blocking."""
+        chain_input = self._build_chain_input(input_data)
+
+        try:
+            result = await self.chains["summarizer_chain"].arun_json(chain_input)
+            return self._parse_output(result)
         except Exception as e:
-            return {
-                "error": f"Failed to process conversation: {str(e)}",
-                "summary": "Error generating summary",
-                "key_points": [],
-                "action_items": [],
-                "sentiment": "unknown",
-                "urgency": "unknown"
-            } 
\ No newline at end of file
+            return self._fallback_result(e)
+
+    def _build_chain_input(self, input_data: Dict[str, Any]) -> Dict[str, Any]:
+        """Map the agent input onto the prompt variables of the chain."""
+        return {
+            "conversation": input_data.get("conversation", ""),
+        }
+
+    def _parse_output(self, output_text: str) -> Dict[str, Any]:
+        """Parse the chain output into a SummaryResult dictionary."""
+        return self.parse_output_to_dict(output_text, SummaryResult)
+
+    def _fallback_result(self, error: Exception) -> Dict[str, Any]:
+        """Result returned when the chain fails, so the pipeline can continue."""
+        return {
+            "error": f"Failed to process conversation: {str(error)}",
+            "summary": "Error generating summary",
+            "key_points": [],
+            "action_items": [],
+            "sentiment": "unknown",
+            "urgency": "unknown"
+        }
@@ -1,14 +1,30 @@
-from fastapi import FastAPI, HTTPException, BackgroundTasks
+import json
+import uuid
+import asyncio
+from datetime import datetime, timezone
+from fastapi import FastAPI, HTTPException, WebSocket, WebSocketDisconnect
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, List, Optional, Union, AsyncIterator
 from fastapi.middleware.cors import CORSMiddleware
 
 from src.agents.orchestrator import Orchestrator
 from src.agents.data_product_orchestrator import DataProductOrchestrator
 from src.utils.database import (
-    save_ticket, update_ticket_results, get_ticket,
-    create_job, update_job_status, get_job_tickets
+    save_ticket, get_ticket, create_job, update_job_status,
+    get_job, get_job_tickets, create_batch_job, assign_ticket_job, count_tickets,
+    list_tickets, iter_tickets, resolve_ticket
 )
+from src.utils.llm_cache import get_llm_cache
+from src.utils.llm_client import get_llm_registry
+from src.utils.resilience import circuit_breaker_stats
+from src.utils.single_flight import single_flight_stats
+from src.utils.events import get_event_hub, ticket_topic, job_topic
+from src.utils.job_queue import QueueFullError, WorkerPool
+from src.utils.broker import BrokerWorker, get_job_broker
+from src.utils.scheduler import get_admission_policy
+from src.api.jobs import start_job_workers
+from config.config import PIPELINE_CONFIG, JOB_QUEUE_CONFIG
 
 
 # Initialize the app
@@ -31,6 +47,21 @@ app.add_middleware(
 orchestrator = Orchestrator()
 data_product_orchestrator = DataProductOrchestrator()
 
+# Seconds between keep-alive comments on idle ticket and job streams
+SSE_KEEPALIVE_SECONDS = 15.0
+
+# Longest a /job_status long-poll may block
+LONG_POLL_MAX_SECONDS = 60.0
+
+# Job statuses after which no further events are published
+FINISHED_JOB_STATUSES = ("completed", "failed")
+
+# Retry-After hint sent with 429 responses when the job queue is full
+QUEUE_RETRY_AFTER_SECONDS = 30
+
+# Workers processing queued tickets in the API process (started with the app)
+worker_pool: Optional[Union[WorkerPool, BrokerWorker]] = None
+
 
 # Input models
 class TicketData(BaseModel):
@@ -38,6 +69,14 @@ class TicketData(BaseModel):
     conversation: str
     historical_data: Optional[str] = None
     metadata: Optional[Dict[str, Any]] = {}
+    mode: Optional[str] = None  # "staged" or "fused"; defaults to PIPELINE_CONFIG
+
+class TicketBatch(BaseModel):
+    tickets: List[TicketData]
+    mode: Optional[str] = None  # applies to tickets without their own mode
+
+class TicketResolution(BaseModel):
+    resolved_at: Optional[datetime] = None  # UTC; defaults to now
 
 class JobStatus(BaseModel):
     job_id: str
@@ -60,44 +99,133 @@ class DataFlowInput(BaseModel):
     source_mappings: Dict[str, Any]
 
 
+def ensure_queue_capacity(jobs: int, lane: str = "normal") -> None:
+    """Reject a submission with 429 if the job queue cannot take it."""
+    queue = get_job_broker()
+    max_depth = queue.max_depth - queue.reserved_depth if lane == "bulk" else queue.max_depth
+    if queue.depth() + jobs > max_depth:
+        raise HTTPException(
+            status_code=429,
+            detail="Too many pending jobs, retry later",
+            headers={"Retry-After": str(QUEUE_RETRY_AFTER_SECONDS)},
+        )
+
+def enqueue_or_fail(
+    job_id: str,
+    kind: str,
+    payloads: List[Dict[str, Any]],
+    lane: str = "normal",
+    tenant: str = "",
+) -> None:
+    """Enqueue the jobs of a saved submission, failing its job if the queue filled up meanwhile."""
+    try:
+        get_job_broker().enqueue(job_id, kind, payloads, lane=lane, tenant=tenant)
+    except QueueFullError:
+        update_job_status(job_id, "failed")
+        raise HTTPException(
+            status_code=429,
+            detail="Too many pending jobs, retry later",
+            headers={"Retry-After": str(QUEUE_RETRY_AFTER_SECONDS)},
+        )
+
+@app.on_event("startup")
+async def start_workers():
+    """Start processing queued tickets in the API process, unless JOB_WORKERS is 0."""
+    global worker_pool
+    if JOB_QUEUE_CONFIG["workers"] > 0:
+        worker_pool = start_job_workers(orchestrator, JOB_QUEUE_CONFIG["workers"])
+
+@app.on_event("shutdown")
+async def stop_workers():
+    """Let the workers finish their current job before the process exits."""
+    if worker_pool is not None:
+        await asyncio.to_thread(worker_pool.stop)
+
+
 # Customer Support API Endpoints
 @app.post("/process_tickets")
-async def process_tickets(ticket: TicketData, background_tasks: BackgroundTasks):
+async def process_tickets(ticket: TicketData):
     """
     Process a customer support ticket asynchronously.
     Returns a job ID that can be used to check the status of the processing.
     """
-    # Save the ticket to the database
-    ticket_id = save_ticket(ticket.dict())
+    if ticket.mode is not None and ticket.mode not in Orchestrator.MODES:
+        raise HTTPException(status_code=400, detail=f"Unknown pipeline mode: {ticket.mode}")
+    policy = get_admission_policy()
+    lane = policy.lane_for(ticket.dict())
+    ensure_queue_capacity(1, lane)
     
     # Create a job for processing
-    job_id = create_job(ticket_id)
+    job_id = f"job-{uuid.uuid4().hex}"
+    ticket_data = ticket.dict()
+    create_job(job_id)
     
-    # Process the ticket in the background
-    background_tasks.add_task(process_ticket_task, job_id, ticket.dict())
+    # Save the ticket to the database
+    save_ticket(ticket_data, job_id=job_id)
+    
+    # Hand the ticket to the worker pool, in its priority lane
+    enqueue_or_fail(job_id, "ticket", [ticket_data], lane=lane, tenant=policy.tenant_for(ticket_data))
     
     return {"job_id": job_id, "status": "processing"}
 
-async def process_ticket_task(job_id: str, ticket_data: Dict[str, Any]):
-    """Background task to process a ticket."""
-    try:
-        # Process the ticket
-        results = orchestrator.process_ticket(ticket_data)
-        
-        # Update the ticket with results
-        update_ticket_results(ticket_data["ticket_id"], results)
-        
-        # Update the job status
-        update_job_status(job_id, "completed", results)
-    except Exception as e:
-        # Update the job status with the error
-        update_job_status(job_id, "failed", {"error": str(e)})
+@app.post("/process_tickets/batch")
+async def process_ticket_batch(batch: TicketBatch):
+    """
+    Process a batch of customer support tickets asynchronously.
+    All tickets are saved in one transaction under a single job ID, whose
+    per-ticket status is reported by /job_status/{job_id}.
+    """
+    if not batch.tickets:
+        raise HTTPException(status_code=400, detail="Batch contains no tickets")
+    if len(batch.tickets) > PIPELINE_CONFIG["batch_max_tickets"]:
+        raise HTTPException(status_code=413, detail=f"Batch exceeds {PIPELINE_CONFIG['batch_max_tickets']} tickets")
+    ticket_ids = [ticket.ticket_id for ticket in batch.tickets]
+    if len(set(ticket_ids)) != len(ticket_ids):
+        raise HTTPException(status_code=400, detail="Duplicate ticket_id in batch")
+    for mode in {batch.mode, *(ticket.mode for ticket in batch.tickets)} - {None}:
+        if mode not in Orchestrator.MODES:
+            raise HTTPException(status_code=400, detail=f"Unknown pipeline mode: {mode}")
+    
+    tickets = [ticket.dict() for ticket in batch.tickets]
+    for ticket in tickets:
+        ticket["mode"] = ticket["mode"] or batch.mode
+    
+    # One queued job per chunk, so chunks spread over the workers
+    chunk_size = PIPELINE_CONFIG["batch_chunk_size"]
+    chunks = [tickets[offset:offset + chunk_size] for offset in range(0, len(tickets), chunk_size)]
+    ensure_queue_capacity(len(chunks), "bulk")
+    
+    # Save the tickets and the job in a single transaction
+    job_id = create_batch_job(tickets)
+    
+    # Batches are backfills: they go to the bulk lane, behind interactive tickets
+    enqueue_or_fail(
+        job_id,
+        "batch_chunk",
+        [{"tickets": chunk} for chunk in chunks],
+        lane="bulk",
+        tenant=get_admission_policy().batch_tenant(tickets),
+    )
+    
+    return {"job_id": job_id, "status": "processing", "tickets": len(tickets)}
 
 @app.get("/job_status/{job_id}")
-async def get_job_status(job_id: str):
+async def get_job_status(job_id: str, wait: float = 0):
     """
     Get the status of a job by its ID.
+    With `wait`, an unfinished job is only reported once one of its stages
+    completes or `wait` seconds (at most LONG_POLL_MAX_SECONDS) pass.
     """
+    if wait > 0:
+        # Subscribe before reading the job, so a change in between is not missed
+        subscription = get_event_hub().subscribe(job_topic(job_id), replay=False)
+        try:
+            job = get_job(job_id)
+            if job and job["status"] not in FINISHED_JOB_STATUSES:
+                await subscription.get(timeout=min(wait, LONG_POLL_MAX_SECONDS))
+        finally:
+            subscription.close()
+    
     # Get the job status from the database
     job = get_job_tickets(job_id)
     if not job:
@@ -105,6 +233,176 @@ async def get_job_status(job_id: str):
     
     return job
 
+@app.get("/job/{job_id}")
+async def get_job_by_id(job_id: str):
+    """
+    Get the status, ticket count and timing of a job.
+    """
+    job = get_job(job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Job not found")
+    
+    return job
+
+async def job_events(job_id: str) -> AsyncIterator[Optional[Dict[str, Any]]]:
+    """
+    Yield the stage and completion events of a job until it finishes.
+    
+    None is yielded after SSE_KEEPALIVE_SECONDS without events; the stored
+    job status is then read again, which also catches jobs completed by
+    workers in other processes.
+    """
+    subscription = get_event_hub().subscribe(job_topic(job_id))
+    try:
+        job = get_job(job_id)
+        while job["status"] not in FINISHED_JOB_STATUSES:
+            event = await subscription.get(timeout=SSE_KEEPALIVE_SECONDS)
+            if event is not None:
+                yield event
+                if event["type"] == "job_completed":
+                    return
+                continue
+            if not subscription.closed:
+                yield None
+            job = get_job(job_id)
+            if subscription.closed:
+                break
+        yield {"type": "job_completed", "job_id": job_id, "status": job["status"]}
+    finally:
+        subscription.close()
+
+@app.get("/jobs/{job_id}/events")
+async def stream_job_events(job_id: str):
+    """
+    Stream the stage and completion events of a job as Server-Sent Events.
+    The stream ends with a job_completed event.
+    """
+    if not get_job(job_id):
+        raise HTTPException(status_code=404, detail="Job not found")
+    
+    async def events():
+        async for event in job_events(job_id):
+            # Comment line keeps proxies from dropping an idle connection
+            yield format_sse(event) if event is not None else ": keep-alive\n\n"
+    
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+@app.websocket("/jobs/{job_id}/ws")
+async def job_events_websocket(websocket: WebSocket, job_id: str):
+    """
+    Send the stage and completion events of a job over a WebSocket, which is
+    closed after the job_completed event.
+    """
+    await websocket.accept()
+    if not get_job(job_id):
+        await websocket.close(code=4404, reason="Job not found")
+        return
+    
+    try:
+        async for event in job_events(job_id):
+            if event is not None:
+                await websocket.send_json(event)
+        await websocket.close()
+    except WebSocketDisconnect:
+        pass
+
+# Largest page of GET /tickets
+TICKET_PAGE_MAX = 500
+
+
+def ticket_fields(fields: Optional[str]) -> Optional[List[str]]:
+    """Parse a comma-separated sparse fieldset, None for the default fields."""
+    if fields is None:
+        return None
+    return [field.strip() for field in fields.split(",") if field.strip()]
+
+
+@app.get("/tickets")
+async def get_tickets(
+    limit: int = 50,
+    cursor: Optional[str] = None,
+    fields: Optional[str] = None,
+    status: Optional[str] = None,
+    team: Optional[str] = None,
+    priority: Optional[str] = None,
+    created_after: Optional[datetime] = None,
+    created_before: Optional[datetime] = None,
+):
+    """
+    List tickets newest first, with keyset pagination.
+    
+    Pass the returned `next_cursor` as `cursor` to get the next page.
+    `fields` is a comma-separated sparse fieldset; by default the large
+    conversation, historical_data and final_insights fields are left out.
+    """
+    if not 1 <= limit <= TICKET_PAGE_MAX:
+        raise HTTPException(status_code=400, detail=f"limit must be between 1 and {TICKET_PAGE_MAX}")
+    try:
+        tickets, next_cursor = list_tickets(
+            limit=limit, cursor=cursor, fields=ticket_fields(fields),
+            created_after=created_after, created_before=created_before,
+            status=status, team=team, priority=priority,
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    
+    return {"tickets": tickets, "next_cursor": next_cursor}
+
+@app.get("/tickets/export")
+async def export_tickets(
+    fields: Optional[str] = None,
+    status: Optional[str] = None,
+    team: Optional[str] = None,
+    priority: Optional[str] = None,
+    created_after: Optional[datetime] = None,
+    created_before: Optional[datetime] = None,
+):
+    """
+    Stream every matching ticket as newline-delimited JSON, newest first.
+    
+    Takes the same filters and fieldset as GET /tickets; tickets are read
+    page by page while the response is being sent.
+    """
+    try:
+        tickets = iter_tickets(
+            fields=ticket_fields(fields), created_after=created_after, created_before=created_before,
+            status=status, team=team, priority=priority,
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    
+    lines = (json.dumps(ticket) + "\n" for ticket in tickets)
+    return StreamingResponse(lines, media_type="application/x-ndjson")
+
+@app.get("/tickets/counts")
+async def get_ticket_counts(
+    group_by: str = "team,priority",
+    status: Optional[str] = None,
+    team: Optional[str] = None,
+    priority: Optional[str] = None,
+    escalation_needed: Optional[bool] = None,
+    urgency: Optional[str] = None,
+    sentiment: Optional[str] = None,
+):
+    """
+    Count tickets grouped by comma-separated fields (status, team, priority,
+    escalation_needed, urgency, sentiment), optionally filtered by them.
+    """
+    fields = [field.strip() for field in group_by.split(",") if field.strip()]
+    try:
+        counts = count_tickets(
+            fields, status=status, team=team, priority=priority,
+            escalation_needed=escalation_needed, urgency=urgency, sentiment=sentiment,
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    
+    return {"group_by": fields, "counts": counts}
+
 @app.get("/ticket/{ticket_id}")
 async def get_ticket_by_id(ticket_id: str):
     """
@@ -117,6 +415,141 @@ async def get_ticket_by_id(ticket_id: str):
     
     return ticket
 
+@app.post("/ticket/{ticket_id}/resume")
+async def resume_ticket(ticket_id: str):
+    """
+    Process the stages of an interrupted or failed ticket that have no
+    stored result yet. Returns the ID of the job doing so.
+    """
+    ticket = get_ticket(ticket_id)
+    if not ticket:
+        raise HTTPException(status_code=404, detail="Ticket not found")
+    if ticket["status"] == "completed":
+        raise HTTPException(status_code=409, detail="Ticket is already completed")
+    current_job = get_job(ticket["job_id"]) if ticket["job_id"] else None
+    if current_job and current_job["status"] not in FINISHED_JOB_STATUSES:
+        raise HTTPException(status_code=409, detail=f"Ticket is being processed by job {current_job['job_id']}")
+    ticket_data = {
+        "ticket_id": ticket_id,
+        "conversation": ticket["conversation"],
+        "historical_data": ticket["historical_data"],
+        "metadata": ticket["metadata"],
+    }
+    policy = get_admission_policy()
+    lane = policy.lane_for(ticket_data)
+    ensure_queue_capacity(1, lane)
+    
+    job_id = f"job-{uuid.uuid4().hex}"
+    create_job(job_id)
+    assign_ticket_job(ticket_id, job_id)
+    enqueue_or_fail(job_id, "ticket", [ticket_data], lane=lane, tenant=policy.tenant_for(ticket_data))
+    
+    return {"job_id": job_id, "status": "processing", "completed_stages": ticket["completed_stages"]}
+
+@app.post("/ticket/{ticket_id}/resolved")
+async def mark_ticket_resolved(ticket_id: str, resolution: Optional[TicketResolution] = None):
+    """
+    Record when the support team resolved a ticket. Resolved tickets train
+    the resolution-time model of the estimator.
+    """
+    resolved_at = resolution.resolved_at if resolution is not None else None
+    if resolved_at is not None and resolved_at.tzinfo is not None:
+        resolved_at = resolved_at.astimezone(timezone.utc).replace(tzinfo=None)
+    if not resolve_ticket(ticket_id, resolved_at):
+        raise HTTPException(status_code=404, detail="Ticket not found")
+    return {"ticket_id": ticket_id, "resolved_at": get_ticket(ticket_id)["resolved_at"]}
+
+def format_sse(event: Dict[str, Any]) -> str:
+    """Format a progress event as a Server-Sent Events message."""
+    return f"event: {event.get('type', 'message')}\ndata: {json.dumps(event)}\n\n"
+
+async def replay_ticket_events(ticket: Dict[str, Any]) -> AsyncIterator[str]:
+    """Replay the stored results of a completed ticket as progress events."""
+    for agent in ("summary", "routing", "recommendations", "estimation"):
+        yield format_sse({"type": "agent_result", "agent": agent, "result": ticket.get(agent)})
+    if ticket.get("final_insights"):
+        yield format_sse({"type": "final_token", "text": ticket["final_insights"]})
+    yield format_sse({"type": "completed", "ticket_id": ticket["ticket_id"]})
+
+async def failed_ticket_events(ticket: Dict[str, Any]) -> AsyncIterator[str]:
+    """End the stream of a failed ticket with the error of its first failed stage."""
+    errors = [
+        ticket[stage]["error"] for stage in ("summary", "routing", "recommendations", "estimation")
+        if isinstance(ticket.get(stage), dict) and "error" in ticket[stage]
+    ]
+    yield format_sse({"type": "failed", "error": errors[0] if errors else "Ticket processing failed"})
+
+def finished_ticket_status(ticket: Dict[str, Any]) -> Optional[str]:
+    """
+    "completed" or "failed" once no job will publish progress for a ticket
+    any more, None while it is being processed. A ticket left pending by a
+    job that gave up on it counts as failed.
+    """
+    job = get_job(ticket["job_id"]) if ticket["job_id"] else None
+    if job and job["status"] not in FINISHED_JOB_STATUSES:
+        return None
+    if ticket["status"] in ("completed", "failed"):
+        return ticket["status"]
+    return "failed" if job else None
+
+def finished_ticket_events(ticket: Dict[str, Any], status: str) -> AsyncIterator[str]:
+    """The events replayed for a ticket in a finished status."""
+    return replay_ticket_events(ticket) if status == "completed" else failed_ticket_events(ticket)
+
+async def live_ticket_events(ticket_id: str) -> AsyncIterator[str]:
+    """
+    Relay the progress events of a ticket that is still being processed.
+    
+    The event hub is per process, so tickets processed by standalone
+    workers publish nothing here, and the topic of a ticket that finished
+    before its retention ran out never closes. After SSE_KEEPALIVE_SECONDS
+    without events the stored ticket is read again, as job_events does, and
+    a finished ticket is replayed from the database.
+    """
+    subscription = get_event_hub().subscribe(ticket_topic(ticket_id))
+    try:
+        while True:
+            event = await subscription.get(timeout=SSE_KEEPALIVE_SECONDS)
+            if event is not None:
+                yield format_sse(event)
+                continue
+            if subscription.closed:
+                break
+            ticket = get_ticket(ticket_id)
+            status = finished_ticket_status(ticket) if ticket else "failed"
+            if status is not None:
+                async for message in finished_ticket_events(ticket or {}, status):
+                    yield message
+                break
+            # Comment line keeps proxies from dropping an idle connection
+            yield ": keep-alive\n\n"
+    finally:
+        subscription.close()
+
+@app.get("/ticket/{ticket_id}/stream")
+async def stream_ticket(ticket_id: str):
+    """
+    Stream the progress of a ticket as Server-Sent Events.
+    Each agent's result is pushed as soon as it is available, followed by the
+    final insights token by token. The stream of a failed ticket ends with a
+    failed event.
+    """
+    ticket = get_ticket(ticket_id)
+    if not ticket:
+        raise HTTPException(status_code=404, detail="Ticket not found")
+    
+    status = finished_ticket_status(ticket)
+    if status is not None:
+        events = finished_ticket_events(ticket, status)
+    else:
+        events = live_ticket_events(ticket_id)
+    
+    return StreamingResponse(
+        events,
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
 @app.get("/healthcheck")
 async def healthcheck():
     """
@@ -124,6 +557,46 @@ async def healthcheck():
     """
     return {"status": "ok"}
 
+@app.get("/llm_cache/stats")
+async def llm_cache_stats():
+    """
+    Get the hit/miss counters of the LLM response cache.
+    """
+    cache = get_llm_cache()
+    if cache is None:
+        return {"enabled": False}
+    return {"enabled": True, **cache.stats()}
+
+@app.get("/llm_clients/stats")
+async def llm_client_stats():
+    """
+    Get the number of shared LLM clients, the current LLM call load, the
+    circuit breaker state of each LLM backend, the calls and tickets
+    coalesced with identical ones in flight, and the tickets the local
+    classifier routed without the LLM.
+    """
+    return {
+        **get_llm_registry().stats(),
+        "circuit_breakers": circuit_breaker_stats(),
+        "single_flight": single_flight_stats(),
+        "fast_router": orchestrator.router.fast_router.stats() if orchestrator.router.fast_router else None,
+    }
+
+
+@app.get("/job_queue/stats")
+async def job_queue_stats():
+    """
+    Get the number of queued, running, done and failed jobs.
+    """
+    return get_job_broker().stats()
+
+@app.get("/context_budget/stats")
+async def context_budget_stats():
+    """
+    Get the prompt tokens sent per pipeline step and the tokens saved by the context budget.
+    """
+    return orchestrator.budget.stats()
+
 
 # Data Product Design API Endpoints
 @app.post("/data_product/use_case")
@@ -132,7 +605,7 @@ async def process_use_case(use_case: UseCase):
     Process a data product use case description.
     Returns the analyzed use case with extracted requirements.
     """
-    result = data_product_orchestrator.process_step('use_case', use_case.dict())
+    result = await data_product_orchestrator.aprocess_step('use_case', use_case.dict())
     return result
 
 @app.post("/data_product/target_design")
@@ -141,7 +614,7 @@ async def create_target_design(input_data: Dict[str, Any]):
     Create a target data model design based on the use case analysis.
     Returns the designed data model.
     """
-    result = data_product_orchestrator.process_step('target_design', input_data)
+    result = await data_product_orchestrator.aprocess_step('target_design', input_data)
     return result
 
 @app.post("/data_product/source_selection")
@@ -150,7 +623,7 @@ async def select_source_systems(source_systems: SourceSystems):
     Process the selection of source systems for the data product.
     Returns the confirmed source systems.
     """
-    result = data_product_orchestrator.process_step('source_identification', source_systems.dict())
+    result = await data_product_orchestrator.aprocess_step('source_identification', source_systems.dict())
     return result
 
 @app.post("/data_product/mapping")
@@ -159,7 +632,7 @@ async def create_attribute_mappings(mapping_input: DataProductMapping):
     Create mappings between source attributes and target data model.
     Returns the attribute mappings.
     """
-    result = data_product_orchestrator.process_step('mapping', mapping_input.dict())
+    result = await data_product_orchestrator.aprocess_step('mapping', mapping_input.dict())
     return result
 
 @app.post("/data_product/data_flow")
@@ -168,7 +641,7 @@ async def design_data_flow(flow_input: DataFlowInput):
     Design data ingress and egress processes for the data product.
     Returns the data flow design.
     """
-    result = data_product_orchestrator.process_step('data_flow', flow_input.dict())
+    result = await data_product_orchestrator.aprocess_step('data_flow', flow_input.dict())
     return result
 
 @app.post("/data_product/certification")
@@ -177,7 +650,7 @@ async def certify_data_product():
     Certify the complete data product design against quality standards.
     Returns the certification assessment.
     """
-    result = data_product_orchestrator.process_step('certification', {})
+    result = await data_product_orchestrator.aprocess_step('certification', {})
     return result
 
 @app.get("/data_product/complete_design")
@@ -0,0 +1,187 @@
+import asyncio
+import threading
+from typing import Dict, Any, Callable, Union
+
+from src.agents.orchestrator import Orchestrator, STAGES
+from src.utils.database import (
+    update_ticket_results, update_tickets_results, update_job_status,
+    mark_job_started, get_job_ticket_statuses, get_ticket_statuses, fail_pending_tickets,
+    get_ticket_stages, save_ticket_stage
+)
+from src.utils.events import get_event_hub, ticket_topic, job_topic
+from src.utils.job_queue import JobQueue, QueuedJob, WorkerPool
+from src.utils.broker import BrokerWorker, get_job_broker
+from config.config import PIPELINE_CONFIG, JOB_QUEUE_CONFIG
+
+
+class TicketJobHandlers:
+    """
+    Handlers for the ticket jobs of the job queue.
+
+    "ticket" jobs carry one ticket and publish progress events for
+    /ticket/{ticket_id}/stream; "batch_chunk" jobs carry a chunk of a batch
+    submission and complete the batch job once none of its tickets is
+    pending. Job state is kept in the database only, so the handlers work
+    the same in the API process and in standalone workers on other nodes.
+
+    Ticket pipelines run through Orchestrator.aprocess_ticket on one event
+    loop shared by the worker threads, so the LLM calls of every ticket in
+    flight are awaited on that loop instead of each holding threads.
+    """
+
+    def __init__(self, orchestrator: Orchestrator, max_attempts: int):
+        self.orchestrator = orchestrator
+        self.max_attempts = max_attempts
+        self.loop = asyncio.new_event_loop()
+        threading.Thread(target=self.loop.run_forever, name="ticket-pipelines", daemon=True).start()
+
+    def handlers(self) -> Dict[str, Callable[[QueuedJob], None]]:
+        """Handlers by job kind, for WorkerPool."""
+        return {
+            "ticket": self.process_ticket,
+            "batch_chunk": self.process_batch_chunk,
+        }
+
+    def _is_last_attempt(self, job: QueuedJob) -> bool:
+        return job.attempts >= self.max_attempts
+
+    def _finish_job(self, job_id: str, status: str) -> None:
+        """Store the final status of a job and notify its subscribers."""
+        update_job_status(job_id, status)
+        hub = get_event_hub()
+        hub.publish(job_topic(job_id), {"type": "job_completed", "job_id": job_id, "status": status})
+        hub.close(job_topic(job_id))
+
+    def process_ticket(self, job: QueuedJob) -> None:
+        """Process a single ticket and store its results."""
+        ticket_data = job.payload
+        ticket_id = ticket_data["ticket_id"]
+        mark_job_started(job.job_id)
+        hub = get_event_hub()
+        topic = ticket_topic(ticket_id)
+
+        def publish(event):
+            hub.publish(topic, event)
+            if event.get("type") == "agent_result":
+                hub.publish(job_topic(job.job_id), {
+                    "type": "stage_completed", "ticket_id": ticket_id, "stage": event["agent"]
+                })
+
+        try:
+            # Stages stored by an earlier attempt are not paid for again
+            completed = get_ticket_stages(ticket_id)
+            results = asyncio.run_coroutine_threadsafe(
+                self._aprocess_ticket(ticket_data, publish, completed), self.loop
+            ).result()
+            failed = [stage for stage in STAGES if Orchestrator.stage_failed(results.get(stage))]
+            if failed and not self._is_last_attempt(job):
+                raise RuntimeError(f"Stages failed: {', '.join(failed)}")
+            if failed:
+                results.setdefault("error", f"Stages failed: {', '.join(failed)}")
+            update_ticket_results(ticket_id, results)
+        except Exception as e:
+            if not self._is_last_attempt(job):
+                raise
+            hub.publish(topic, {"type": "failed", "error": str(e)})
+            hub.close(topic)
+            self._finish_job(job.job_id, "failed")
+            raise
+        hub.close(topic)
+        self._finish_job(job.job_id, "failed" if results.get("error") else "completed")
+
+    async def _aprocess_ticket(
+        self,
+        ticket_data: Dict[str, Any],
+        publish: Callable[[Dict[str, Any]], None],
+        completed: Dict[str, Any],
+    ) -> Dict[str, Any]:
+        """Run a ticket's pipeline on the handlers' loop, storing stage checkpoints off the loop."""
+        ticket_id = ticket_data["ticket_id"]
+        loop = asyncio.get_running_loop()
+        writes = []
+
+        def checkpoint(stage: str, result: Any) -> None:
+            # The write waits for its group commit, which must not block the loop
+            writes.append(loop.run_in_executor(None, save_ticket_stage, ticket_id, stage, result))
+
+        results = await self.orchestrator.aprocess_ticket(
+            ticket_data, publish=publish, completed=completed, checkpoint=checkpoint
+        )
+        await asyncio.gather(*writes)
+        return results
+
+    def process_batch_chunk(self, job: QueuedJob) -> None:
+        """
+        Process one chunk of a batch submission with batched LLM calls.
+
+        Tickets whose stages all succeeded are stored right away; the others
+        make the job fail and, on retry, are the only ones processed again.
+        On the last attempt they are stored as failed instead.
+        """
+        mark_job_started(job.job_id)
+        last_attempt = self._is_last_attempt(job)
+        ticket_ids = [ticket["ticket_id"] for ticket in job.payload["tickets"]]
+        try:
+            statuses = get_ticket_statuses(ticket_ids)
+            tickets = [ticket for ticket in job.payload["tickets"] if statuses.get(ticket["ticket_id"]) != "completed"]
+            results = self.orchestrator.process_batch(
+                tickets,
+                max_concurrency=PIPELINE_CONFIG["batch_max_concurrency"],
+            ) if tickets else []
+
+            stored, retried = [], []
+            for result in results:
+                failed = [stage for stage in STAGES if Orchestrator.stage_failed(result.get(stage))]
+                if failed and not last_attempt:
+                    retried.append(result["ticket_id"])
+                    continue
+                if failed:
+                    result.setdefault("error", f"Stages failed: {', '.join(failed)}")
+                stored.append(result)
+            update_tickets_results(stored)
+            get_event_hub().publish(job_topic(job.job_id), {
+                "type": "stage_completed",
+                "ticket_ids": [result["ticket_id"] for result in stored],
+                "stage": "batch_chunk",
+            })
+            if retried:
+                raise RuntimeError(f"Stages failed for tickets: {', '.join(retried)}")
+        except Exception:
+            if last_attempt:
+                fail_pending_tickets(ticket_ids)
+                self._finish_batch_job(job.job_id)
+            raise
+
+        self._finish_batch_job(job.job_id)
+
+    def _finish_batch_job(self, job_id: str) -> None:
+        """Complete a batch job once none of its tickets is pending."""
+        # Chunks may finish on different workers; whichever sees no pending ticket closes the job
+        statuses = get_job_ticket_statuses(job_id)
+        if "pending" not in statuses:
+            self._finish_job(job_id, "failed" if "failed" in statuses else "completed")
+
+def start_job_workers(orchestrator: Orchestrator, workers: int) -> Union[WorkerPool, BrokerWorker]:
+    """
+    Start consuming ticket jobs from the configured job backend.
+
+    With the SQLite queue, jobs left running by a previous process are queued
+    again first, so only one process should consume a given SQLite queue;
+    broker backends redeliver unacknowledged jobs themselves.
+
+    Args:
+        orchestrator: Orchestrator running the ticket pipelines
+        workers: Worker threads for the SQLite queue (brokers use their prefetch count)
+
+    Returns:
+        The started worker, to be stopped on shutdown
+    """
+    backend = get_job_broker()
+    handlers = TicketJobHandlers(orchestrator, backend.max_attempts).handlers()
+    if isinstance(backend, JobQueue):
+        backend.recover()
+        worker = WorkerPool(backend, handlers, workers=workers, poll_interval=JOB_QUEUE_CONFIG["poll_interval"])
+    else:
+        worker = BrokerWorker(backend, handlers)
+    worker.start()
+    return worker
@@ -0,0 +1,401 @@
+import json
+import queue
+import logging
+import threading
+import functools
+from abc import ABC, abstractmethod
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Any, List, Optional, Callable, Tuple, Union
+
+from src.utils.job_queue import JobQueue, QueuedJob, QueueFullError, get_job_queue
+from src.utils.scheduler import LANES
+from config.config import JOB_QUEUE_CONFIG, RABBITMQ_CONFIG, SCHEDULER_CONFIG
+
+
+logger = logging.getLogger("lightspeed")
+
+
+class Broker(ABC):
+    """
+    Message broker that ticket jobs are published to and consumed from.
+
+    A consumer holds at most `prefetch_count` unacknowledged jobs and runs
+    them concurrently; a job is acknowledged once its handler returns. A job
+    whose handler raises is published again with its attempt count raised,
+    until `max_attempts` is reached and it is dead-lettered.
+
+    Priority lanes are delivered in strict priority order; unlike JobQueue,
+    brokers apply no weighted fair queuing or per-tenant caps.
+    """
+
+    def __init__(
+        self,
+        max_depth: int = 10000,
+        max_attempts: int = 3,
+        prefetch_count: int = 4,
+        reserved_depth: int = 0,
+    ):
+        self.max_depth = max_depth
+        self.max_attempts = max_attempts
+        self.prefetch_count = prefetch_count
+        self.reserved_depth = reserved_depth
+
+    @abstractmethod
+    def depth(self) -> int:
+        """Number of jobs waiting to be delivered."""
+        pass
+
+    @abstractmethod
+    def publish(self, job_id: str, kind: str, payloads: List[Dict[str, Any]], lane: str = "normal") -> None:
+        """Publish one message per payload."""
+        pass
+
+    @abstractmethod
+    def consume(self, handler: Callable[[QueuedJob], None], stop: threading.Event) -> None:
+        """Deliver jobs to the handler until `stop` is set, then drain the jobs in flight."""
+        pass
+
+    def stats(self) -> Dict[str, Any]:
+        """Get the broker's queue statistics."""
+        return {"queued": self.depth(), "max_depth": self.max_depth}
+
+    def enqueue(
+        self,
+        job_id: str,
+        kind: str,
+        payloads: List[Dict[str, Any]],
+        lane: str = "normal",
+        tenant: str = "",
+    ) -> None:
+        """
+        Publish jobs, applying the same depth limits as JobQueue.enqueue.
+
+        The tenant is accepted for compatibility with JobQueue.enqueue but
+        not enforced.
+
+        Raises:
+            QueueFullError: If the queue cannot take all of the jobs
+        """
+        if lane not in LANES:
+            raise ValueError(f"Unknown lane '{lane}', expected one of {list(LANES)}")
+        max_depth = self.max_depth - self.reserved_depth if lane == "bulk" else self.max_depth
+        depth = self.depth()
+        if depth + len(payloads) > max_depth:
+            raise QueueFullError(f"Job queue is full for {lane} jobs ({depth}/{max_depth} jobs pending)")
+        self.publish(job_id, kind, payloads, lane)
+
+
+class InMemoryBroker(Broker):
+    """
+    In-process stand-in for RabbitMQBroker, for tests and single-node setups.
+
+    Jobs are lost when the process exits; dead-lettered jobs are kept in
+    `dead_letters`.
+    """
+
+    def __init__(
+        self,
+        max_depth: int = 10000,
+        max_attempts: int = 3,
+        prefetch_count: int = 4,
+        reserved_depth: int = 0,
+    ):
+        super().__init__(max_depth, max_attempts, prefetch_count, reserved_depth)
+        # Ordered by lane, then publication order
+        self._queue: "queue.PriorityQueue[Tuple[int, int, QueuedJob]]" = queue.PriorityQueue()
+        self._next_id = 0
+        self._lock = threading.Lock()
+        self.dead_letters: List[QueuedJob] = []
+
+    def depth(self) -> int:
+        return self._queue.qsize()
+
+    def publish(
+        self,
+        job_id: str,
+        kind: str,
+        payloads: List[Dict[str, Any]],
+        lane: str = "normal",
+        attempts: int = 0,
+    ) -> None:
+        for payload in payloads:
+            with self._lock:
+                self._next_id += 1
+                id = self._next_id
+            # Round-trip through JSON like a real broker, so payloads must serialize
+            job = QueuedJob(id, job_id, kind, json.loads(json.dumps(payload)), attempts, lane)
+            self._queue.put((LANES.index(lane), id, job))
+
+    def consume(self, handler: Callable[[QueuedJob], None], stop: threading.Event) -> None:
+        in_flight = threading.Semaphore(self.prefetch_count)
+        with ThreadPoolExecutor(max_workers=self.prefetch_count) as pool:
+            while not stop.is_set():
+                if not in_flight.acquire(timeout=0.1):
+                    continue
+                try:
+                    _, _, job = self._queue.get(timeout=0.1)
+                except queue.Empty:
+                    in_flight.release()
+                    continue
+                job.attempts += 1
+                pool.submit(self._deliver, handler, job, in_flight)
+
+    def _deliver(self, handler: Callable[[QueuedJob], None], job: QueuedJob, in_flight: threading.Semaphore) -> None:
+        try:
+            handler(job)
+        except Exception:
+            logger.exception(f"Job {job.job_id} ({job.kind}) failed on attempt {job.attempts}")
+            if job.attempts < self.max_attempts:
+                self.publish(job.job_id, job.kind, [job.payload], job.lane, attempts=job.attempts)
+            else:
+                self.dead_letters.append(job)
+        finally:
+            in_flight.release()
+
+
+class RabbitMQBroker(Broker):
+    """
+    Broker backed by a durable RabbitMQ queue.
+
+    Messages are persistent and acknowledged manually after processing, so a
+    worker that dies mid-job has its unacknowledged jobs redelivered to
+    another worker. Handlers run on a thread pool sized to the prefetch
+    count while the connection thread keeps serving heartbeats; acks are
+    handed back to it with add_callback_threadsafe. Jobs that run out of
+    attempts are rejected to the queue's dead-letter exchange, if any.
+
+    With `max_priority` set, the queue is declared as a priority queue and
+    lanes map to message priorities. RabbitMQ cannot change the arguments of
+    an existing queue, so enabling it needs a new queue name.
+    """
+
+    def __init__(
+        self,
+        host: str = "localhost",
+        port: int = 5672,
+        username: str = "guest",
+        password: str = "guest",
+        virtual_host: str = "/",
+        queue_name: str = "ticket_jobs",
+        heartbeat: int = 60,
+        max_depth: int = 10000,
+        max_attempts: int = 3,
+        prefetch_count: int = 4,
+        reserved_depth: int = 0,
+        max_priority: int = 0,
+    ):
+        super().__init__(max_depth, max_attempts, prefetch_count, reserved_depth)
+        self.max_priority = max_priority
+        # pika is only needed when RabbitMQ is the configured backend
+        import pika
+
+        self._pika = pika
+        self.queue_name = queue_name
+        self._parameters = pika.ConnectionParameters(
+            host=host,
+            port=port,
+            virtual_host=virtual_host,
+            credentials=pika.PlainCredentials(username, password),
+            heartbeat=heartbeat,
+        )
+        # BlockingConnection is not thread-safe: publishers keep one per thread
+        self._local = threading.local()
+
+    def _channel(self):
+        channel = getattr(self._local, "channel", None)
+        if channel is None or channel.is_closed or channel.connection.is_closed:
+            connection = self._pika.BlockingConnection(self._parameters)
+            channel = connection.channel()
+            self._declare(channel)
+            channel.confirm_delivery()
+            self._local.channel = channel
+        return channel
+
+    def _with_channel(self, operation: Callable[[Any], Any]) -> Any:
+        """Run an operation on this thread's channel, reconnecting once if the connection dropped."""
+        try:
+            return operation(self._channel())
+        except self._pika.exceptions.AMQPConnectionError:
+            self._local.channel = None
+            return operation(self._channel())
+
+    def _declare(self, channel) -> None:
+        arguments = {"x-max-priority": self.max_priority} if self.max_priority > 0 else None
+        channel.queue_declare(queue=self.queue_name, durable=True, arguments=arguments)
+
+    def depth(self) -> int:
+        return self._with_channel(
+            lambda channel: channel.queue_declare(queue=self.queue_name, durable=True, passive=True).method.message_count
+        )
+
+    def _properties(self, job_id: str, kind: str, attempts: int, lane: str):
+        return self._pika.BasicProperties(
+            content_type="application/json",
+            delivery_mode=2,
+            priority=max(self.max_priority - LANES.index(lane), 0) if self.max_priority > 0 else None,
+            headers={"job_id": job_id, "kind": kind, "attempts": attempts, "lane": lane},
+        )
+
+    def publish(self, job_id: str, kind: str, payloads: List[Dict[str, Any]], lane: str = "normal") -> None:
+        def send(channel):
+            for payload in payloads:
+                channel.basic_publish(
+                    exchange="",
+                    routing_key=self.queue_name,
+                    body=json.dumps(payload),
+                    properties=self._properties(job_id, kind, 0, lane),
+                )
+        self._with_channel(send)
+
+    def stats(self) -> Dict[str, Any]:
+        declared = self._with_channel(
+            lambda channel: channel.queue_declare(queue=self.queue_name, durable=True, passive=True)
+        )
+        return {
+            "queued": declared.method.message_count,
+            "consumers": declared.method.consumer_count,
+            "max_depth": self.max_depth,
+        }
+
+    def consume(self, handler: Callable[[QueuedJob], None], stop: threading.Event) -> None:
+        connection = self._pika.BlockingConnection(self._parameters)
+        channel = connection.channel()
+        self._declare(channel)
+        channel.basic_qos(prefetch_count=self.prefetch_count)
+        in_flight: set = set()
+        pool = ThreadPoolExecutor(max_workers=self.prefetch_count)
+
+        def on_message(channel, method, properties, body):
+            headers = properties.headers or {}
+            job = QueuedJob(
+                method.delivery_tag,
+                headers.get("job_id", ""),
+                headers.get("kind", "ticket"),
+                json.loads(body),
+                int(headers.get("attempts", 0)) + 1,
+                headers.get("lane", "normal"),
+            )
+            in_flight.add(method.delivery_tag)
+            pool.submit(self._deliver, connection, channel, handler, job, in_flight)
+
+        consumer_tag = channel.basic_consume(self.queue_name, on_message, auto_ack=False)
+        try:
+            while not stop.is_set():
+                connection.process_data_events(time_limit=1)
+            channel.basic_cancel(consumer_tag)
+            # Keep serving the connection until the jobs in flight are acknowledged
+            while in_flight:
+                connection.process_data_events(time_limit=1)
+        finally:
+            pool.shutdown(wait=True)
+            if connection.is_open:
+                connection.close()
+
+    def _deliver(self, connection, channel, handler: Callable[[QueuedJob], None], job: QueuedJob, in_flight: set) -> None:
+        try:
+            handler(job)
+            settle = functools.partial(channel.basic_ack, job.id)
+        except Exception:
+            logger.exception(f"Job {job.job_id} ({job.kind}) failed on attempt {job.attempts}")
+            settle = functools.partial(self._retry_or_reject, channel, job)
+
+        def callback():
+            settle()
+            in_flight.discard(job.id)
+
+        connection.add_callback_threadsafe(callback)
+
+    def _retry_or_reject(self, channel, job: QueuedJob) -> None:
+        if job.attempts < self.max_attempts:
+            # Republish with the attempt count, since a requeued message keeps its headers
+            channel.basic_publish(
+                exchange="",
+                routing_key=self.queue_name,
+                body=json.dumps(job.payload),
+                properties=self._properties(job.job_id, job.kind, job.attempts, job.lane),
+            )
+            channel.basic_ack(job.id)
+        else:
+            channel.basic_nack(job.id, requeue=False)
+
+
+class BrokerWorker:
+    """
+    Consumes jobs from a Broker on a background thread, dispatching each
+    job to the handler registered for its kind. Same start/stop interface
+    as WorkerPool.
+    """
+
+    def __init__(self, broker: Broker, handlers: Dict[str, Callable[[QueuedJob], None]]):
+        self.broker = broker
+        self.handlers = handlers
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def _dispatch(self, job: QueuedJob) -> None:
+        self.handlers[job.kind](job)
+
+    def _consume(self) -> None:
+        while not self._stop.is_set():
+            try:
+                self.broker.consume(self._dispatch, self._stop)
+            except Exception:
+                logger.exception("Broker consumer failed, reconnecting")
+                self._stop.wait(5)
+
+    def start(self) -> None:
+        """Start consuming."""
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._consume, name="broker-worker", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: Optional[float] = None) -> None:
+        """Stop taking new jobs and wait for the jobs in flight."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+
+_broker: Optional[Broker] = None
+_broker_lock = threading.Lock()
+
+
+def get_job_broker() -> Union[JobQueue, Broker]:
+    """
+    Get the process-wide job backend selected by JOB_QUEUE_CONFIG["backend"].
+
+    "sqlite" returns the durable JobQueue, "rabbitmq" a RabbitMQBroker and
+    "memory" an InMemoryBroker.
+    """
+    global _broker
+    backend = JOB_QUEUE_CONFIG["backend"]
+    if backend == "sqlite":
+        return get_job_queue()
+    with _broker_lock:
+        if _broker is None:
+            if backend == "rabbitmq":
+                _broker = RabbitMQBroker(
+                    host=RABBITMQ_CONFIG["host"],
+                    port=RABBITMQ_CONFIG["port"],
+                    username=RABBITMQ_CONFIG["username"],
+                    password=RABBITMQ_CONFIG["password"],
+                    virtual_host=RABBITMQ_CONFIG["virtual_host"],
+                    queue_name=RABBITMQ_CONFIG["queue"],
+                    heartbeat=RABBITMQ_CONFIG["heartbeat"],
+                    max_depth=JOB_QUEUE_CONFIG["max_depth"],
+                    max_attempts=JOB_QUEUE_CONFIG["max_attempts"],
+                    prefetch_count=RABBITMQ_CONFIG["prefetch_count"],
+                    reserved_depth=SCHEDULER_CONFIG["reserved_depth"],
+                    max_priority=RABBITMQ_CONFIG["max_priority"],
+                )
+            elif backend == "memory":
+                _broker = InMemoryBroker(
+                    max_depth=JOB_QUEUE_CONFIG["max_depth"],
+                    max_attempts=JOB_QUEUE_CONFIG["max_attempts"],
+                    prefetch_count=RABBITMQ_CONFIG["prefetch_count"],
+                    reserved_depth=SCHEDULER_CONFIG["reserved_depth"],
+                )
+            else:
+                raise ValueError(f"Unknown job queue backend: {backend}")
+        return _broker
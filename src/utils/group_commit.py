@@ -0,0 +1,143 @@
+import time
+import queue
+import threading
+from concurrent.futures import Future
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+
+class GroupCommitWriter:
+    """
+    Group commit of small database writes.
+
+    Writes submitted from many worker threads are queued and applied by one
+    writer thread, up to `max_batch` of them in a single transaction, so N
+    concurrent workers pay for one fsync instead of N and never contend for
+    SQLite's write lock. Writes that arrive while a transaction is being
+    committed go into the next one; `linger` optionally waits a little for
+    more writes before committing.
+
+    Callers get a Future that resolves once the transaction holding their
+    write has committed, so `write()` keeps read-your-writes semantics. If a
+    transaction fails, its writes are retried one by one so a single bad
+    write only fails its own caller.
+    """
+
+    def __init__(self, session_factory: Callable[[], Any], max_batch: int = 64, linger: float = 0.0):
+        self.session_factory = session_factory
+        self.max_batch = max(max_batch, 1)
+        self.linger = linger
+        self._queue: "queue.Queue[Tuple[Callable[[Any], None], Future]]" = queue.Queue()
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+        self.transactions = 0
+        self.writes = 0
+
+    def _ensure_started(self) -> None:
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="db-group-commit", daemon=True)
+                self._thread.start()
+
+    def submit(self, write: Callable[[Any], None]) -> Future:
+        """
+        Queue a write for the next group commit.
+
+        Args:
+            write: Callable applying the write to the given session, without committing
+
+        Returns:
+            Future resolving to None once the write is committed
+        """
+        future: Future = Future()
+        self._ensure_started()
+        self._queue.put((write, future))
+        return future
+
+    def write(self, write: Callable[[Any], None]) -> None:
+        """Apply a write through the group commit and wait until it is committed."""
+        self.submit(write).result()
+
+    def stop(self, timeout: Optional[float] = None) -> None:
+        """
+        Commit the writes queued so far and end the writer thread.
+
+        Call it once no more writes are submitted, e.g. on shutdown; a later
+        submit starts a new writer thread.
+        """
+        with self._lock:
+            thread, self._thread = self._thread, None
+        if thread is None:
+            return
+        # None marks the end of the queue for the writer thread
+        self._queue.put(None)
+        thread.join(timeout)
+
+    def _next_batch(self) -> List[Optional[Tuple[Callable[[Any], None], Future]]]:
+        batch = [self._queue.get()]
+        linger_until = time.monotonic() + self.linger
+        while len(batch) < self.max_batch and batch[-1] is not None:
+            try:
+                wait = linger_until - time.monotonic()
+                batch.append(self._queue.get(timeout=wait) if wait > 0 else self._queue.get_nowait())
+            except queue.Empty:
+                break
+        return batch
+
+    def _run(self) -> None:
+        while True:
+            batch = self._next_batch()
+            stopping = batch[-1] is None
+            if stopping:
+                batch.pop()
+            if batch:
+                try:
+                    self._commit(batch)
+                except Exception as e:
+                    # Even the session could not be opened; fail the whole batch
+                    for _, future in batch:
+                        if not future.done():
+                            future.set_exception(e)
+            if stopping:
+                return
+
+    def _commit(self, batch: List[Tuple[Callable[[Any], None], Future]]) -> None:
+        with self.session_factory() as session:
+            try:
+                for write, _ in batch:
+                    write(session)
+                    # Later writes of the batch must see this one, even through bulk updates
+                    session.flush()
+                    session.expire_all()
+                session.commit()
+            except Exception:
+                session.rollback()
+            else:
+                self._committed(len(batch), 1)
+                for _, future in batch:
+                    future.set_result(None)
+                return
+
+            for write, future in batch:
+                try:
+                    write(session)
+                    session.commit()
+                except Exception as e:
+                    session.rollback()
+                    future.set_exception(e)
+                else:
+                    self._committed(1, 1)
+                    future.set_result(None)
+
+    def _committed(self, writes: int, transactions: int) -> None:
+        with self._lock:
+            self.writes += writes
+            self.transactions += transactions
+
+    def stats(self) -> Dict[str, Any]:
+        """Get the committed write and transaction counts and the queued writes."""
+        with self._lock:
+            return {
+                "writes": self.writes,
+                "transactions": self.transactions,
+                "queued": self._queue.qsize(),
+            }
@@ -0,0 +1,397 @@
+import os
+import json
+import time
+import uuid
+import sqlite3
+import logging
+import threading
+from typing import Dict, Any, List, Optional, Callable, Tuple
+
+from src.utils.scheduler import LANES, LaneScheduler
+from config.config import JOB_QUEUE_CONFIG, SCHEDULER_CONFIG
+
+
+logger = logging.getLogger("lightspeed")
+
+
+class QueueFullError(Exception):
+    """Raised when enqueueing would exceed the maximum queue depth."""
+
+
+class QueuedJob:
+    """A job claimed from the queue by a worker."""
+
+    def __init__(self, id: int, job_id: str, kind: str, payload: Dict[str, Any], attempts: int, lane: str = "normal"):
+        self.id = id
+        self.job_id = job_id
+        self.kind = kind
+        self.payload = payload
+        self.attempts = attempts
+        self.lane = lane
+
+
+class JobQueue:
+    """
+    Durable FIFO job queue stored in SQLite.
+
+    A claimed job is leased to its worker for `lease_seconds`; a job whose
+    lease runs out (its worker crashed or hung) is handed out again, up to
+    `max_attempts` times. Enqueueing beyond `max_depth` pending jobs raises
+    QueueFullError so callers can apply backpressure; the last
+    `reserved_depth` slots are kept for jobs outside the bulk lane.
+
+    Jobs are queued in priority lanes (see AdmissionPolicy). With a
+    scheduler, workers take jobs from the lanes by weighted fair queuing,
+    FIFO within a lane; without one, in plain FIFO order. A tenant with
+    `tenant_max_concurrency` jobs running gets no further job until one
+    finishes (0 disables the cap, and jobs without a tenant are not capped).
+    """
+
+    def __init__(
+        self,
+        sqlite_path: str,
+        max_depth: int = 10000,
+        lease_seconds: float = 900.0,
+        max_attempts: int = 3,
+        scheduler: Optional[LaneScheduler] = None,
+        tenant_max_concurrency: int = 0,
+        reserved_depth: int = 0,
+    ):
+        self.sqlite_path = sqlite_path
+        self.max_depth = max_depth
+        self.lease_seconds = lease_seconds
+        self.max_attempts = max_attempts
+        self.scheduler = scheduler
+        self.tenant_max_concurrency = tenant_max_concurrency
+        self.reserved_depth = reserved_depth
+        self._lock = threading.Lock()
+
+        directory = os.path.dirname(sqlite_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._conn = sqlite3.connect(sqlite_path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS job_queue (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                job_id TEXT NOT NULL,
+                kind TEXT NOT NULL,
+                payload TEXT NOT NULL,
+                lane TEXT NOT NULL DEFAULT 'normal',
+                tenant TEXT NOT NULL DEFAULT '',
+                status TEXT NOT NULL DEFAULT 'queued',
+                attempts INTEGER NOT NULL DEFAULT 0,
+                worker TEXT,
+                lease_expires REAL,
+                error TEXT,
+                created_at REAL NOT NULL,
+                updated_at REAL NOT NULL
+            )
+            """
+        )
+        # Queues created before priority lanes existed
+        columns = {row[1] for row in self._conn.execute("PRAGMA table_info(job_queue)")}
+        if "lane" not in columns:
+            self._conn.execute("ALTER TABLE job_queue ADD COLUMN lane TEXT NOT NULL DEFAULT 'normal'")
+        if "tenant" not in columns:
+            self._conn.execute("ALTER TABLE job_queue ADD COLUMN tenant TEXT NOT NULL DEFAULT ''")
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS ix_job_queue_status ON job_queue (status, id)"
+        )
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS ix_job_queue_lane ON job_queue (lane, status, id)"
+        )
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS ix_job_queue_tenant ON job_queue (tenant, status)"
+        )
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS ix_job_queue_job_id ON job_queue (job_id)"
+        )
+
+    def depth(self) -> int:
+        """Number of jobs that are queued or being processed."""
+        with self._lock:
+            return self._conn.execute(
+                "SELECT COUNT(*) FROM job_queue WHERE status IN ('queued', 'running')"
+            ).fetchone()[0]
+
+    def enqueue(
+        self,
+        job_id: str,
+        kind: str,
+        payloads: List[Dict[str, Any]],
+        lane: str = "normal",
+        tenant: str = "",
+    ) -> List[int]:
+        """
+        Add jobs to the queue in one transaction.
+
+        Args:
+            job_id: ID of the API job the queued jobs belong to
+            kind: Handler name of the jobs
+            payloads: One JSON-serializable payload per queued job
+            lane: Priority lane of the jobs (see LANES)
+            tenant: Tenant the jobs count against, or "" for none
+
+        Returns:
+            The queue IDs of the new jobs
+
+        Raises:
+            QueueFullError: If the queue cannot take all of the jobs
+        """
+        if lane not in LANES:
+            raise ValueError(f"Unknown lane '{lane}', expected one of {list(LANES)}")
+        max_depth = self.max_depth - self.reserved_depth if lane == "bulk" else self.max_depth
+        now = time.time()
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                depth = self._conn.execute(
+                    "SELECT COUNT(*) FROM job_queue WHERE status IN ('queued', 'running')"
+                ).fetchone()[0]
+                if depth + len(payloads) > max_depth:
+                    raise QueueFullError(f"Job queue is full for {lane} jobs ({depth}/{max_depth} jobs pending)")
+                ids = []
+                for payload in payloads:
+                    cursor = self._conn.execute(
+                        "INSERT INTO job_queue (job_id, kind, payload, lane, tenant, created_at, updated_at) "
+                        "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                        (job_id, kind, json.dumps(payload), lane, tenant, now, now),
+                    )
+                    ids.append(cursor.lastrowid)
+                self._conn.execute("COMMIT")
+                return ids
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+
+    def _next_row(self, now: float, lane: Optional[str]) -> Optional[Tuple]:
+        """Oldest available job of a lane (or of any lane), skipping tenants at their cap."""
+        query = (
+            "SELECT id, job_id, kind, payload, attempts, lane FROM job_queue "
+            "WHERE (status = 'queued' OR (status = 'running' AND lease_expires < ?))"
+        )
+        params: List[Any] = [now]
+        if lane is not None:
+            query += " AND lane = ?"
+            params.append(lane)
+        if self.tenant_max_concurrency > 0:
+            query += (
+                " AND tenant NOT IN (SELECT tenant FROM job_queue "
+                "WHERE status = 'running' AND lease_expires >= ? AND tenant != '' "
+                "GROUP BY tenant HAVING COUNT(*) >= ?)"
+            )
+            params += [now, self.tenant_max_concurrency]
+        return self._conn.execute(query + " ORDER BY id LIMIT 1", params).fetchone()
+
+    def claim(self, worker: str) -> Optional[QueuedJob]:
+        """
+        Lease the next job to a worker.
+
+        Args:
+            worker: Name of the claiming worker
+
+        Returns:
+            The claimed job, or None if nothing is available
+        """
+        now = time.time()
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                row = None
+                if self.scheduler is None:
+                    row = self._next_row(now, None)
+                else:
+                    skipped = []
+                    for lane in self.scheduler.order():
+                        row = self._next_row(now, lane)
+                        if row is not None:
+                            self.scheduler.dispatched(lane, skipped)
+                            break
+                        skipped.append(lane)
+                if row is None:
+                    self._conn.execute("COMMIT")
+                    return None
+                id, job_id, kind, payload, attempts, lane = row
+                self._conn.execute(
+                    "UPDATE job_queue SET status = 'running', worker = ?, attempts = ?, "
+                    "lease_expires = ?, updated_at = ? WHERE id = ?",
+                    (worker, attempts + 1, now + self.lease_seconds, now, id),
+                )
+                self._conn.execute("COMMIT")
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+        return QueuedJob(id, job_id, kind, json.loads(payload), attempts + 1, lane)
+
+    def _finish(self, id: int, status: str, error: Optional[str] = None) -> None:
+        with self._lock:
+            self._conn.execute(
+                "UPDATE job_queue SET status = ?, error = ?, lease_expires = NULL, updated_at = ? "
+                "WHERE id = ?",
+                (status, error, time.time(), id),
+            )
+
+    def complete(self, job: QueuedJob) -> None:
+        """Mark a claimed job as done."""
+        self._finish(job.id, "done")
+
+    def fail(self, job: QueuedJob, error: str) -> bool:
+        """
+        Record a failed attempt of a claimed job.
+
+        Returns:
+            True if the job was queued again, False if it ran out of attempts
+        """
+        retry = job.attempts < self.max_attempts
+        self._finish(job.id, "queued" if retry else "failed", error)
+        return retry
+
+    def recover(self) -> int:
+        """
+        Queue again every job left running by a previous process.
+
+        Call once at startup, before any worker of this queue runs.
+
+        Returns:
+            Number of recovered jobs
+        """
+        with self._lock:
+            cursor = self._conn.execute(
+                "UPDATE job_queue SET status = 'queued', lease_expires = NULL, updated_at = ? "
+                "WHERE status = 'running'",
+                (time.time(),),
+            )
+            return cursor.rowcount
+
+    def job_progress(self, job_id: str) -> Dict[str, int]:
+        """Count the queued jobs of an API job by status."""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT status, COUNT(*) FROM job_queue WHERE job_id = ? GROUP BY status",
+                (job_id,),
+            ).fetchall()
+        return dict(rows)
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Get the number of jobs per status.
+
+        Returns:
+            Dictionary with per-status counts and the maximum depth
+        """
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT status, COUNT(*) FROM job_queue GROUP BY status"
+            ).fetchall()
+            lane_rows = self._conn.execute(
+                "SELECT lane, status, COUNT(*) FROM job_queue "
+                "WHERE status IN ('queued', 'running') GROUP BY lane, status"
+            ).fetchall()
+        counts = dict(rows)
+        lanes = {lane: {"queued": 0, "running": 0} for lane in LANES}
+        for lane, status, count in lane_rows:
+            lanes.setdefault(lane, {"queued": 0, "running": 0})[status] = count
+        if self.scheduler is not None:
+            for lane, lane_stats in self.scheduler.stats().items():
+                lanes[lane].update(lane_stats)
+        return {
+            "queued": counts.get("queued", 0),
+            "running": counts.get("running", 0),
+            "done": counts.get("done", 0),
+            "failed": counts.get("failed", 0),
+            "max_depth": self.max_depth,
+            "lanes": lanes,
+        }
+
+
+class WorkerPool:
+    """
+    Pool of worker threads pulling jobs from a JobQueue.
+
+    Each job is passed to the handler registered for its kind; a handler
+    that raises makes the job fail (and be retried while attempts remain).
+    """
+
+    def __init__(
+        self,
+        queue: JobQueue,
+        handlers: Dict[str, Callable[[QueuedJob], None]],
+        workers: int = 4,
+        poll_interval: float = 0.5,
+    ):
+        self.queue = queue
+        self.handlers = handlers
+        self.workers = workers
+        self.poll_interval = poll_interval
+        self._stop = threading.Event()
+        self._threads: List[threading.Thread] = []
+        self._name = f"worker-{uuid.uuid4().hex[:8]}"
+
+    def start(self) -> None:
+        """Start the worker threads."""
+        self._stop.clear()
+        for index in range(self.workers):
+            thread = threading.Thread(
+                target=self._work, args=(f"{self._name}-{index}",), name=f"{self._name}-{index}", daemon=True
+            )
+            thread.start()
+            self._threads.append(thread)
+
+    def stop(self, timeout: Optional[float] = None) -> None:
+        """Ask the workers to stop after their current job and wait for them."""
+        self._stop.set()
+        for thread in self._threads:
+            thread.join(timeout)
+        self._threads = []
+
+    def run_one(self, worker: str) -> bool:
+        """
+        Claim and run a single job.
+
+        Returns:
+            True if a job was processed, False if the queue was empty
+        """
+        job = self.queue.claim(worker)
+        if job is None:
+            return False
+        try:
+            self.handlers[job.kind](job)
+        except Exception as e:
+            logger.exception(f"Job {job.job_id} ({job.kind}) failed on attempt {job.attempts}")
+            self.queue.fail(job, str(e))
+        else:
+            self.queue.complete(job)
+        return True
+
+    def _work(self, worker: str) -> None:
+        while not self._stop.is_set():
+            try:
+                processed = self.run_one(worker)
+            except Exception:
+                logger.exception("Worker failed to claim a job")
+                processed = False
+            if not processed:
+                self._stop.wait(self.poll_interval)
+
+
+_queue: Optional[JobQueue] = None
+_queue_lock = threading.Lock()
+
+
+def get_job_queue() -> JobQueue:
+    """Get the process-wide job queue."""
+    global _queue
+    with _queue_lock:
+        if _queue is None:
+            _queue = JobQueue(
+                sqlite_path=JOB_QUEUE_CONFIG["sqlite_path"],
+                max_depth=JOB_QUEUE_CONFIG["max_depth"],
+                lease_seconds=JOB_QUEUE_CONFIG["lease_seconds"],
+                max_attempts=JOB_QUEUE_CONFIG["max_attempts"],
+                scheduler=LaneScheduler(SCHEDULER_CONFIG["lane_weights"]),
+                tenant_max_concurrency=SCHEDULER_CONFIG["tenant_max_concurrency"],
+                reserved_depth=SCHEDULER_CONFIG["reserved_depth"],
+            )
+        return _queue
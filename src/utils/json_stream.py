@@ -0,0 +1,158 @@
+import re
+import json
+from typing import Dict, Any, Iterable, List, Optional
+
+
+class JSONStreamExtractor:
+    """
+    Incremental scanner for the first top-level JSON object in a stream of
+    LLM output chunks.
+
+    Text before the first "{" is skipped and braces are balanced while
+    tracking double-quoted string literals (with backslash escapes); an
+    apostrophe in the surrounding prose is plain text. A balanced candidate
+    only completes the scan if it parses as JSON, so the caller can cancel
+    the rest of the generation right away. Otherwise (e.g. a stray "{x}" in
+    the prose) the scan resumes after the candidate's opening brace; in the
+    common case every character is looked at once.
+    """
+
+    def __init__(self):
+        self._buffer = []
+        self._depth = 0
+        self._in_string = False
+        self._escaped = False
+        self._object: Optional[str] = None
+        # Balanced candidates that are not valid JSON, in scan order
+        self._rejected: List[str] = []
+
+    @property
+    def complete(self) -> bool:
+        """Whether the first top-level object has been closed."""
+        return self._object is not None
+
+    @property
+    def text(self) -> str:
+        """The object text scanned so far (the whole object once complete)."""
+        if self._object is not None:
+            return self._object
+        return "".join(self._buffer)
+
+    def _scan(self, text: str, start: int) -> int:
+        """Balance braces from `start`; the index closing the candidate, or -1."""
+        for index in range(start, len(text)):
+            char = text[index]
+            if self._in_string:
+                if self._escaped:
+                    self._escaped = False
+                elif char == "\\":
+                    self._escaped = True
+                elif char == '"':
+                    self._in_string = False
+            elif char == '"':
+                self._in_string = True
+            elif char == "{":
+                self._depth += 1
+            elif char == "}":
+                self._depth -= 1
+                if self._depth == 0:
+                    return index
+        return -1
+
+    def feed(self, chunk: str) -> bool:
+        """
+        Scan the next chunk of output.
+
+        Args:
+            chunk: Text appended to the stream
+
+        Returns:
+            True once the first top-level JSON object is complete
+        """
+        if self._object is not None:
+            return True
+
+        text = chunk
+        while True:
+            start = 0
+            if self._depth == 0:
+                start = text.find("{")
+                if start < 0:
+                    return False
+            end = self._scan(text, start)
+            if end < 0:
+                self._buffer.append(text[start:])
+                return False
+
+            candidate = "".join(self._buffer) + text[start:end + 1]
+            self._buffer = []
+            try:
+                json.loads(candidate)
+            except json.JSONDecodeError:
+                # Not the object: rescan from the character after its opening brace
+                self._rejected.append(candidate)
+                text = candidate[1:] + text[end + 1:]
+                continue
+            self._object = candidate
+            return True
+
+    def result(self) -> Dict[str, Any]:
+        """
+        Parse the scanned object.
+
+        Without a valid object, the first balanced candidate that can be
+        repaired (see parse_json_object) is used instead.
+
+        Returns:
+            The parsed dictionary, or an empty dict if no object was found or
+            none can be repaired into valid JSON
+        """
+        if self._object is not None:
+            return parse_json_object(self._object)
+        for candidate in self._rejected:
+            result = parse_json_object(candidate)
+            if result:
+                return result
+        return {}
+
+
+def parse_json_object(json_str: str) -> Dict[str, Any]:
+    """
+    Parse a JSON object, repairing single quotes and trailing commas.
+
+    Args:
+        json_str: Text of a single JSON object
+
+    Returns:
+        The parsed dictionary or an empty dict if parsing fails
+    """
+    try:
+        result = json.loads(json_str)
+    except json.JSONDecodeError:
+        # Replace single quotes with double quotes and drop trailing commas
+        json_str = json_str.replace("'", '"')
+        json_str = re.sub(r',\s*([}\]])', r'\1', json_str)
+        try:
+            result = json.loads(json_str)
+        except json.JSONDecodeError:
+            return {}
+    return result if isinstance(result, dict) else {}
+
+
+def extract_first_json_object(chunks: Iterable[str]) -> Dict[str, Any]:
+    """
+    Extract the first top-level JSON object from an iterable of text chunks.
+
+    Stops consuming the iterable as soon as a valid object closes.
+
+    Args:
+        chunks: Text chunks, e.g. a whole completion or a token stream
+
+    Returns:
+        The parsed dictionary or an empty dict if extraction fails
+    """
+    extractor = JSONStreamExtractor()
+    for chunk in chunks:
+        if extractor.feed(chunk):
+            break
+    return extractor.result()
@@ -0,0 +1,232 @@
+import os
+import json
+import time
+import sqlite3
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import Dict, Any, Optional, Tuple
+
+from config.config import LLM_CACHE_CONFIG
+
+
+class LLMResponseCache:
+    """
+    Two-tier, content-addressed cache for LLM completions.
+
+    The first tier is an in-process LRU dictionary, the second tier is an
+    on-disk SQLite table shared across restarts. Entries are keyed on a hash
+    of the rendered prompt, the model name and the temperature, expire after
+    a TTL and are evicted least-recently-used when a tier exceeds its size.
+    """
+
+    def __init__(
+        self,
+        sqlite_path: Optional[str] = None,
+        max_memory_entries: int = 1024,
+        max_disk_entries: int = 50000,
+        ttl_seconds: int = 86400,
+    ):
+        self.sqlite_path = sqlite_path
+        self.max_memory_entries = max_memory_entries
+        self.max_disk_entries = max_disk_entries
+        self.ttl_seconds = ttl_seconds
+
+        self._memory: "OrderedDict[str, Tuple[str, float]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._conn = None
+        self._disk_count = 0
+
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+
+        if sqlite_path:
+            self._open_disk_tier(sqlite_path)
+
+    def _open_disk_tier(self, sqlite_path: str) -> None:
+        """Open (and create if needed) the SQLite table backing the disk tier."""
+        directory = os.path.dirname(sqlite_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._conn = sqlite3.connect(sqlite_path, check_same_thread=False)
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS llm_cache (
+                key TEXT PRIMARY KEY,
+                value TEXT NOT NULL,
+                created_at REAL NOT NULL,
+                last_access REAL NOT NULL
+            )
+            """
+        )
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS ix_llm_cache_last_access ON llm_cache (last_access)"
+        )
+        self._conn.commit()
+        self._disk_count = self._conn.execute("SELECT COUNT(*) FROM llm_cache").fetchone()[0]
+
+    @staticmethod
+    def make_key(prompt: str, model: str, temperature: Optional[float]) -> str:
+        """
+        Build the content address for a completion.
+
+        Args:
+            prompt: The fully rendered prompt text
+            model: Name of the model that produces the completion
+            temperature: Sampling temperature used for the completion
+
+        Returns:
+            Hex SHA-256 digest identifying the request
+        """
+        payload = json.dumps([model, temperature, prompt], ensure_ascii=False)
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def _is_expired(self, created_at: float, now: float) -> bool:
+        return self.ttl_seconds > 0 and now - created_at > self.ttl_seconds
+
+    def get(self, key: str) -> Optional[str]:
+        """
+        Look up a cached completion.
+
+        Args:
+            key: Key produced by make_key
+
+        Returns:
+            The cached completion text, or None on a miss
+        """
+        now = time.time()
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None:
+                value, created_at = entry
+                if not self._is_expired(created_at, now):
+                    self._memory.move_to_end(key)
+                    self.memory_hits += 1
+                    return value
+                del self._memory[key]
+
+            if self._conn is not None:
+                row = self._conn.execute(
+                    "SELECT value, created_at FROM llm_cache WHERE key = ?", (key,)
+                ).fetchone()
+                if row is not None:
+                    value, created_at = row
+                    if not self._is_expired(created_at, now):
+                        self._conn.execute(
+                            "UPDATE llm_cache SET last_access = ? WHERE key = ?", (now, key)
+                        )
+                        self._conn.commit()
+                        self._remember(key, value, created_at)
+                        self.disk_hits += 1
+                        return value
+                    self._conn.execute("DELETE FROM llm_cache WHERE key = ?", (key,))
+                    self._conn.commit()
+                    self._disk_count -= 1
+
+            self.misses += 1
+            return None
+
+    def set(self, key: str, value: str) -> None:
+        """
+        Store a completion in both tiers.
+
+        Args:
+            key: Key produced by make_key
+            value: The completion text to cache
+        """
+        now = time.time()
+        with self._lock:
+            self._remember(key, value, now)
+
+            if self._conn is not None:
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO llm_cache (key, value, created_at, last_access) "
+                    "VALUES (?, ?, ?, ?)",
+                    (key, value, now, now),
+                )
+                # Replacements over-count here; _evict_disk recounts before trimming
+                self._disk_count += 1
+                self._evict_disk(now)
+                self._conn.commit()
+
+    def _remember(self, key: str, value: str, created_at: float) -> None:
+        """Insert into the memory tier, evicting the least recently used entries."""
+        self._memory[key] = (value, created_at)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_memory_entries:
+            self._memory.popitem(last=False)
+
+    def _evict_disk(self, now: float) -> None:
+        """Drop expired rows and trim the disk tier to its maximum size."""
+        if self._disk_count <= self.max_disk_entries:
+            return
+        self._disk_count = self._conn.execute("SELECT COUNT(*) FROM llm_cache").fetchone()[0]
+        if self._disk_count <= self.max_disk_entries:
+            return
+        if self.ttl_seconds > 0:
+            self._conn.execute(
+                "DELETE FROM llm_cache WHERE created_at < ?", (now - self.ttl_seconds,)
+            )
+        overflow = self._conn.execute("SELECT COUNT(*) FROM llm_cache").fetchone()[0] - self.max_disk_entries
+        if overflow > 0:
+            self._conn.execute(
+                "DELETE FROM llm_cache WHERE key IN "
+                "(SELECT key FROM llm_cache ORDER BY last_access ASC LIMIT ?)",
+                (overflow,),
+            )
+        self._disk_count = self._conn.execute("SELECT COUNT(*) FROM llm_cache").fetchone()[0]
+
+    def clear(self) -> None:
+        """Remove every entry from both tiers and reset the counters."""
+        with self._lock:
+            self._memory.clear()
+            if self._conn is not None:
+                self._conn.execute("DELETE FROM llm_cache")
+                self._conn.commit()
+            self._disk_count = 0
+            self.memory_hits = self.disk_hits = self.misses = 0
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Get the hit/miss counters of the cache.
+
+        Returns:
+            Dictionary with per-tier hit counts, misses, hit rate and sizes
+        """
+        with self._lock:
+            hits = self.memory_hits + self.disk_hits
+            lookups = hits + self.misses
+            return {
+                "memory_hits": self.memory_hits,
+                "disk_hits": self.disk_hits,
+                "misses": self.misses,
+                "hit_rate": hits / lookups if lookups else 0.0,
+                "memory_entries": len(self._memory),
+                "disk_entries": self._disk_count,
+            }
+
+
+_cache: Optional[LLMResponseCache] = None
+_cache_lock = threading.Lock()
+
+
+def get_llm_cache() -> Optional[LLMResponseCache]:
+    """
+    Get the process-wide LLM response cache.
+
+    Returns:
+        The shared cache, or None if caching is disabled in LLM_CACHE_CONFIG
+    """
+    global _cache
+    if not LLM_CACHE_CONFIG["enabled"]:
+        return None
+    with _cache_lock:
+        if _cache is None:
+            _cache = LLMResponseCache(
+                sqlite_path=LLM_CACHE_CONFIG["sqlite_path"],
+                max_memory_entries=LLM_CACHE_CONFIG["max_memory_entries"],
+                max_disk_entries=LLM_CACHE_CONFIG["max_disk_entries"],
+                ttl_seconds=LLM_CACHE_CONFIG["ttl_seconds"],
+            )
+        return _cache
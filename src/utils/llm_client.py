@@ -0,0 +1,212 @@
+import asyncio
+import threading
+from collections import deque
+from contextlib import contextmanager, asynccontextmanager
+from typing import Dict, Any, Callable, Deque, Optional, Tuple
+
+import httpx
+from langchain_ollama import OllamaLLM
+
+from config.config import LLM_CONFIG, LLM_RESILIENCE_CONFIG
+
+
+class _SlotWaiter:
+    """A caller queued for a slot of the limiter; `wake` is called once the slot is handed to it."""
+
+    def __init__(self, wake: Callable[[], None]):
+        self.wake = wake
+        self.granted = False
+
+
+class LLMConcurrencyLimiter:
+    """
+    Process-wide bound on the number of in-flight LLM calls.
+
+    The same counter is shared by the synchronous path (worker threads) and
+    the async path (event loop tasks), so the Ollama backend never sees more
+    than `max_concurrency` generations from this process. Callers waiting
+    for a slot are queued in arrival order and a released slot is handed
+    straight to the next one: threads block on an Event, tasks await an
+    asyncio.Event set on their own loop.
+    """
+
+    def __init__(self, max_concurrency: int):
+        self.max_concurrency = max_concurrency
+        self._lock = threading.Lock()
+        self._waiters: Deque[_SlotWaiter] = deque()
+        self.in_flight = 0
+        self.peak_in_flight = 0
+
+    def _claim(self, wake: Callable[[], None]) -> Optional[_SlotWaiter]:
+        """Take a free slot and return None, or queue a waiter woken with the next released slot."""
+        with self._lock:
+            if self.in_flight < self.max_concurrency and not self._waiters:
+                self.in_flight += 1
+                self.peak_in_flight = max(self.peak_in_flight, self.in_flight)
+                return None
+            waiter = _SlotWaiter(wake)
+            self._waiters.append(waiter)
+            return waiter
+
+    def _release(self) -> None:
+        while True:
+            with self._lock:
+                if not self._waiters:
+                    self.in_flight -= 1
+                    return
+                # The slot passes to the waiter, so in_flight is unchanged
+                waiter = self._waiters.popleft()
+                waiter.granted = True
+            try:
+                waiter.wake()
+                return
+            except RuntimeError:
+                # The waiter's event loop is gone; hand the slot to the next one
+                continue
+
+    @contextmanager
+    def slot(self):
+        """Hold one concurrency slot for the duration of a blocking LLM call."""
+        granted = threading.Event()
+        if self._claim(granted.set) is not None:
+            granted.wait()
+        try:
+            yield
+        finally:
+            self._release()
+
+    @asynccontextmanager
+    async def aslot(self):
+        """Hold one concurrency slot without blocking the event loop while waiting."""
+        loop = asyncio.get_running_loop()
+        granted = asyncio.Event()
+        waiter = self._claim(lambda: loop.call_soon_threadsafe(granted.set))
+        if waiter is not None:
+            try:
+                await granted.wait()
+            except asyncio.CancelledError:
+                with self._lock:
+                    handed_over = waiter.granted
+                    if not handed_over:
+                        self._waiters.remove(waiter)
+                if handed_over:
+                    self._release()
+                raise
+        try:
+            yield
+        finally:
+            self._release()
+
+
+class LLMClientRegistry:
+    """
+    Registry of shared LLM clients.
+
+    Agents asking for the same model, base URL and temperature get the same
+    OllamaLLM instance, and with it the same pooled keep-alive HTTP clients.
+    """
+
+    def __init__(
+        self,
+        max_concurrency: int = 8,
+        max_connections: int = 16,
+        max_keepalive_connections: int = 16,
+        keepalive_expiry: float = 60.0,
+        read_timeout: Optional[float] = None,
+    ):
+        self.max_connections = max_connections
+        self.max_keepalive_connections = max_keepalive_connections
+        self.keepalive_expiry = keepalive_expiry
+        # Bounds a backend that accepts a call but never sends a chunk
+        self.read_timeout = read_timeout
+        self.limiter = LLMConcurrencyLimiter(max_concurrency)
+        self._clients: Dict[Tuple[str, str, Optional[float]], OllamaLLM] = {}
+        self._lock = threading.Lock()
+
+    def _client_kwargs(self) -> Dict[str, Any]:
+        """Keyword arguments handed to the underlying httpx clients."""
+        return {
+            "limits": httpx.Limits(
+                max_connections=self.max_connections,
+                max_keepalive_connections=self.max_keepalive_connections,
+                keepalive_expiry=self.keepalive_expiry,
+            ),
+            "timeout": httpx.Timeout(self.read_timeout, connect=10.0) if self.read_timeout else None,
+        }
+
+    def get(
+        self,
+        model: Optional[str] = None,
+        base_url: Optional[str] = None,
+        temperature: Optional[float] = None,
+    ) -> OllamaLLM:
+        """
+        Get the shared client for a model configuration, creating it on first use.
+
+        Args:
+            model: Model name (defaults to LLM_CONFIG["model"])
+            base_url: Ollama base URL (defaults to LLM_CONFIG["base_url"])
+            temperature: Sampling temperature (defaults to LLM_CONFIG["temperature"])
+
+        Returns:
+            The OllamaLLM instance shared by every caller with this configuration
+        """
+        key = (
+            model or LLM_CONFIG["model"],
+            base_url or LLM_CONFIG["base_url"],
+            LLM_CONFIG["temperature"] if temperature is None else temperature,
+        )
+        with self._lock:
+            client = self._clients.get(key)
+            if client is None:
+                client = OllamaLLM(
+                    model=key[0],
+                    base_url=key[1],
+                    temperature=key[2],
+                    client_kwargs=self._client_kwargs(),
+                )
+                self._clients[key] = client
+            return client
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Get the number of shared clients and the current LLM load.
+
+        Returns:
+            Dictionary with client count and in-flight/peak call counts
+        """
+        with self._lock:
+            clients = len(self._clients)
+        return {
+            "clients": clients,
+            "max_concurrency": self.limiter.max_concurrency,
+            "in_flight": self.limiter.in_flight,
+            "peak_in_flight": self.limiter.peak_in_flight,
+        }
+
+
+_registry: Optional[LLMClientRegistry] = None
+_registry_lock = threading.Lock()
+
+
+def get_llm_registry() -> LLMClientRegistry:
+    """Get the process-wide LLM client registry."""
+    global _registry
+    with _registry_lock:
+        if _registry is None:
+            _registry = LLMClientRegistry(
+                max_concurrency=LLM_CONFIG["max_concurrency"],
+                max_connections=LLM_CONFIG["max_connections"],
+                max_keepalive_connections=LLM_CONFIG["max_keepalive_connections"],
+                read_timeout=max(LLM_RESILIENCE_CONFIG["agent_timeout"], LLM_RESILIENCE_CONFIG["final_timeout"]) or None,
+            )
+        return _registry
+
+
+def get_llm(
+    model: Optional[str] = None,
+    base_url: Optional[str] = None,
+    temperature: Optional[float] = None,
+) -> OllamaLLM:
+    """Shortcut for get_llm_registry().get(...)."""
+    return get_llm_registry().get(model=model, base_url=base_url, temperature=temperature)
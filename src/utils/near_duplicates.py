@@ -0,0 +1,257 @@
+import re
+import zlib
+import threading
+from typing import Dict, Any, List, Optional, Set, Tuple
+
+import numpy as np
+
+from src.utils.ticket_feed import CompletedTicketFeed
+from config.config import NEAR_DUPLICATE_CONFIG
+
+# Mersenne prime modulus of the MinHash permutations
+_PRIME = np.uint64((1 << 61) - 1)
+_MAX_HASH = np.uint32(0xFFFFFFFF)
+
+_EMAIL = re.compile(r"\S+@\S+")
+_URL = re.compile(r"https?://\S+")
+_NUMBER = re.compile(r"\d+")
+_WORD = re.compile(r"\w+")
+
+# Stored results a near duplicate reuses
+REUSED_FIELDS = ("summary", "routing", "recommendations", "estimation", "final_insights")
+
+
+def normalize_words(text: str) -> List[str]:
+    """
+    Words of a conversation, lowercased and with emails, URLs and numbers masked.
+
+    Tickets that only differ in such details (an order number, the
+    customer's email) normalize to the same words.
+    """
+    text = _URL.sub(" url ", _EMAIL.sub(" email ", text.lower()))
+    return _WORD.findall(_NUMBER.sub("0", text))
+
+
+def shingles(text: str, size: int = 3) -> Set[str]:
+    """Word `size`-grams of the normalized text; a shorter text is one shingle."""
+    words = normalize_words(text)
+    if len(words) <= size:
+        return {" ".join(words)} if words else set()
+    return {" ".join(words[i:i + size]) for i in range(len(words) - size + 1)}
+
+
+class MinHasher:
+    """
+    MinHash signatures of word shingles.
+
+    The fraction of equal signature positions of two texts estimates the
+    Jaccard similarity of their shingle sets. Shingles are hashed with CRC32,
+    so signatures are stable across processes.
+    """
+
+    def __init__(self, num_perm: int = 64, shingle_size: int = 3, seed: int = 1):
+        rng = np.random.default_rng(seed)
+        self.num_perm = num_perm
+        self.shingle_size = shingle_size
+        # a * x stays below 2 ** 63 for 32-bit hashes, so uint64 never overflows
+        self._a = rng.integers(1, 1 << 31, num_perm, dtype=np.uint64)
+        self._b = rng.integers(0, 1 << 31, num_perm, dtype=np.uint64)
+
+    def signature(self, text: str) -> Optional[np.ndarray]:
+        """
+        MinHash signature of a text.
+
+        Returns:
+            uint32 array of `num_perm` values, or None if the text has no words
+        """
+        hashes = np.fromiter(
+            (zlib.crc32(shingle.encode()) for shingle in shingles(text, self.shingle_size)), dtype=np.uint64
+        )
+        if not len(hashes):
+            return None
+        permuted = (hashes[:, None] * self._a + self._b) % _PRIME
+        return (permuted & np.uint64(_MAX_HASH)).min(axis=0).astype(np.uint32)
+
+
+class MinHashLSH:
+    """
+    Locality-sensitive hashing index of MinHash signatures.
+
+    Signatures are split into `bands` bands; tickets sharing a whole band land
+    in the same bucket and become candidates, whose similarity is then
+    estimated from the full signatures. With r rows per band, pairs above a
+    Jaccard similarity of about (1 / bands) ** (1 / r) are likely found.
+    Signatures are kept in one contiguous uint32 matrix.
+    """
+
+    def __init__(self, num_perm: int = 64, bands: int = 8):
+        if num_perm % bands:
+            raise ValueError(f"num_perm ({num_perm}) must be a multiple of bands ({bands})")
+        self.num_perm = num_perm
+        self.bands = bands
+        self._signatures = np.empty((0, num_perm), dtype=np.uint32)
+        self._keys = np.empty((0, bands), dtype=np.uint64)
+        self._mix = np.random.default_rng(0).integers(1, 1 << 63, num_perm // bands, dtype=np.uint64) | np.uint64(1)
+        self._buckets: List[Dict[int, List[int]]] = [{} for _ in range(bands)]
+        self._ids: List[str] = []
+        self._rows: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    def _band_keys(self, signature: np.ndarray) -> np.ndarray:
+        # Multiply-and-add hash of each band; a collision only adds a candidate
+        return (signature.reshape(self.bands, -1).astype(np.uint64) * self._mix).sum(axis=1)
+
+    def add(self, ticket_id: str, signature: np.ndarray) -> None:
+        """Index a ticket's signature, replacing an earlier one of the same ticket."""
+        keys = self._band_keys(signature)
+        with self._lock:
+            row = self._rows.get(ticket_id)
+            if row is None:
+                row = len(self._ids)
+                if row == len(self._signatures):
+                    capacity = max(1024, row * 2)
+                    self._signatures = np.resize(self._signatures, (capacity, self.num_perm))
+                    self._keys = np.resize(self._keys, (capacity, self.bands))
+                self._ids.append(ticket_id)
+                self._rows[ticket_id] = row
+            else:
+                for band, key in enumerate(self._keys[row].tolist()):
+                    self._buckets[band][key].remove(row)
+            self._signatures[row] = signature
+            self._keys[row] = keys
+            for band, key in enumerate(keys.tolist()):
+                self._buckets[band].setdefault(key, []).append(row)
+
+    def query(
+        self,
+        signature: np.ndarray,
+        threshold: float,
+        exclude: Optional[str] = None,
+    ) -> Optional[Tuple[float, str]]:
+        """
+        Find the most similar indexed ticket.
+
+        Args:
+            signature: MinHash signature of the new ticket
+            threshold: Minimum estimated Jaccard similarity
+            exclude: Ticket ID never to return (the ticket itself)
+
+        Returns:
+            (similarity, ticket_id) of the best match, or None
+        """
+        with self._lock:
+            candidates = {
+                row
+                for band, key in enumerate(self._band_keys(signature).tolist())
+                for row in self._buckets[band].get(key, ())
+            }
+            candidates.discard(self._rows.get(exclude, -1))
+            if not candidates:
+                return None
+            rows = np.fromiter(candidates, dtype=np.int64)
+            scores = (self._signatures[rows] == signature).mean(axis=1)
+            best = int(scores.argmax())
+            if scores[best] < threshold:
+                return None
+            return float(scores[best]), self._ids[rows[best]]
+
+    def stats(self) -> Dict[str, Any]:
+        """Get the indexed ticket count, the bands and the memory used by signatures."""
+        with self._lock:
+            return {
+                "tickets": len(self._ids),
+                "bands": self.bands,
+                "memory_bytes": int(self._signatures.nbytes + self._keys.nbytes),
+            }
+
+
+class NearDuplicates(CompletedTicketFeed):
+    """
+    Detects new tickets that are near copies of a completed ticket.
+
+    Conversations are compared by the Jaccard similarity of their normalized
+    word shingles, estimated with MinHash and found through LSH. The index
+    follows the completed tickets as described in CompletedTicketFeed.
+    """
+
+    def __init__(self, hasher: MinHasher, index: MinHashLSH, threshold: float = 0.85,
+                 sync_interval: float = 30.0):
+        super().__init__(sync_interval)
+        self.hasher = hasher
+        self.index = index
+        self.threshold = threshold
+
+    def add_ticket(self, ticket: Dict[str, Any]) -> None:
+        """Index a completed ticket's conversation."""
+        signature = self.hasher.signature(ticket.get("conversation") or "")
+        if signature is not None:
+            self.index.add(ticket["ticket_id"], signature)
+
+    def find(self, conversation: str, exclude: Optional[str] = None) -> Optional[Tuple[float, str]]:
+        """
+        Find a completed ticket whose conversation is a near copy of this one.
+
+        Args:
+            conversation: Conversation of the new ticket
+            exclude: Ticket ID never to return (the ticket itself)
+
+        Returns:
+            (similarity, ticket_id) of the closest completed ticket at or
+            above the threshold, or None
+        """
+        self.maybe_sync()
+        signature = self.hasher.signature(conversation)
+        if signature is None:
+            return None
+        return self.index.query(signature, self.threshold, exclude=exclude)
+
+    def stored_results(self, conversation: str, exclude: Optional[str] = None) -> Optional[Dict[str, Any]]:
+        """
+        Stored results of a completed ticket this conversation is a near copy of.
+
+        Args:
+            conversation: Conversation of the new ticket
+            exclude: Ticket ID never to match (the ticket itself)
+
+        Returns:
+            The matched ticket's stage results, with its ticket ID and the
+            similarity under "duplicate_of", or None if there is no match
+        """
+        from src.utils.database import get_ticket
+
+        match = self.find(conversation, exclude=exclude)
+        if match is None:
+            return None
+        similarity, ticket_id = match
+        source = get_ticket(ticket_id)
+        if source is None or source["status"] != "completed":
+            return None
+        results = {name: source[name] for name in REUSED_FIELDS}
+        results["duplicate_of"] = {"ticket_id": ticket_id, "similarity": round(similarity, 3)}
+        return results
+
+
+_near_duplicates: Optional[NearDuplicates] = None
+_near_duplicates_lock = threading.Lock()
+
+
+def get_near_duplicates() -> Optional[NearDuplicates]:
+    """Get the process-wide near-duplicate detector, or None if it is disabled."""
+    global _near_duplicates
+    if not NEAR_DUPLICATE_CONFIG["enabled"]:
+        return None
+    with _near_duplicates_lock:
+        if _near_duplicates is None:
+            from src.utils.database import add_results_listener
+
+            _near_duplicates = NearDuplicates(
+                MinHasher(NEAR_DUPLICATE_CONFIG["num_perm"], NEAR_DUPLICATE_CONFIG["shingle_size"]),
+                MinHashLSH(NEAR_DUPLICATE_CONFIG["num_perm"], NEAR_DUPLICATE_CONFIG["bands"]),
+                threshold=NEAR_DUPLICATE_CONFIG["threshold"],
+                sync_interval=NEAR_DUPLICATE_CONFIG["sync_interval"],
+            )
+            add_results_listener(_near_duplicates.add_ticket)
+        return _near_duplicates
@@ -0,0 +1,49 @@
+import time
+import threading
+from abc import ABC, abstractmethod
+
+
+class PeriodicModel(ABC):
+    """
+    A model trained from the ticket database and retrained periodically.
+
+    Subclasses implement _fit, which reads the training data and replaces
+    the model. The first use starts training in a background thread and
+    later uses retrain every `retrain_interval` seconds, so requests never
+    wait for training; until a model exists, callers use their fallback.
+    """
+
+    def __init__(self, retrain_interval: float = 3600.0):
+        self.retrain_interval = retrain_interval
+        self._next_training = 0.0
+        self._training_lock = threading.Lock()
+
+    @abstractmethod
+    def _fit(self) -> bool:
+        """Read the training data and replace the model; return whether a model was trained."""
+        pass
+
+    def train(self) -> bool:
+        """
+        Retrain the model from the stored tickets.
+
+        Returns:
+            Whether a model was trained; the previous one is kept otherwise
+        """
+        with self._training_lock:
+            self._next_training = time.monotonic() + self.retrain_interval
+            return self._fit()
+
+    def maybe_retrain(self) -> None:
+        """Start retraining in the background once `retrain_interval` has passed."""
+        if time.monotonic() < self._next_training or self._training_lock.locked():
+            return
+        self._next_training = time.monotonic() + self.retrain_interval
+        threading.Thread(target=self._train_quietly, name=f"{type(self).__name__}-training", daemon=True).start()
+
+    def _train_quietly(self) -> None:
+        try:
+            self.train()
+        except Exception:
+            # The fallback keeps answering until a later training succeeds
+            pass
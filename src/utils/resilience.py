@@ -0,0 +1,334 @@
+import time
+import queue
+import asyncio
+import threading
+import contextvars
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from typing import Dict, Any, List, Optional, Callable, Awaitable, TypeVar
+
+from config.config import LLM_RESILIENCE_CONFIG
+
+
+T = TypeVar("T")
+
+
+class LLMTimeoutError(TimeoutError):
+    """Raised when an LLM call runs past its agent or ticket deadline."""
+
+
+class TicketDeadlineExceeded(LLMTimeoutError):
+    """Raised when the ticket's own time budget, rather than the call's timeout, runs out."""
+
+
+class CircuitOpenError(RuntimeError):
+    """Raised instead of calling a backend whose circuit breaker is open."""
+
+
+class HedgeCancelled(Exception):
+    """Raised inside an attempt that lost the race against its hedge."""
+
+
+# Monotonic deadline of the ticket being processed, if any
+_ticket_deadline: contextvars.ContextVar[Optional[float]] = contextvars.ContextVar("ticket_deadline", default=None)
+
+
+@contextmanager
+def ticket_deadline(seconds: Optional[float]):
+    """
+    Bound every LLM call made inside the block by an overall deadline.
+
+    The deadline lives in a context variable, so it follows asyncio tasks and
+    threads started with contextvars.copy_context() (as DAGExecutor does).
+
+    Args:
+        seconds: Time budget of the whole block, or None/0 for no deadline
+    """
+    if not seconds:
+        yield
+        return
+    token = _ticket_deadline.set(time.monotonic() + seconds)
+    try:
+        yield
+    finally:
+        _ticket_deadline.reset(token)
+
+
+def call_deadline(timeout: Optional[float]) -> Optional[float]:
+    """
+    Monotonic deadline of a call: its own timeout, capped by the ticket deadline.
+
+    Raises:
+        TicketDeadlineExceeded: If the ticket deadline has already passed
+    """
+    deadline = _ticket_deadline.get()
+    if deadline is not None and time.monotonic() >= deadline:
+        raise TicketDeadlineExceeded("Ticket deadline exceeded")
+    if timeout:
+        own = time.monotonic() + timeout
+        deadline = own if deadline is None else min(deadline, own)
+    return deadline
+
+
+def ticket_budget_spent() -> bool:
+    """Whether the deadline of the ticket being processed, if any, has passed."""
+    deadline = _ticket_deadline.get()
+    return deadline is not None and time.monotonic() >= deadline
+
+
+def check_deadline(deadline: Optional[float]) -> None:
+    """
+    Raise if a deadline from call_deadline has passed.
+
+    Raises:
+        TicketDeadlineExceeded: If the ticket's budget ran out, which says nothing about the backend
+        LLMTimeoutError: If the call's own timeout ran out
+    """
+    if deadline is not None and time.monotonic() >= deadline:
+        if ticket_budget_spent():
+            raise TicketDeadlineExceeded("Ticket deadline exceeded")
+        raise LLMTimeoutError("LLM call deadline exceeded")
+
+
+def remaining(deadline: Optional[float]) -> Optional[float]:
+    """Seconds left until a deadline, or None without one."""
+    return None if deadline is None else max(deadline - time.monotonic(), 0.0)
+
+
+class CircuitBreaker:
+    """
+    Circuit breaker of one LLM backend.
+
+    After `failure_threshold` consecutive failures the circuit opens and
+    calls fail fast with CircuitOpenError for `reset_seconds`. Then a single
+    trial call is let through (half-open): its success closes the circuit,
+    its failure opens it again.
+    """
+
+    def __init__(self, name: str, failure_threshold: int = 5, reset_seconds: float = 30.0):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_seconds = reset_seconds
+        self.state = "closed"
+        self.failures = 0
+        self.opened_at = 0.0
+        self.rejected = 0
+        self._trial_in_flight = False
+        self._lock = threading.Lock()
+
+    def allow(self) -> bool:
+        """Whether a call may go to the backend now; a True in half-open state claims the trial call."""
+        with self._lock:
+            if self.state == "closed":
+                return True
+            if self.state == "open" and time.monotonic() - self.opened_at >= self.reset_seconds:
+                self.state = "half_open"
+            if self.state == "half_open" and not self._trial_in_flight:
+                self._trial_in_flight = True
+                return True
+            self.rejected += 1
+            return False
+
+    def check(self) -> None:
+        """
+        Claim permission for a call.
+
+        Raises:
+            CircuitOpenError: If the circuit is open
+        """
+        if not self.allow():
+            raise CircuitOpenError(f"LLM backend {self.name} is unavailable (circuit open)")
+
+    def record_success(self) -> None:
+        with self._lock:
+            self.state = "closed"
+            self.failures = 0
+            self._trial_in_flight = False
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self.failures += 1
+            self._trial_in_flight = False
+            if self.state == "half_open" or self.failures >= self.failure_threshold:
+                self.state = "open"
+                self.opened_at = time.monotonic()
+
+    def release(self) -> None:
+        """Give back a claimed trial call that was cancelled before an outcome."""
+        with self._lock:
+            self._trial_in_flight = False
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {"state": self.state, "consecutive_failures": self.failures, "rejected": self.rejected}
+
+
+class LatencyTracker:
+    """Rolling window of call latencies, used to pick the hedging delay."""
+
+    def __init__(self, window: int = 200):
+        self._samples: deque = deque(maxlen=window)
+        self._lock = threading.Lock()
+
+    def record(self, seconds: float) -> None:
+        with self._lock:
+            self._samples.append(seconds)
+
+    def percentile(self, percent: float, min_samples: int = 20) -> Optional[float]:
+        """The given percentile of the window, or None until it holds `min_samples` samples."""
+        with self._lock:
+            samples = sorted(self._samples)
+        if len(samples) < max(min_samples, 1):
+            return None
+        index = min(int(round(percent / 100.0 * (len(samples) - 1))), len(samples) - 1)
+        return samples[index]
+
+
+_hedge_executor: Optional[ThreadPoolExecutor] = None
+_hedge_executor_lock = threading.Lock()
+
+
+def get_hedge_executor() -> ThreadPoolExecutor:
+    """Get the process-wide thread pool running the attempts of hedged calls."""
+    global _hedge_executor
+    with _hedge_executor_lock:
+        if _hedge_executor is None:
+            _hedge_executor = ThreadPoolExecutor(
+                max_workers=LLM_RESILIENCE_CONFIG["hedge_max_workers"],
+                thread_name_prefix="llm-hedge",
+            )
+        return _hedge_executor
+
+
+def run_hedged(
+    attempts: List[Callable[[threading.Event], T]],
+    hedge_delay: float,
+    deadline: Optional[float] = None,
+) -> T:
+    """
+    Run the first attempt, starting the next one if no result arrived after
+    `hedge_delay` seconds or as soon as the running ones all failed.
+
+    Attempts run on the threads of get_hedge_executor() and receive an
+    Event that is set once another attempt won; they should stop (closing
+    their stream) when they see it, and attempts still queued for a thread
+    by then are skipped. The first successful result is returned.
+
+    Raises:
+        LLMTimeoutError: If the deadline passes first
+        Exception: The first attempt's error, if every attempt failed
+    """
+    results: "queue.Queue" = queue.Queue()
+    cancels: List[threading.Event] = []
+
+    def start(attempt: Callable[[threading.Event], T]) -> None:
+        cancel = threading.Event()
+        cancels.append(cancel)
+        context = contextvars.copy_context()
+
+        def target():
+            if cancel.is_set():
+                return
+            try:
+                results.put((True, context.run(attempt, cancel)))
+            except BaseException as e:
+                results.put((False, e))
+
+        get_hedge_executor().submit(target)
+
+    start(attempts[0])
+    hedge_at = time.monotonic() + hedge_delay
+    errors: List[BaseException] = []
+    try:
+        while True:
+            waits = [remaining(deadline)]
+            if len(cancels) < len(attempts):
+                waits.append(max(hedge_at - time.monotonic(), 0.0))
+            timeout = min(wait for wait in waits if wait is not None) if any(w is not None for w in waits) else None
+            try:
+                ok, value = results.get(timeout=timeout)
+            except queue.Empty:
+                if len(cancels) < len(attempts) and time.monotonic() >= hedge_at:
+                    start(attempts[len(cancels)])
+                    continue
+                raise LLMTimeoutError("LLM call deadline exceeded")
+            if ok:
+                return value
+            errors.append(value)
+            if len(errors) == len(cancels):
+                if len(cancels) == len(attempts):
+                    raise errors[0]
+                # Everything started so far failed: fail over right away
+                start(attempts[len(cancels)])
+    finally:
+        for cancel in cancels:
+            cancel.set()
+
+
+async def arun_hedged(
+    attempts: List[Callable[[], Awaitable[T]]],
+    hedge_delay: float,
+    deadline: Optional[float] = None,
+) -> T:
+    """Async counterpart of run_hedged; losing attempts are cancelled."""
+    pending: Dict[asyncio.Task, int] = {}
+    errors: List[BaseException] = []
+    started = 0
+
+    def start() -> None:
+        nonlocal started
+        pending[asyncio.ensure_future(attempts[started]())] = started
+        started += 1
+
+    start()
+    hedge_at = time.monotonic() + hedge_delay
+    try:
+        while True:
+            waits = [remaining(deadline)]
+            if started < len(attempts):
+                waits.append(max(hedge_at - time.monotonic(), 0.0))
+            timeout = min(wait for wait in waits if wait is not None) if any(w is not None for w in waits) else None
+            done, _ = await asyncio.wait(pending, timeout=timeout, return_when=asyncio.FIRST_COMPLETED)
+            if not done:
+                if started < len(attempts) and time.monotonic() >= hedge_at:
+                    start()
+                    continue
+                raise LLMTimeoutError("LLM call deadline exceeded")
+            for task in done:
+                pending.pop(task)
+                if task.exception() is None:
+                    return task.result()
+                errors.append(task.exception())
+            if not pending:
+                if started == len(attempts):
+                    raise errors[0]
+                start()
+    finally:
+        for task in pending:
+            task.cancel()
+
+
+_breakers: Dict[str, CircuitBreaker] = {}
+_breakers_lock = threading.Lock()
+
+
+def get_circuit_breaker(backend: str) -> CircuitBreaker:
+    """Get the process-wide circuit breaker of an LLM backend (by base URL)."""
+    with _breakers_lock:
+        breaker = _breakers.get(backend)
+        if breaker is None:
+            breaker = CircuitBreaker(
+                backend,
+                failure_threshold=LLM_RESILIENCE_CONFIG["breaker_failure_threshold"],
+                reset_seconds=LLM_RESILIENCE_CONFIG["breaker_reset_seconds"],
+            )
+            _breakers[backend] = breaker
+        return breaker
+
+
+def circuit_breaker_stats() -> Dict[str, Any]:
+    """Get the state of every backend's circuit breaker."""
+    with _breakers_lock:
+        breakers = dict(_breakers)
+    return {name: breaker.stats() for name, breaker in breakers.items()}
@@ -0,0 +1,208 @@
+import math
+import threading
+from typing import Dict, Any, List, Optional, Tuple
+
+import numpy as np
+
+from src.utils.fast_router import TEAMS
+from src.utils.periodic_model import PeriodicModel
+from config.config import RESOLUTION_MODEL_CONFIG
+
+# Values of the categorical features, in code order; a value not listed
+# (or missing) gets the code after the last one
+TEAM_VALUES = tuple(team.lower() for team in TEAMS)
+LEVEL_VALUES = ("low", "medium", "high", "critical")
+SENTIMENT_VALUES = ("negative", "neutral", "positive")
+FEATURE_VALUES = (TEAM_VALUES, LEVEL_VALUES, LEVEL_VALUES, SENTIMENT_VALUES)
+
+# Conversation length feature: log1p(characters) in buckets of this width
+LENGTH_BUCKET = 0.25
+LENGTH_BUCKETS = 64
+
+# Estimated quantiles of the resolution time
+QUANTILES = (0.5, 0.9)
+
+
+def ticket_codes(
+    team: Optional[str],
+    priority: Optional[str],
+    urgency: Optional[str],
+    sentiment: Optional[str],
+    conversation_chars: int,
+) -> Tuple[int, int, int, int, int]:
+    """
+    Feature codes of a ticket: team, priority, urgency, sentiment and length bucket.
+
+    Values are matched case-insensitively, as the generated result columns
+    store them lowercased.
+    """
+    codes = []
+    for value, values in zip((team, priority, urgency, sentiment), FEATURE_VALUES):
+        value = str(value or "").strip().lower()
+        codes.append(values.index(value) if value in values else len(values))
+    bucket = min(int(math.log1p(max(conversation_chars, 0)) / LENGTH_BUCKET), LENGTH_BUCKETS - 1)
+    return (*codes, bucket)
+
+
+def _model_inputs(codes: np.ndarray) -> np.ndarray:
+    """Model features of feature codes: unknown values become missing (NaN)."""
+    features = codes.astype(np.float64)
+    for column, values in enumerate(FEATURE_VALUES):
+        features[features[:, column] == len(values), column] = np.nan
+    features[:, -1] *= LENGTH_BUCKET
+    return features
+
+
+def format_hours(hours: float) -> str:
+    """Render a duration for the estimation result, e.g. '45 minutes', '6.5 hours', '3.2 days'."""
+    if hours < 1:
+        return f"{max(round(hours * 60), 1)} minutes"
+    if hours < 48:
+        return f"{hours:.1f} hours"
+    return f"{hours / 24:.1f} days"
+
+
+class ResolutionTimeModel:
+    """
+    Quantile regression of the hours from a ticket's creation to its resolution.
+
+    One gradient-boosted model per quantile (QUANTILES) is fitted on the log
+    of the duration: quantiles are preserved by the monotone transform, and
+    the heavy tail of long resolutions no longer dominates the loss. The
+    team is a categorical feature; priority, urgency and sentiment are
+    ordinal, and the conversation length is bucketed on a log scale.
+
+    As every feature takes few values, the models are evaluated once for
+    all their combinations into a lookup table, so an estimate is an array
+    lookup (microseconds) rather than a predict call over every tree
+    (about ten milliseconds for a single ticket).
+    """
+
+    def __init__(self, table: np.ndarray, tickets: int):
+        # Hours by feature codes and quantile
+        self.table = table
+        self.tickets = tickets
+
+    @classmethod
+    def train(cls, history: List[Dict[str, Any]]) -> "ResolutionTimeModel":
+        """
+        Train on resolved tickets (see resolution_history).
+
+        Raises:
+            ValueError: If there are no tickets with a positive duration
+        """
+        from sklearn.ensemble import HistGradientBoostingRegressor
+
+        rows = [ticket for ticket in history if ticket["hours"] > 0]
+        if not rows:
+            raise ValueError("No resolved tickets to train on")
+        codes = np.array([
+            ticket_codes(t["team"], t["priority"], t["urgency"], t["sentiment"], t["conversation_chars"])
+            for t in rows
+        ])
+        targets = np.log1p([t["hours"] for t in rows])
+
+        shape = tuple(len(values) + 1 for values in FEATURE_VALUES) + (LENGTH_BUCKETS,)
+        grid = _model_inputs(np.indices(shape).reshape(len(shape), -1).T)
+        table = np.empty((int(np.prod(shape)), len(QUANTILES)), dtype=np.float32)
+        for column, quantile in enumerate(QUANTILES):
+            model = HistGradientBoostingRegressor(
+                loss="quantile", quantile=quantile, max_iter=200, learning_rate=0.1,
+                categorical_features=[True, False, False, False, False], random_state=0,
+            ).fit(_model_inputs(codes), targets)
+            table[:, column] = np.expm1(model.predict(grid))
+        # Separately fitted quantiles may cross; keep them ordered
+        table = np.maximum.accumulate(np.maximum(table, 0.0), axis=1)
+        return cls(table.reshape(shape + (len(QUANTILES),)), len(rows))
+
+    def predict(self, codes: Tuple[int, ...]) -> Dict[float, float]:
+        """
+        Estimate the resolution time of a ticket from its feature codes (see ticket_codes).
+
+        Returns:
+            Hours by quantile, non-decreasing in the quantile
+        """
+        return dict(zip(QUANTILES, self.table[codes].tolist()))
+
+
+class ResolutionEstimator(PeriodicModel):
+    """
+    Numeric resolution-time estimates from the history of resolved tickets.
+
+    The model is trained on the latest tickets with a recorded resolution
+    time (see resolve_ticket) as described in PeriodicModel. Until at least
+    `min_training_tickets` are resolved, estimate returns None and the
+    estimator agent relies on the LLM alone.
+    """
+
+    def __init__(self, min_training_tickets: int = 200, max_training_tickets: int = 50000,
+                 retrain_interval: float = 3600.0):
+        super().__init__(retrain_interval)
+        self.min_training_tickets = min_training_tickets
+        self.max_training_tickets = max_training_tickets
+        self.model: Optional[ResolutionTimeModel] = None
+
+    def _fit(self) -> bool:
+        from src.utils.database import resolution_history
+
+        history = resolution_history(self.max_training_tickets)
+        if len(history) < self.min_training_tickets:
+            return False
+        try:
+            self.model = ResolutionTimeModel.train(history)
+        except ValueError:
+            return False
+        return True
+
+    def estimate(self, features: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """
+        Estimate a ticket's resolution time.
+
+        Args:
+            features: The ticket's team, priority, urgency, sentiment and
+                conversation_chars
+
+        Returns:
+            The estimation fields: estimated_time and confidence_interval as
+            text, estimated_hours_p50/p90 as numbers and estimated_by
+            "model"; or None without a trained model
+        """
+        self.maybe_retrain()
+        model = self.model
+        if model is None:
+            return None
+        hours = model.predict(ticket_codes(
+            features.get("team"), features.get("priority"), features.get("urgency"),
+            features.get("sentiment"), features.get("conversation_chars", 0),
+        ))
+        p50, p90 = hours[QUANTILES[0]], hours[QUANTILES[1]]
+        return {
+            "estimated_time": format_hours(p50),
+            "confidence_interval": f"90% resolved within {format_hours(p90)}",
+            "estimated_hours_p50": round(p50, 2),
+            "estimated_hours_p90": round(p90, 2),
+            "estimated_by": "model",
+        }
+
+    def stats(self) -> Dict[str, Any]:
+        """Get the number of resolved tickets the model was trained on."""
+        return {"trained_on": self.model.tickets if self.model is not None else 0}
+
+
+_resolution_estimator: Optional[ResolutionEstimator] = None
+_resolution_estimator_lock = threading.Lock()
+
+
+def get_resolution_estimator() -> Optional[ResolutionEstimator]:
+    """Get the process-wide resolution-time estimator, or None in "llm" mode."""
+    global _resolution_estimator
+    if RESOLUTION_MODEL_CONFIG["mode"] == "llm":
+        return None
+    with _resolution_estimator_lock:
+        if _resolution_estimator is None:
+            _resolution_estimator = ResolutionEstimator(
+                min_training_tickets=RESOLUTION_MODEL_CONFIG["min_training_tickets"],
+                max_training_tickets=RESOLUTION_MODEL_CONFIG["max_training_tickets"],
+                retrain_interval=RESOLUTION_MODEL_CONFIG["retrain_interval"],
+            )
+        return _resolution_estimator
@@ -0,0 +1,120 @@
+import threading
+from typing import Dict, Any, List, Optional, Iterable
+
+from config.config import SCHEDULER_CONFIG
+
+
+# Priority lanes, most urgent first
+LANES = ("critical", "high", "normal", "bulk")
+
+
+class AdmissionPolicy:
+    """
+    Assigns queued tickets to a priority lane and a tenant.
+
+    Tickets marked critical (metadata "priority" or "urgency") take the
+    critical lane; priority-tier subscriptions and high priority or urgency
+    take the high lane; low-priority tickets and batch submissions, which
+    are mostly backfills, take the bulk lane. The tenant is read from the
+    first metadata field of `tenant_fields` that is set.
+    """
+
+    def __init__(self, priority_tiers: Iterable[str], tenant_fields: Iterable[str]):
+        self.priority_tiers = {tier.lower() for tier in priority_tiers}
+        self.tenant_fields = list(tenant_fields)
+
+    @staticmethod
+    def _levels(metadata: Dict[str, Any]) -> set:
+        return {str(metadata.get(field, "")).lower() for field in ("priority", "urgency")}
+
+    def lane_for(self, ticket_data: Dict[str, Any]) -> str:
+        """Lane of a single ticket submission."""
+        metadata = ticket_data.get("metadata") or {}
+        levels = self._levels(metadata)
+        if "critical" in levels:
+            return "critical"
+        if "high" in levels or str(metadata.get("subscription_tier", "")).lower() in self.priority_tiers:
+            return "high"
+        if "low" in levels:
+            return "bulk"
+        return "normal"
+
+    def tenant_for(self, ticket_data: Dict[str, Any]) -> str:
+        """Tenant of a ticket, or "" if the metadata names none."""
+        metadata = ticket_data.get("metadata") or {}
+        for field in self.tenant_fields:
+            if metadata.get(field):
+                return str(metadata[field])
+        return ""
+
+    def batch_tenant(self, tickets: List[Dict[str, Any]]) -> str:
+        """Tenant shared by all tickets of a batch chunk, or "" if they differ."""
+        tenants = {self.tenant_for(ticket) for ticket in tickets}
+        return tenants.pop() if len(tenants) == 1 else ""
+
+
+class LaneScheduler:
+    """
+    Weighted fair queuing across priority lanes (stride scheduling).
+
+    Each lane has a virtual time that advances by 1/weight whenever a job of
+    the lane is dispatched; the lane with the lowest virtual time goes next.
+    Under full load lanes get dispatch shares proportional to their weights,
+    so the bulk lane keeps moving while critical tickets go first. A lane
+    that had nothing to dispatch is moved up to the dispatched lane's
+    virtual time, so idle lanes do not bank credit for a later burst.
+    """
+
+    def __init__(self, weights: Dict[str, float]):
+        unknown = set(weights) - set(LANES)
+        if unknown:
+            raise ValueError(f"Unknown scheduler lanes: {sorted(unknown)}")
+        self.weights = {lane: float(weights.get(lane, 1)) for lane in LANES}
+        self._virtual_time = {lane: 0.0 for lane in LANES}
+        self._dispatched = {lane: 0 for lane in LANES}
+        self._lock = threading.Lock()
+
+    def order(self) -> List[str]:
+        """Lanes in the order they should be offered the next worker."""
+        with self._lock:
+            # Ties go to the more urgent lane
+            return sorted(LANES, key=lambda lane: (self._virtual_time[lane], LANES.index(lane)))
+
+    def dispatched(self, lane: str, skipped: Iterable[str] = ()) -> None:
+        """
+        Charge a lane for a dispatched job.
+
+        Args:
+            lane: Lane the job was taken from
+            skipped: Lanes offered first that had no eligible job
+        """
+        with self._lock:
+            now = self._virtual_time[lane]
+            for idle in skipped:
+                self._virtual_time[idle] = max(self._virtual_time[idle], now)
+            self._virtual_time[lane] = now + 1.0 / self.weights[lane]
+            self._dispatched[lane] += 1
+
+    def stats(self) -> Dict[str, Any]:
+        """Get the dispatch counts and weights of each lane."""
+        with self._lock:
+            return {
+                lane: {"weight": self.weights[lane], "dispatched": self._dispatched[lane]}
+                for lane in LANES
+            }
+
+
+_policy: Optional[AdmissionPolicy] = None
+_policy_lock = threading.Lock()
+
+
+def get_admission_policy() -> AdmissionPolicy:
+    """Get the process-wide admission policy."""
+    global _policy
+    with _policy_lock:
+        if _policy is None:
+            _policy = AdmissionPolicy(
+                priority_tiers=SCHEDULER_CONFIG["priority_tiers"],
+                tenant_fields=SCHEDULER_CONFIG["tenant_fields"],
+            )
+        return _policy
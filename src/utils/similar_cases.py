@@ -0,0 +1,338 @@
+import threading
+from typing import Dict, Any, List, Optional, Tuple
+
+import numpy as np
+
+from src.utils.ticket_feed import CompletedTicketFeed
+from config.config import SIMILAR_CASES_CONFIG
+
+
+class HashingEmbedder:
+    """
+    Embeds text by feature hashing of word unigrams and bigrams.
+
+    Needs no model download, so it is the fallback when no offline
+    embedding model is configured; vectors are L2-normalized float32.
+    """
+
+    def __init__(self, dimensions: int = 256):
+        from sklearn.feature_extraction.text import HashingVectorizer
+
+        self.dimensions = dimensions
+        self._vectorizer = HashingVectorizer(
+            n_features=dimensions, ngram_range=(1, 2), alternate_sign=True, norm="l2", lowercase=True
+        )
+
+    def encode(self, texts: List[str]) -> np.ndarray:
+        return self._vectorizer.transform(texts).astype(np.float32).toarray()
+
+
+class SentenceEmbedder:
+    """Embeds text with a local sentence-transformers model."""
+
+    def __init__(self, model: str):
+        from sentence_transformers import SentenceTransformer
+
+        self._model = SentenceTransformer(model)
+        self.dimensions = self._model.get_sentence_embedding_dimension()
+
+    def encode(self, texts: List[str]) -> np.ndarray:
+        return self._model.encode(texts, normalize_embeddings=True, convert_to_numpy=True).astype(np.float32)
+
+
+def make_embedder(model: str = "", dimensions: int = 256):
+    """
+    Get the configured embedder: a sentence-transformers model if `model`
+    names one that can be loaded, otherwise the hashing fallback.
+    """
+    if model:
+        try:
+            return SentenceEmbedder(model)
+        except Exception:
+            pass
+    return HashingEmbedder(dimensions)
+
+
+def case_text(conversation: str, summary: Optional[Dict[str, Any]], max_chars: int = 2000) -> str:
+    """Text a ticket is embedded by: its summary followed by the start of the conversation."""
+    summary_text = summary.get("summary", "") if isinstance(summary, dict) else ""
+    return f"{summary_text}\n{(conversation or '')[:max_chars]}"
+
+
+class SimilarCaseIndex:
+    """
+    Vector index of completed tickets for similar-case retrieval.
+
+    Embeddings are rows of one contiguous float32 matrix (grown by
+    doubling), so an exact search is a single matrix-vector product. Once
+    the index holds `ivf_threshold` rows it is partitioned into about
+    sqrt(n) k-means lists and a search only scans the rows of the
+    `ivf_probes` lists closest to the query (an IVF index), which keeps
+    searches in the low milliseconds at millions of tickets. Rows added
+    later are assigned to their nearest list; the partition is retrained
+    when the index has doubled since.
+    """
+
+    def __init__(self, embedder, ivf_threshold: int = 50000, ivf_probes: int = 8):
+        self.embedder = embedder
+        self.ivf_threshold = ivf_threshold
+        self.ivf_probes = ivf_probes
+        self._vectors = np.zeros((1024, embedder.dimensions), dtype=np.float32)
+        self._size = 0
+        self._rows: Dict[str, int] = {}
+        self._cases: List[Dict[str, Any]] = []
+        self._centroids: Optional[np.ndarray] = None
+        self._lists: List[List[int]] = []
+        self._list_of_row = np.zeros(1024, dtype=np.int32)
+        self._trained_size = 0
+        self._lock = threading.RLock()
+
+    def __len__(self) -> int:
+        return self._size
+
+    def _grow(self, needed: int) -> None:
+        capacity = len(self._vectors)
+        if needed <= capacity:
+            return
+        while capacity < needed:
+            capacity *= 2
+        vectors = np.zeros((capacity, self._vectors.shape[1]), dtype=np.float32)
+        vectors[:self._size] = self._vectors[:self._size]
+        self._vectors = vectors
+        list_of_row = np.zeros(capacity, dtype=np.int32)
+        list_of_row[:self._size] = self._list_of_row[:self._size]
+        self._list_of_row = list_of_row
+
+    def add_vectors(self, ticket_ids: List[str], vectors: np.ndarray, cases: List[Dict[str, Any]]) -> None:
+        """
+        Add or replace already embedded tickets.
+
+        Args:
+            ticket_ids: IDs of the tickets
+            vectors: Their L2-normalized embeddings, one row per ticket
+            cases: What to report about each ticket when it is retrieved
+        """
+        with self._lock:
+            self._grow(self._size + len(ticket_ids))
+            changed_rows: Dict[int, None] = {}
+            for ticket_id, vector, case in zip(ticket_ids, vectors, cases):
+                row = self._rows.get(ticket_id)
+                if row is None:
+                    row = self._size
+                    self._size += 1
+                    self._rows[ticket_id] = row
+                    self._cases.append(case)
+                else:
+                    self._cases[row] = case
+                    if row in changed_rows:
+                        self._vectors[row] = vector
+                        continue
+                    if self._centroids is not None:
+                        # Reassigned below with its new vector
+                        self._lists[self._list_of_row[row]].remove(row)
+                self._vectors[row] = vector
+                changed_rows[row] = None
+
+            if self._centroids is None:
+                if self._size >= self.ivf_threshold:
+                    self._train()
+            elif self._size >= 2 * self._trained_size:
+                self._train()
+            elif changed_rows:
+                self._assign(np.fromiter(changed_rows, dtype=np.int64))
+
+    def add(self, ticket_id: str, text: str, case: Dict[str, Any]) -> None:
+        """Embed and add (or replace) one ticket."""
+        self.add_vectors([ticket_id], self.embedder.encode([text]), [case])
+
+    def _assign(self, rows: np.ndarray) -> None:
+        for start in range(0, len(rows), 65536):
+            chunk = rows[start:start + 65536]
+            nearest = np.argmax(self._vectors[chunk] @ self._centroids.T, axis=1)
+            self._list_of_row[chunk] = nearest
+            for row, list_id in zip(chunk.tolist(), nearest.tolist()):
+                self._lists[list_id].append(row)
+
+    def _train(self) -> None:
+        """(Re)build the IVF partition on the current rows."""
+        from sklearn.cluster import MiniBatchKMeans
+
+        n_lists = max(int(np.sqrt(self._size)), 1)
+        rng = np.random.default_rng(0)
+        sample = rng.choice(self._size, size=min(self._size, 32 * n_lists), replace=False)
+        kmeans = MiniBatchKMeans(n_clusters=n_lists, batch_size=4096, n_init=1, max_iter=20, random_state=0)
+        kmeans.fit(self._vectors[sample])
+        centroids = kmeans.cluster_centers_.astype(np.float32)
+        centroids /= np.maximum(np.linalg.norm(centroids, axis=1, keepdims=True), 1e-12)
+        self._centroids = centroids
+        self._lists = [[] for _ in range(n_lists)]
+        self._assign(np.arange(self._size))
+        self._trained_size = self._size
+
+    def search(
+        self,
+        text: str,
+        k: int = 3,
+        min_similarity: float = 0.0,
+        exclude: Optional[str] = None,
+    ) -> List[Tuple[float, Dict[str, Any]]]:
+        """
+        Find the tickets most similar to a text by cosine similarity.
+
+        Args:
+            text: Text to match, built like case_text
+            k: Maximum number of tickets returned
+            min_similarity: Tickets below this similarity are left out
+            exclude: Ticket ID never returned (the ticket itself)
+
+        Returns:
+            (similarity, case) pairs, most similar first
+        """
+        return self.search_vector(self.embedder.encode([text])[0], k, min_similarity, exclude)
+
+    def search_vector(
+        self,
+        query: np.ndarray,
+        k: int = 3,
+        min_similarity: float = 0.0,
+        exclude: Optional[str] = None,
+    ) -> List[Tuple[float, Dict[str, Any]]]:
+        """search with an already embedded query."""
+        with self._lock:
+            if self._size == 0:
+                return []
+            if self._centroids is None:
+                rows = None
+                scores = self._vectors[:self._size] @ query
+            else:
+                probes = np.argsort(self._centroids @ query)[-self.ivf_probes:]
+                rows = np.concatenate([np.asarray(self._lists[list_id], dtype=np.int64) for list_id in probes])
+                scores = self._vectors[rows] @ query
+
+            wanted = min(k + 1, len(scores))
+            top = np.argpartition(-scores, wanted - 1)[:wanted]
+            top = top[np.argsort(-scores[top])]
+            results = []
+            for index in top:
+                row = int(index if rows is None else rows[index])
+                case = self._cases[row]
+                if case["ticket_id"] == exclude or scores[index] < min_similarity:
+                    continue
+                results.append((float(scores[index]), case))
+            return results[:k]
+
+    def stats(self) -> Dict[str, Any]:
+        """Get the size and layout of the index."""
+        with self._lock:
+            return {
+                "tickets": self._size,
+                "dimensions": int(self._vectors.shape[1]),
+                "ivf_lists": 0 if self._centroids is None else len(self._lists),
+                "memory_bytes": int(self._vectors[:self._size].nbytes),
+            }
+
+
+def case_from_results(ticket_id: str, results: Dict[str, Any]) -> Dict[str, Any]:
+    """What the index reports about a ticket: its summary, team and resolution."""
+    summary = results.get("summary") or {}
+    routing = results.get("routing") or {}
+    recommendations = results.get("recommendations") or {}
+    return {
+        "ticket_id": ticket_id,
+        "summary": summary.get("summary", "") if isinstance(summary, dict) else "",
+        "team": routing.get("team", "") if isinstance(routing, dict) else "",
+        "solutions": (recommendations.get("recommended_solutions") or [])[:3] if isinstance(recommendations, dict) else [],
+    }
+
+
+def format_similar_cases(matches: List[Tuple[float, Dict[str, Any]]]) -> str:
+    """Render retrieved cases as the historical data of the recommender prompt."""
+    lines = []
+    for score, case in matches:
+        line = f"- Case {case['ticket_id']} (similarity {score:.2f}"
+        line += f", team {case['team']}): " if case["team"] else "): "
+        line += case["summary"] or "no summary"
+        if case["solutions"]:
+            line += " Resolved with: " + "; ".join(str(solution) for solution in case["solutions"])
+        lines.append(line)
+    return "\n".join(lines)
+
+
+class SimilarCases(CompletedTicketFeed):
+    """
+    Similar-case retrieval over the ticket database.
+
+    The index follows the completed tickets as described in
+    CompletedTicketFeed.
+    """
+
+    fields = ["ticket_id", "conversation", "summary", "routing", "recommendations"]
+
+    def __init__(self, index: SimilarCaseIndex, top_k: int = 3, min_similarity: float = 0.3,
+                 sync_interval: float = 30.0, max_text_chars: int = 2000):
+        super().__init__(sync_interval)
+        self.index = index
+        self.top_k = top_k
+        self.min_similarity = min_similarity
+        self.max_text_chars = max_text_chars
+
+    def add_ticket(self, ticket: Dict[str, Any]) -> None:
+        """Index a completed ticket (with its conversation and results)."""
+        self.index.add(
+            ticket["ticket_id"],
+            case_text(ticket.get("conversation", ""), ticket.get("summary"), self.max_text_chars),
+            case_from_results(ticket["ticket_id"], ticket),
+        )
+
+    def _add_batch(self, tickets: List[Dict[str, Any]]) -> int:
+        if not tickets:
+            return 0
+        texts = [case_text(t["conversation"], t["summary"], self.max_text_chars) for t in tickets]
+        self.index.add_vectors(
+            [t["ticket_id"] for t in tickets],
+            self.index.embedder.encode(texts),
+            [case_from_results(t["ticket_id"], t) for t in tickets],
+        )
+        return len(tickets)
+
+    def find(self, conversation: str, summary: Optional[Dict[str, Any]], exclude: Optional[str] = None) -> str:
+        """
+        Historical data for the recommender: the most similar completed tickets.
+
+        Returns:
+            The formatted cases, or "" if none is similar enough
+        """
+        self.maybe_sync()
+        matches = self.index.search(
+            case_text(conversation, summary, self.max_text_chars),
+            k=self.top_k, min_similarity=self.min_similarity, exclude=exclude,
+        )
+        return format_similar_cases(matches)
+
+
+_similar_cases: Optional[SimilarCases] = None
+_similar_cases_lock = threading.Lock()
+
+
+def get_similar_cases() -> Optional[SimilarCases]:
+    """Get the process-wide similar-case retrieval, or None if it is disabled."""
+    global _similar_cases
+    if not SIMILAR_CASES_CONFIG["enabled"]:
+        return None
+    with _similar_cases_lock:
+        if _similar_cases is None:
+            from src.utils.database import add_results_listener
+
+            index = SimilarCaseIndex(
+                make_embedder(SIMILAR_CASES_CONFIG["embedding_model"], SIMILAR_CASES_CONFIG["dimensions"]),
+                ivf_threshold=SIMILAR_CASES_CONFIG["ivf_threshold"],
+                ivf_probes=SIMILAR_CASES_CONFIG["ivf_probes"],
+            )
+            _similar_cases = SimilarCases(
+                index,
+                top_k=SIMILAR_CASES_CONFIG["top_k"],
+                min_similarity=SIMILAR_CASES_CONFIG["min_similarity"],
+                sync_interval=SIMILAR_CASES_CONFIG["sync_interval"],
+            )
+            add_results_listener(_similar_cases.add_ticket)
+        return _similar_cases
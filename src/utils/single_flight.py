@@ -0,0 +1,134 @@
+import asyncio
+import threading
+import concurrent.futures
+from concurrent.futures import Future
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple, TypeVar
+
+from src.utils.resilience import LLMTimeoutError, remaining
+
+T = TypeVar("T")
+
+
+class _Abandoned(Exception):
+    """The leader of a flight gave up (timed out or was cancelled)."""
+
+
+class SingleFlight:
+    """
+    Coalesces concurrent identical calls into one.
+
+    The first caller of a key (the leader) runs the call; callers arriving
+    with the same key while it is in flight (followers) wait for it and get
+    its result, or its exception, instead of running the call again. Sync
+    and async callers share flights: a thread may follow a coroutine's call
+    and the other way round.
+
+    A leader that times out or is cancelled does not fail its followers,
+    whose deadlines may be later: the first of them runs the call anew.
+    Results are shared, not copied; callers must not mutate them.
+    """
+
+    def __init__(self, name: str):
+        self.name = name
+        self._flights: Dict[str, Future] = {}
+        self._lock = threading.Lock()
+        self.leaders = 0
+        self.followers = 0
+
+    def _join(self, key: str) -> Tuple[Future, bool]:
+        with self._lock:
+            future = self._flights.get(key)
+            if future is not None:
+                self.followers += 1
+                return future, False
+            future = Future()
+            self._flights[key] = future
+            self.leaders += 1
+            return future, True
+
+    def _land(self, key: str, future: Future, result: Any = None, error: Optional[BaseException] = None) -> None:
+        with self._lock:
+            del self._flights[key]
+        if error is None:
+            future.set_result(result)
+        elif isinstance(error, TimeoutError) or not isinstance(error, Exception):
+            future.set_exception(_Abandoned())
+        else:
+            future.set_exception(error)
+
+    def do(self, key: str, call: Callable[[], T], deadline: Optional[float] = None) -> T:
+        """
+        Run a call, or wait for the identical call already in flight.
+
+        Args:
+            key: Identity of the call
+            call: Callable run if no identical call is in flight
+            deadline: Monotonic time after which a follower stops waiting
+
+        Returns:
+            The call's result
+
+        Raises:
+            LLMTimeoutError: If a follower's deadline passes first
+        """
+        while True:
+            future, leader = self._join(key)
+            if leader:
+                try:
+                    result = call()
+                except BaseException as e:
+                    self._land(key, future, error=e)
+                    raise
+                self._land(key, future, result)
+                return result
+            try:
+                return future.result(timeout=remaining(deadline))
+            except _Abandoned:
+                continue
+            except concurrent.futures.TimeoutError:
+                raise LLMTimeoutError("Deadline exceeded while waiting for an identical call")
+
+    async def ado(self, key: str, call: Callable[[], Awaitable[T]], deadline: Optional[float] = None) -> T:
+        """Async counterpart of do; followers await the flight without blocking the loop."""
+        while True:
+            future, leader = self._join(key)
+            if leader:
+                try:
+                    result = await call()
+                except BaseException as e:
+                    self._land(key, future, error=e)
+                    raise
+                self._land(key, future, result)
+                return result
+            try:
+                # Shielded, so a follower giving up never cancels the shared future
+                return await asyncio.wait_for(asyncio.shield(asyncio.wrap_future(future)), remaining(deadline))
+            except _Abandoned:
+                continue
+            except asyncio.TimeoutError:
+                raise LLMTimeoutError("Deadline exceeded while waiting for an identical call")
+
+    def stats(self) -> Dict[str, Any]:
+        """Get the calls run (leaders), the calls coalesced (followers) and the calls in flight."""
+        with self._lock:
+            return {"leaders": self.leaders, "followers": self.followers, "in_flight": len(self._flights)}
+
+
+_flights: Dict[str, SingleFlight] = {}
+_flights_lock = threading.Lock()
+
+
+def get_single_flight(name: str) -> SingleFlight:
+    """Get the process-wide single-flight group of a kind of call."""
+    with _flights_lock:
+        flight = _flights.get(name)
+        if flight is None:
+            flight = _flights[name] = SingleFlight(name)
+        return flight
+
+
+def single_flight_stats() -> Dict[str, Any]:
+    """Get the statistics of every single-flight group."""
+    with _flights_lock:
+        flights = dict(_flights)
+    return {name: flight.stats() for name, flight in flights.items()}
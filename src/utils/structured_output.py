@@ -0,0 +1,44 @@
+import re
+from typing import Dict, Any, Type
+
+from pydantic import BaseModel
+
+
+# The prose description of the expected JSON shape that every agent prompt
+# ends with: "... in the following JSON format: ```json {...} ``` Return only
+# the JSON object with no other text before or after."
+_FORMAT_INSTRUCTIONS = re.compile(
+    r"in the following JSON format:\s*```json.*?```(\s*Return only the JSON object[^\n]*)?",
+    re.DOTALL,
+)
+
+
+def json_schema_for(model: Type[BaseModel]) -> Dict[str, Any]:
+    """
+    Derive the JSON schema handed to format-constrained decoding.
+
+    Args:
+        model: Pydantic result model of an agent
+
+    Returns:
+        JSON schema dictionary requiring every field of the model
+    """
+    schema = model.model_json_schema()
+    schema["required"] = list(schema.get("properties", {}))
+    return schema
+
+
+def strip_format_instructions(prompt_template: str) -> str:
+    """
+    Shorten a prompt template whose output shape is enforced by a schema.
+
+    The prose JSON example is replaced by a short request for a JSON object;
+    templates without the usual format instructions are returned unchanged.
+
+    Args:
+        prompt_template: The agent's prompt template
+
+    Returns:
+        The prompt template without the JSON format example
+    """
+    return _FORMAT_INSTRUCTIONS.sub("as a single JSON object.", prompt_template)
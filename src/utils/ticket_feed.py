@@ -0,0 +1,77 @@
+import time
+import threading
+from abc import ABC, abstractmethod
+from datetime import datetime
+from typing import Dict, Any, List, Optional
+
+
+class CompletedTicketFeed(ABC):
+    """
+    Keeps an in-memory index of the completed tickets up to date.
+
+    Subclasses implement add_ticket (and optionally a faster _add_batch).
+    The index is loaded from the completed tickets on first use, updated in
+    process through a database results listener calling add_ticket, and
+    caught up with tickets completed by other processes (such as standalone
+    workers) at most every `sync_interval` seconds.
+    """
+
+    # Ticket fields read from the database for each ticket
+    fields: List[str] = ["ticket_id", "conversation"]
+
+    def __init__(self, sync_interval: float = 30.0):
+        self.sync_interval = sync_interval
+        self._synced_until: Optional[datetime] = None
+        self._next_sync = 0.0
+        self._sync_lock = threading.Lock()
+
+    @abstractmethod
+    def add_ticket(self, ticket: Dict[str, Any]) -> None:
+        """Index a completed ticket (with its conversation and results)."""
+        pass
+
+    def _add_batch(self, tickets: List[Dict[str, Any]]) -> int:
+        for ticket in tickets:
+            self.add_ticket(ticket)
+        return len(tickets)
+
+    def sync(self, batch_size: int = 1000, wait: bool = True) -> int:
+        """
+        Index the tickets completed since the last sync.
+
+        Args:
+            batch_size: Tickets read and indexed at a time
+            wait: Whether to wait for a sync already running in another
+                thread instead of returning right away
+
+        Returns:
+            Number of tickets indexed
+        """
+        from src.utils.database import iter_tickets
+
+        if not self._sync_lock.acquire(blocking=wait):
+            return 0
+        try:
+            started = datetime.utcnow()
+            tickets = iter_tickets(
+                fields=self.fields, updated_after=self._synced_until, batch_size=batch_size, status="completed",
+            )
+            count = 0
+            batch: List[Dict[str, Any]] = []
+            for ticket in tickets:
+                batch.append(ticket)
+                if len(batch) == batch_size:
+                    count += self._add_batch(batch)
+                    batch = []
+            count += self._add_batch(batch)
+            # Tickets updated while this sync ran are read again next time
+            self._synced_until = started
+            self._next_sync = time.monotonic() + self.sync_interval
+            return count
+        finally:
+            self._sync_lock.release()
+
+    def maybe_sync(self) -> None:
+        """Sync if `sync_interval` has passed; the first load blocks, later catch-ups are skipped while one runs."""
+        if time.monotonic() >= self._next_sync:
+            self.sync(wait=self._synced_until is None)
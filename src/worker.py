@@ -0,0 +1,39 @@
+import signal
+import logging
+import threading
+from src.agents.orchestrator import Orchestrator
+from src.api.jobs import start_job_workers
+from config.config import JOB_QUEUE_CONFIG, SYSTEM_CONFIG
+
+
+# Configure logging
+logging.basicConfig(
+    level=getattr(logging, SYSTEM_CONFIG["log_level"]),
+    format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
+)
+logger = logging.getLogger("lightspeed")
+
+
+def main():
+    """
+    Run a standalone ticket worker.
+    
+    Consumes the jobs the API enqueues on the configured job backend
+    (JOB_QUEUE_BACKEND) until SIGINT or SIGTERM, then finishes the jobs in
+    flight. Run the API with JOB_WORKERS=0 to leave all processing to these
+    workers, and start as many of them as the inference capacity allows.
+    """
+    stop = threading.Event()
+    for signum in (signal.SIGINT, signal.SIGTERM):
+        signal.signal(signum, lambda *_: stop.set())
+    
+    logger.info(f"Starting Lightspeed worker on the {JOB_QUEUE_CONFIG['backend']} job backend")
+    worker = start_job_workers(Orchestrator(), max(JOB_QUEUE_CONFIG["workers"], 1))
+    stop.wait()
+    
+    logger.info("Stopping Lightspeed worker after the jobs in flight")
+    worker.stop()
+
+
+if __name__ == "__main__":
+    main()
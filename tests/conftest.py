@@ -0,0 +1,54 @@
+import sys
+import atexit
+import shutil
+import tempfile
+import importlib
+from pathlib import Path
+
+import pytest
+
+# Add the project root to sys.path
+root_dir = Path(__file__).parent.parent
+sys.path.append(str(root_dir))
+
+from config.config import DB_CONFIG, JOB_QUEUE_CONFIG, LLM_CACHE_CONFIG
+
+# Point the SQLite files at a temporary directory before any test module
+# imports the code opening them, so the suite never migrates or writes the
+# tracked data/lightspeed.db
+data_dir = Path(tempfile.mkdtemp(prefix="lightspeed-tests-"))
+atexit.register(shutil.rmtree, data_dir, ignore_errors=True)
+DB_CONFIG["sqlite_path"] = str(data_dir / "lightspeed.db")
+JOB_QUEUE_CONFIG["sqlite_path"] = str(data_dir / "job_queue.db")
+LLM_CACHE_CONFIG["sqlite_path"] = str(data_dir / "llm_cache.db")
+
+
+@pytest.fixture
+def load_database():
+    """
+    Loader importing the database module against a fresh SQLite file.
+
+    After the test, the group-commit writers of the loaded modules are
+    stopped and src.utils.database is restored to the module the rest of
+    the suite imported.
+    """
+    import src.utils.database as database
+
+    original = dict(vars(database))
+    original_path = DB_CONFIG["sqlite_path"]
+    loaded = []
+
+    def load(path):
+        DB_CONFIG["sqlite_path"] = str(path)
+        importlib.reload(database)
+        loaded.append((database.writer, database.engine))
+        return database
+
+    yield load
+
+    for writer, engine in loaded:
+        writer.stop()
+        engine.dispose()
+    DB_CONFIG["sqlite_path"] = original_path
+    vars(database).clear()
+    vars(database).update(original)
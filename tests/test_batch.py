@@ -0,0 +1,88 @@
+import sys
+from pathlib import Path
+
+# Add the project root to sys.path
+root_dir = Path(__file__).parent.parent
+sys.path.append(str(root_dir))
+
+from src.agents.orchestrator import Orchestrator
+
+
+def test_process_batch_runs_each_step_once(monkeypatch):
+    """Test that a batch makes one batched call per step and keeps ticket order."""
+    orchestrator = Orchestrator(graph="sequential")
+    calls = []
+
+    def fake_batch(name):
+        def process_batch(inputs, max_concurrency=None):
+            calls.append((name, len(inputs), max_concurrency))
+            return [{"summary": f"{name} {index}"} for index in range(len(inputs))]
+        return process_batch
+
+    for name, agent in [("summary", orchestrator.summarizer), ("routing", orchestrator.router),
+                        ("recommendations", orchestrator.recommender), ("estimation", orchestrator.estimator)]:
+        monkeypatch.setattr(agent, "process_batch", fake_batch(name))
+
+    def final_batch(inputs, max_concurrency=None):
+        calls.append(("final_insights", len(inputs), max_concurrency))
+        return ["Report 0", RuntimeError("model unavailable")]
+
+    monkeypatch.setattr(orchestrator.final_chain, "batch", final_batch)
+
+    tickets = [
+        {"ticket_id": "batch-0", "conversation": "Customer: I cannot log in."},
+        {"ticket_id": "batch-1", "conversation": "Customer: I was charged twice."},
+    ]
+    results = orchestrator.process_batch(tickets, mode="staged", max_concurrency=4)
+
+    assert [name for name, _, _ in calls] == ["summary", "routing", "recommendations", "estimation", "final_insights"]
+    assert all(size == 2 and limit == 4 for _, size, limit in calls)
+    assert [result["ticket_id"] for result in results] == ["batch-0", "batch-1"]
+    assert results[0]["summary"] == {"summary": "summary 0"}
+    assert results[0]["final_insights"] == "Report 0"
+    assert "error" not in results[0]
+    assert "model unavailable" in results[1]["error"]
+    assert set(results[1]["timings"]) >= {"summary", "final_insights", "total"}
+
+
+def test_estimator_only_asks_the_llm_for_the_narrative_with_a_model(monkeypatch):
+    """Test that a model estimate sends the narrative prompt and keeps the model's time."""
+    from src.agents.estimator_agent import EstimatorAgent
+
+    class Estimator:
+        def estimate(self, features):
+            if features.get("team") is None:
+                return None
+            return {"estimated_time": "4.0 hours", "confidence_interval": "90% resolved within 9.0 hours",
+                    "estimated_hours_p50": 4.0, "estimated_hours_p90": 9.0, "estimated_by": "model"}
+
+    agent = EstimatorAgent()
+    agent.resolution_estimator = Estimator()
+    agent.mode = "hybrid"
+    calls = []
+
+    def fake_batch(name, output):
+        def batch(inputs, max_concurrency=None):
+            calls.append((name, len(inputs)))
+            return [output] * len(inputs)
+        return batch
+
+    monkeypatch.setattr(agent.chains["narrative_chain"], "batch", fake_batch(
+        "narrative_chain", '{"bottlenecks": ["Refund approval"], "optimization_suggestions": [], "resources_needed": []}'
+    ))
+    monkeypatch.setattr(agent.chains["estimator_chain"], "batch", fake_batch(
+        "estimator_chain", '{"estimated_time": "2 days", "confidence_interval": "80% confident", '
+                           '"bottlenecks": [], "optimization_suggestions": [], "resources_needed": []}'
+    ))
+
+    results = agent.process_batch([
+        {"ticket_content": "refund", "ticket_features": {"team": "Billing"}},
+        {"ticket_content": "refund", "ticket_features": {"team": None}},
+    ])
+
+    assert sorted(calls) == [("estimator_chain", 1), ("narrative_chain", 1)]
+    assert results[0]["estimated_time"] == "4.0 hours"
+    assert results[0]["bottlenecks"] == ["Refund approval"]
+    assert results[1]["estimated_time"] == "2 days"
+    assert "estimated_by" not in results[1]
+    assert "estimated_time" not in agent.chains["narrative_chain"].prompt.template
@@ -0,0 +1,93 @@
+import sys
+import time
+import threading
+from pathlib import Path
+
+import pytest
+
+# Add the project root to sys.path
+root_dir = Path(__file__).parent.parent
+sys.path.append(str(root_dir))
+
+from src.utils.broker import InMemoryBroker, BrokerWorker
+from src.utils.job_queue import QueueFullError
+
+
+def wait_for(condition, timeout=5.0):
+    deadline = time.time() + timeout
+    while not condition() and time.time() < deadline:
+        time.sleep(0.01)
+    return condition()
+
+
+def test_enqueue_beyond_max_depth_is_rejected():
+    broker = InMemoryBroker(max_depth=2)
+    broker.enqueue("job-1", "ticket", [{}, {}])
+    with pytest.raises(QueueFullError):
+        broker.enqueue("job-2", "ticket", [{}])
+    assert broker.stats() == {"queued": 2, "max_depth": 2}
+
+
+def test_worker_dispatches_jobs_by_kind():
+    broker = InMemoryBroker()
+    seen = []
+    worker = BrokerWorker(broker, {
+        "ticket": lambda job: seen.append(("ticket", job.payload["n"])),
+        "batch_chunk": lambda job: seen.append(("batch_chunk", len(job.payload["tickets"]))),
+    })
+    broker.enqueue("job-1", "ticket", [{"n": 1}])
+    broker.enqueue("job-2", "batch_chunk", [{"tickets": [{}, {}]}])
+    worker.start()
+    assert wait_for(lambda: len(seen) == 2)
+    worker.stop()
+    assert sorted(seen) == [("batch_chunk", 2), ("ticket", 1)]
+
+
+def test_prefetch_count_bounds_jobs_in_flight():
+    broker = InMemoryBroker(prefetch_count=2)
+    lock = threading.Lock()
+    running = []
+    peak = []
+
+    def handle(job):
+        with lock:
+            running.append(job.id)
+            peak.append(len(running))
+        time.sleep(0.05)
+        with lock:
+            running.remove(job.id)
+
+    broker.enqueue("job-1", "ticket", [{} for _ in range(6)])
+    worker = BrokerWorker(broker, {"ticket": handle})
+    worker.start()
+    assert wait_for(lambda: len(peak) == 6)
+    worker.stop()
+    assert max(peak) == 2
+
+
+def test_failed_job_is_redelivered_then_dead_lettered():
+    broker = InMemoryBroker(max_attempts=2)
+    attempts = []
+
+    def handle(job):
+        attempts.append(job.attempts)
+        raise RuntimeError("model unavailable")
+
+    broker.enqueue("job-1", "ticket", [{"n": 1}])
+    worker = BrokerWorker(broker, {"ticket": handle})
+    worker.start()
+    assert wait_for(lambda: broker.dead_letters)
+    worker.stop()
+    assert attempts == [1, 2]
+    assert broker.dead_letters[0].payload == {"n": 1}
+
+
+def test_stop_waits_for_jobs_in_flight():
+    broker = InMemoryBroker()
+    done = []
+    broker.enqueue("job-1", "ticket", [{}])
+    worker = BrokerWorker(broker, {"ticket": lambda job: (time.sleep(0.2), done.append(job.id))})
+    worker.start()
+    assert wait_for(lambda: broker.depth() == 0)
+    worker.stop()
+    assert done == [1]
@@ -0,0 +1,80 @@
+import sys
+from pathlib import Path
+
+# Add the project root to sys.path
+root_dir = Path(__file__).parent.parent
+sys.path.append(str(root_dir))
+
+import src.api.jobs as jobs
+from src.agents.orchestrator import Orchestrator
+from src.utils.job_queue import QueuedJob
+
+
+def fake_agents(orchestrator, monkeypatch, calls, failing=()):
+    for name, agent in [("summary", orchestrator.summarizer), ("routing", orchestrator.router),
+                        ("recommendations", orchestrator.recommender), ("estimation", orchestrator.estimator)]:
+        def process(input_data, name=name):
+            calls.append(name)
+            if name in failing:
+                return {"error": f"{name} failed: timeout"}
+            return {"summary": f"{name} result"}
+
+        async def aprocess(input_data, process=process):
+            return process(input_data)
+        monkeypatch.setattr(agent, "process", process)
+        monkeypatch.setattr(agent, "aprocess", aprocess)
+
+    def run_final(final_input):
+        calls.append("final_insights")
+        return "Report"
+    monkeypatch.setattr(orchestrator.final_chain, "run", run_final)
+
+
+def test_resume_only_runs_missing_stages(monkeypatch):
+    """Test that a retry after a failed stage costs only that stage and its dependents."""
+    orchestrator = Orchestrator(graph="parallel")
+    ticket = {"ticket_id": "resume-001", "conversation": "Customer: I cannot log in."}
+    stored = {}
+
+    calls = []
+    fake_agents(orchestrator, monkeypatch, calls, failing=("estimation",))
+    orchestrator.process_ticket(ticket, mode="staged", checkpoint=stored.__setitem__)
+    # The final insights ran on a fallback estimate, so they are not kept either
+    assert set(stored) == {"summary", "routing", "recommendations"}
+
+    calls = []
+    fake_agents(orchestrator, monkeypatch, calls)
+    results = orchestrator.process_ticket(ticket, mode="fused", completed=dict(stored), checkpoint=stored.__setitem__)
+
+    assert calls == ["estimation", "final_insights"]
+    assert results["mode"] == "staged"
+    assert results["resumed_stages"] == ["recommendations", "routing", "summary"]
+    assert results["final_insights"] == "Report"
+    assert set(stored) == {"summary", "routing", "recommendations", "estimation", "final_insights"}
+
+
+def test_ticket_job_runs_the_async_pipeline(monkeypatch):
+    """Test that queued tickets go through aprocess_ticket and keep their checkpoints."""
+    orchestrator = Orchestrator(graph="parallel")
+    calls, stored, saved = [], {}, {}
+    fake_agents(orchestrator, monkeypatch, calls)
+
+    async def astream(final_input):
+        calls.append("final_insights")
+        yield "Report"
+    monkeypatch.setattr(orchestrator.final_chain, "astream", astream)
+    monkeypatch.setattr(orchestrator, "process_ticket", None)
+    monkeypatch.setattr(jobs, "mark_job_started", lambda job_id: None)
+    monkeypatch.setattr(jobs, "update_job_status", lambda job_id, status: saved.setdefault("status", status))
+    monkeypatch.setattr(jobs, "get_ticket_stages", lambda ticket_id: {})
+    monkeypatch.setattr(jobs, "save_ticket_stage", lambda ticket_id, stage, result: stored.__setitem__(stage, result))
+    monkeypatch.setattr(jobs, "update_ticket_results", lambda ticket_id, results: saved.setdefault("results", results))
+
+    handlers = jobs.TicketJobHandlers(orchestrator, max_attempts=3)
+    ticket = {"ticket_id": "async-001", "conversation": "Customer: I cannot log in."}
+    handlers.process_ticket(QueuedJob(1, "job-async", "ticket", ticket, attempts=1))
+
+    assert sorted(calls) == ["estimation", "final_insights", "recommendations", "routing", "summary"]
+    assert saved["status"] == "completed"
+    assert saved["results"]["final_insights"] == "Report"
+    assert set(stored) == {"summary", "routing", "recommendations", "estimation", "final_insights"}
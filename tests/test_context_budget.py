@@ -0,0 +1,54 @@
+import sys
+from pathlib import Path
+
+# Add the project root to sys.path
+root_dir = Path(__file__).parent.parent
+sys.path.append(str(root_dir))
+
+from src.utils.context_budget import ContextBudget, count_tokens, to_prompt_json
+
+
+SUMMARY = {
+    "summary": "Admin cannot access the dashboard after last night's update",
+    "key_points": ["Access Denied since 9 AM", "Reports needed this afternoon"],
+    "action_items": ["Restore admin access"],
+}
+
+
+def count(chain_input):
+    return count_tokens("Ticket:\n{ticket_content}\nRouting:\n{routing_info}".format(**chain_input))
+
+
+def test_short_conversation_is_kept():
+    """Test that prompts within the budget keep the raw conversation."""
+    budget = ContextBudget(max_prompt_tokens=100)
+    chain_input = {"ticket_content": "Customer: it's broken", "routing_info": "{}"}
+
+    fitted, tokens = budget.fit("routing", chain_input, count, SUMMARY)
+
+    assert fitted is chain_input
+    assert tokens == count(chain_input)
+    assert budget.stats()["steps"]["routing"]["saved_tokens"] == 0
+
+
+def test_long_conversation_is_condensed():
+    """Test that prompts over the budget get the summary instead of the conversation."""
+    budget = ContextBudget(max_prompt_tokens=100)
+    chain_input = {"ticket_content": "Customer: it's broken. " * 200, "routing_info": "{}"}
+
+    fitted, tokens = budget.fit("estimation", chain_input, count, SUMMARY)
+
+    assert fitted["ticket_content"].startswith("Summary: Admin cannot access")
+    assert "- Restore admin access" in fitted["ticket_content"]
+    assert tokens < count(chain_input)
+    step = budget.stats()["steps"]["estimation"]
+    assert step["condensed_prompts"] == 1
+    assert step["saved_tokens"] == count(chain_input) - tokens
+
+
+def test_prompt_json_is_minified_and_field_selected():
+    """Test the serialization of agent results for downstream prompts."""
+    routing = {"team": "Technical Support", "priority": "high", "justification": "long text"}
+
+    assert to_prompt_json(routing, ["team", "priority"]) == '{"team":"Technical Support","priority":"high"}'
+    assert to_prompt_json(None) == ""
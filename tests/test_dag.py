@@ -0,0 +1,79 @@
+import sys
+import time
+import asyncio
+from pathlib import Path
+
+import pytest
+
+# Add the project root to sys.path
+root_dir = Path(__file__).parent.parent
+sys.path.append(str(root_dir))
+
+from src.utils.dag import DAGNode, DAGExecutor
+
+
+def sleeper(name, delay):
+    """Node that waits and returns its name joined to its upstream results."""
+    def run(context, upstream):
+        time.sleep(delay)
+        return "+".join([name] + sorted(upstream))
+
+    async def arun(context, upstream):
+        await asyncio.sleep(delay)
+        return "+".join([name] + sorted(upstream))
+
+    return run, arun
+
+
+def diamond(delay=0.05):
+    nodes = []
+    for name, requires in [("a", []), ("b", []), ("c", ["a", "b"])]:
+        run, arun = sleeper(name, delay)
+        nodes.append(DAGNode(name, run=run, arun=arun, requires=requires))
+    return DAGExecutor(nodes)
+
+
+def test_independent_nodes_run_concurrently():
+    """Test that the thread pool runs the two roots side by side."""
+    results, timings = diamond().run({})
+
+    assert results["c"] == "c+a+b"
+    assert abs(timings["a"]["start"] - timings["b"]["start"]) < 0.03
+    assert timings["c"]["start"] >= max(timings["a"]["duration"], timings["b"]["duration"])
+    # Critical path is two nodes, not three
+    assert timings["c"]["start"] + timings["c"]["duration"] < 0.14
+
+
+def test_async_run_reports_results_as_they_land():
+    """Test the asyncio executor and its completion callback."""
+    finished = []
+    results, timings = asyncio.run(diamond().arun({}, on_result=lambda name, result: finished.append(name)))
+
+    assert results["c"] == "c+a+b"
+    assert sorted(finished[:2]) == ["a", "b"] and finished[2] == "c"
+    assert set(timings) == {"a", "b", "c"}
+
+
+def test_completed_nodes_are_not_run_again():
+    """Test that resuming from earlier results only runs the missing nodes."""
+    finished = []
+    completed = {"a": "a-earlier", "b": "b-earlier"}
+
+    results, timings = diamond().run({}, on_result=lambda name, result: finished.append(name), completed=completed)
+    assert results == {"a": "a-earlier", "b": "b-earlier", "c": "c+a+b"}
+    assert finished == ["c"] and set(timings) == {"c"}
+
+    results, timings = asyncio.run(diamond().arun({}, completed={**completed, "c": "c-earlier"}))
+    assert results["c"] == "c-earlier" and timings == {}
+
+
+def test_invalid_graphs_are_rejected():
+    """Test that cycles and unknown requirements raise at construction."""
+    run, arun = sleeper("x", 0)
+    with pytest.raises(ValueError, match="Cycle"):
+        DAGExecutor([
+            DAGNode("x", run=run, arun=arun, requires=["y"]),
+            DAGNode("y", run=run, arun=arun, requires=["x"]),
+        ])
+    with pytest.raises(ValueError, match="unknown"):
+        DAGExecutor([DAGNode("x", run=run, arun=arun, requires=["missing"])])
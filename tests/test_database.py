@@ -0,0 +1,170 @@
+import sys
+import json
+import sqlite3
+from pathlib import Path
+
+import pytest
+
+# Add the project root to sys.path
+root_dir = Path(__file__).parent.parent
+sys.path.append(str(root_dir))
+
+
+def test_existing_database_is_migrated_and_backfilled(load_database, tmp_path):
+    path = tmp_path / "old.db"
+    with sqlite3.connect(path) as conn:
+        conn.executescript(
+            """
+            CREATE TABLE tickets (
+                id INTEGER PRIMARY KEY, ticket_id VARCHAR(256) UNIQUE NOT NULL,
+                conversation TEXT NOT NULL, historical_data TEXT, ticket_metadata TEXT,
+                summary TEXT, routing TEXT, recommendations TEXT, estimation TEXT,
+                final_insights TEXT, status VARCHAR(50), created_at DATETIME, updated_at DATETIME
+            );
+            CREATE TABLE job_status (
+                id INTEGER PRIMARY KEY, job_id VARCHAR(256) UNIQUE NOT NULL,
+                status VARCHAR(50), created_at DATETIME, updated_at DATETIME
+            );
+            """
+        )
+        conn.executemany(
+            "INSERT INTO tickets (ticket_id, conversation, ticket_metadata, status) VALUES (?, ?, ?, 'pending')",
+            [
+                ("t1", "hello", json.dumps({"job_id": "job-a"})),
+                ("t2", "hello", json.dumps({"tier": "basic"})),
+                ("t3", "hello", None),
+                ("t4", "hello", json.dumps({"job_id": "job-a"})),
+            ],
+        )
+        conn.execute("INSERT INTO job_status (job_id, status) VALUES ('job-a', 'processing')")
+
+    database = load_database(path)
+
+    assert [ticket["ticket_id"] for ticket in database.get_job_tickets("job-a")] == ["t1", "t4"]
+    assert database.get_job("job-a")["kind"] == "ticket"
+    indexes = {index["name"] for index in database.inspect(database.engine).get_indexes("tickets")}
+    assert {"ix_tickets_job_id", "ix_tickets_team_priority", "ix_tickets_urgency"} <= indexes
+
+    # Generated columns also cover rows written before the migration
+    with sqlite3.connect(path) as conn:
+        conn.execute("""UPDATE tickets SET routing = '{"team": "Billing", "priority": "High"}' WHERE ticket_id = 't2'""")
+    assert [ticket["ticket_id"] for ticket in database.query_tickets(team="billing")] == ["t2"]
+
+
+def test_batch_job_tickets_statuses_and_timing(load_database, tmp_path):
+    database = load_database(tmp_path / "new.db")
+    tickets = [{"ticket_id": f"b{n}", "conversation": "hi", "metadata": {"n": n}} for n in range(3)]
+
+    job_id = database.create_batch_job(tickets)
+    database.update_tickets_results([
+        {"ticket_id": "b0", "summary": {"summary": "ok"}},
+        {"ticket_id": "b1", "error": "model unavailable"},
+    ])
+    database.mark_job_started(job_id)
+
+    assert database.get_job_ticket_statuses(job_id) == {"completed": 1, "failed": 1, "pending": 1}
+    assert [ticket["status"] for ticket in database.get_job_tickets(job_id)] == ["completed", "failed", "pending"]
+    assert database.get_ticket("b2")["job_id"] == job_id
+    assert database.get_ticket("b2")["metadata"] == {"n": 2}
+    assert database.get_ticket_statuses(["b0", "b2", "b9"]) == {"b0": "completed", "b2": "pending"}
+
+    database.fail_pending_tickets(["b0", "b2"])
+    assert database.get_ticket_statuses(["b0", "b2"]) == {"b0": "completed", "b2": "failed"}
+
+    job = database.get_job(job_id)
+    assert (job["kind"], job["ticket_count"], job["completed_at"]) == ("batch", 3, None)
+    assert job["started_at"] is not None
+
+    database.update_job_status(job_id, "completed")
+    assert database.get_job(job_id)["completed_at"] is not None
+    assert database.get_job_tickets("job-unknown") == []
+
+
+def test_stage_checkpoints_are_exposed_and_resumable(load_database, tmp_path):
+    database = load_database(tmp_path / "stages.db")
+    database.create_job("job-1")
+    database.save_ticket({"ticket_id": "s1", "conversation": "hi"}, job_id="job-1")
+
+    database.save_ticket_stage("s1", "summary", {"summary": "ok"})
+    database.save_ticket_stage("s1", "routing", {"error": "Router failed: timeout"})
+    database.save_ticket_stage("s1", "final_insights", "Next steps")
+
+    assert database.get_ticket_stages("s1") == {"summary": {"summary": "ok"}, "final_insights": "Next steps"}
+    ticket = database.get_ticket("s1")
+    assert ticket["summary"] == {"summary": "ok"}
+    assert ticket["completed_stages"] == ["summary", "final_insights"]
+    assert ticket["status"] == "pending"
+    with pytest.raises(ValueError):
+        database.save_ticket_stage("s1", "status", "completed")
+
+    database.update_ticket_results("s1", {"summary": {"summary": "ok"}, "error": "Stages failed: routing"})
+    assert database.get_ticket("s1")["status"] == "failed"
+    database.create_job("job-2")
+    database.assign_ticket_job("s1", "job-2")
+    assert database.get_ticket("s1")["status"] == "pending"
+    assert [ticket["ticket_id"] for ticket in database.get_job_tickets("job-2")] == ["s1"]
+
+
+def test_tickets_are_queried_through_generated_columns(load_database, tmp_path):
+    database = load_database(tmp_path / "results.db")
+    database.create_job("job-1")
+    results = {
+        "r1": {"routing": {"team": "Billing", "priority": "high", "escalation_needed": True},
+               "summary": {"urgency": "high", "sentiment": "negative"}},
+        "r2": {"routing": {"team": "billing", "priority": "low", "escalation_needed": False}},
+        "r3": {"routing": {"team": "Technical", "priority": "HIGH"}, "error": "Stages failed: summary"},
+    }
+    for ticket_id, result in results.items():
+        database.save_ticket({"ticket_id": ticket_id, "conversation": "hi"}, job_id="job-1")
+        database.update_ticket_results(ticket_id, result)
+    database.save_ticket({"ticket_id": "r4", "conversation": "hi"}, job_id="job-1")
+
+    assert [t["ticket_id"] for t in database.query_tickets(team="BILLING", priority="high")] == ["r1"]
+    assert [t["ticket_id"] for t in database.query_tickets(priority=["high", "critical"])] == ["r3", "r1"]
+    assert database.query_tickets(escalation_needed=True)[0]["escalation_needed"] is True
+    assert [t["ticket_id"] for t in database.query_tickets(status="pending")] == ["r4"]
+    assert database.count_tickets(["team", "priority"], status=["completed", "failed"]) == [
+        {"team": "billing", "priority": "high", "count": 1},
+        {"team": "billing", "priority": "low", "count": 1},
+        {"team": "technical", "priority": "high", "count": 1},
+    ]
+    with pytest.raises(ValueError):
+        database.query_tickets(colour="red")
+
+    with database.engine.connect() as connection:
+        plan = connection.exec_driver_sql(
+            "EXPLAIN QUERY PLAN SELECT ticket_id FROM tickets WHERE routing_team = 'billing' AND routing_priority = 'high'"
+        ).fetchall()
+    assert "ix_tickets_team_priority" in str(plan)
+
+
+def test_ticket_listing_pages_by_keyset(load_database, tmp_path):
+    database = load_database(tmp_path / "listing.db")
+    database.create_job("job-1")
+    for n in range(7):
+        database.save_ticket({"ticket_id": f"l{n}", "conversation": "long text"}, job_id="job-1")
+    database.update_ticket_results("l2", {"routing": {"team": "Billing", "priority": "high"}})
+    # Ties on created_at are broken by id
+    with database.engine.begin() as connection:
+        connection.exec_driver_sql(
+            "UPDATE tickets SET created_at = '2026-01-01 00:00:00.000000' WHERE ticket_id IN ('l3', 'l4', 'l5')"
+        )
+
+    seen, cursor = [], None
+    while True:
+        page, cursor = database.list_tickets(limit=3, cursor=cursor)
+        seen += [ticket["ticket_id"] for ticket in page]
+        assert all("conversation" not in ticket for ticket in page)
+        if cursor is None:
+            break
+    assert seen == ["l6", "l2", "l1", "l0", "l5", "l4", "l3"]
+    assert [ticket["ticket_id"] for ticket in database.iter_tickets(batch_size=2)] == seen
+
+    page, _ = database.list_tickets(fields=["ticket_id", "conversation", "routing"], team="billing")
+    assert page == [{"ticket_id": "l2", "conversation": "long text", "routing": {"team": "Billing", "priority": "high"}}]
+    old = database.iter_tickets(fields=["ticket_id"], created_before=database.datetime(2026, 6, 1))
+    assert [ticket["ticket_id"] for ticket in old] == ["l5", "l4", "l3"]
+    with pytest.raises(ValueError):
+        database.list_tickets(cursor="not-a-cursor")
+    with pytest.raises(ValueError):
+        database.iter_tickets(fields=["password"])
@@ -0,0 +1,81 @@
+import sys
+import asyncio
+import threading
+from pathlib import Path
+
+# Add the project root to sys.path
+root_dir = Path(__file__).parent.parent
+sys.path.append(str(root_dir))
+
+from src.utils.events import EventHub, ticket_topic, job_topic
+
+
+def test_late_subscriber_replays_history():
+    """Test that a subscriber attaching mid-pipeline still sees earlier events."""
+    hub = EventHub()
+    topic = ticket_topic("test-001")
+
+    async def main():
+        hub.publish(topic, {"type": "agent_result", "agent": "summary"})
+        subscription = hub.subscribe(topic)
+        hub.publish(topic, {"type": "final_token", "text": "Hello"})
+        hub.close(topic)
+        return [event async for event in subscription]
+
+    events = asyncio.run(main())
+    assert [event["type"] for event in events] == ["agent_result", "final_token"]
+    assert not hub.is_active(topic)
+
+
+def test_publish_from_worker_thread():
+    """Test that events published from another thread reach the subscriber."""
+    hub = EventHub()
+    topic = ticket_topic("test-002")
+
+    def publisher():
+        for i in range(3):
+            hub.publish(topic, {"type": "final_token", "text": str(i)})
+        hub.close(topic)
+
+    async def main():
+        subscription = hub.subscribe(topic)
+        thread = threading.Thread(target=publisher)
+        thread.start()
+        events = [event async for event in subscription]
+        thread.join()
+        return events
+
+    events = asyncio.run(main())
+    assert "".join(event["text"] for event in events) == "012"
+
+
+def test_get_times_out_on_idle_topic():
+    """Test that get returns None without closing the subscription on timeout."""
+    hub = EventHub()
+
+    async def main():
+        subscription = hub.subscribe(ticket_topic("test-003"))
+        event = await subscription.get(timeout=0.01)
+        return event, subscription.closed
+
+    assert asyncio.run(main()) == (None, False)
+
+
+def test_subscribe_without_replay_only_sees_new_events():
+    """Test that a long-poll style subscriber skips the topic's history."""
+    hub = EventHub()
+    topic = job_topic("job-001")
+
+    async def main():
+        hub.publish(topic, {"type": "stage_completed", "stage": "summary"})
+        subscription = hub.subscribe(topic, replay=False)
+        assert await subscription.get(timeout=0.01) is None
+        hub.publish(topic, {"type": "job_completed", "status": "completed"})
+        event = await subscription.get(timeout=1)
+        hub.close(topic)
+        late = hub.subscribe(topic, replay=False)
+        return event, await late.get(timeout=1), late.closed
+
+    event, late_event, late_closed = asyncio.run(main())
+    assert event["type"] == "job_completed"
+    assert late_event is None and late_closed
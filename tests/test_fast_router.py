@@ -0,0 +1,75 @@
+import sys
+import random
+from pathlib import Path
+
+# Add the project root to sys.path
+root_dir = Path(__file__).parent.parent
+sys.path.append(str(root_dir))
+
+from src.utils.fast_router import FastRouter, RoutingClassifier, routing_labels
+
+ISSUES = {
+    "Technical Support": ("the app crashes with an error", "the server returns error 500", "sync fails after the update"),
+    "Billing": ("I was charged twice on my invoice", "please refund my subscription payment", "my credit card was billed"),
+    "Security": ("someone logged into my account", "I need to reset two factor authentication", "suspicious password reset email"),
+}
+PRIORITY = {"Technical Support": "high", "Billing": "medium", "Security": "critical"}
+
+
+def routed_tickets(count, seed=0):
+    rng = random.Random(seed)
+    tickets = []
+    for n in range(count):
+        team = rng.choice(sorted(ISSUES))
+        conversation = f"Customer: Hello, {rng.choice(ISSUES[team])}. Ticket {n}, can you help? Agent: Looking into it."
+        routing = {
+            "team": team,
+            "priority": PRIORITY[team],
+            "escalation_needed": team == "Security",
+            "skills_required": [team.lower(), "communication"],
+        }
+        tickets.append((conversation, routing))
+    return tickets
+
+
+def test_routing_labels_normalize_and_skip_unusable_results():
+    assert routing_labels({"team": "billing ", "priority": "High", "escalation_needed": "false"}) == {
+        "team": "Billing", "priority": "high", "escalation_needed": False, "skills_required": []
+    }
+    assert routing_labels({"team": "Legal", "priority": "high", "escalation_needed": False}) is None
+    assert routing_labels({"error": "Failed to route ticket", "team": "unassigned"}) is None
+    assert routing_labels({"team": "Billing", "priority": "low", "escalation_needed": False,
+                           "routed_by": "classifier"}) is None
+
+
+def test_classifier_predicts_routing_with_confidence():
+    tickets = routed_tickets(300)
+    classifier = RoutingClassifier.train([c for c, _ in tickets], [routing_labels(r) for _, r in tickets])
+
+    routing, confidence = classifier.predict("Customer: I was charged twice on my invoice this month")
+    assert routing["team"] == "Billing" and routing["priority"] == "medium"
+    assert routing["escalation_needed"] is False
+    assert routing["skills_required"] == ["billing", "communication"]
+    assert confidence > 0.8
+    _, unsure = classifier.predict("Customer: the weather is nice today")
+    assert unsure < confidence
+
+
+def test_router_trains_from_stored_results_and_defers_when_unsure(load_database, tmp_path):
+    database = load_database(tmp_path / "routing.db")
+    database.create_job("job-1")
+    for n, (conversation, routing) in enumerate(routed_tickets(120)):
+        database.save_ticket({"ticket_id": f"t{n}", "conversation": conversation}, job_id="job-1")
+        database.update_ticket_results(f"t{n}", {"routing": routing})
+
+    router = FastRouter(min_confidence=0.8, min_training_tickets=200)
+    assert not router.train()
+    assert router.route("Customer: the app crashes with an error") is None
+
+    router.min_training_tickets = 100
+    assert router.train()
+    result = router.route("Customer: someone logged into my account, I need to reset two factor authentication")
+    assert result["team"] == "Security" and result["escalation_needed"] is True
+    assert result["routed_by"] == "classifier" and result["confidence"] >= 0.8
+    assert router.route("Customer: the weather is nice today") is None
+    assert router.stats() == {"trained_on": 120, "routed": 1, "deferred": 1}
@@ -0,0 +1,39 @@
+import sys
+import json
+from pathlib import Path
+
+# Add the project root to sys.path
+root_dir = Path(__file__).parent.parent
+sys.path.append(str(root_dir))
+
+from src.agents.fused_agent import FusedAnalysisAgent
+
+
+def test_split_fused_result():
+    """Test that one fused JSON document splits into the staged result structure."""
+    agent = FusedAnalysisAgent()
+    output = "```json\n" + json.dumps({
+        "summary": {"summary": "Admin locked out after update", "urgency": "high"},
+        "routing": {"team": "Technical Support", "priority": "high", "escalation_needed": True},
+        "recommendations": {"recommended_solutions": ["Roll back the permission change"]},
+        "estimation": {"estimated_time": "2 hours"},
+        "final_insights": "Restore admin access before the afternoon meeting.",
+    }) + "\n```\nLet me know if you need anything else!"
+
+    result = agent._parse_output(output)
+
+    assert result["summary"]["summary"] == "Admin locked out after update"
+    assert result["summary"]["key_points"] == []
+    assert result["routing"]["team"] == "Technical Support"
+    assert result["recommendations"]["confidence_score"] == 0.0
+    assert result["estimation"]["estimated_time"] == "2 hours"
+    assert result["final_insights"].startswith("Restore admin access")
+
+
+def test_split_unparseable_result():
+    """Test that a broken fused output still yields every section with defaults."""
+    result = FusedAnalysisAgent()._parse_output("Sorry, I cannot help with that.")
+
+    assert set(result) == {"summary", "routing", "recommendations", "estimation", "final_insights"}
+    assert result["routing"]["skills_required"] == []
+    assert result["final_insights"] == ""
@@ -0,0 +1,79 @@
+import sys
+import sqlite3
+import threading
+from pathlib import Path
+
+import pytest
+
+# Add the project root to sys.path
+root_dir = Path(__file__).parent.parent
+sys.path.append(str(root_dir))
+
+from config.config import DB_CONFIG
+from src.utils.group_commit import GroupCommitWriter
+
+
+def test_connections_use_tuning_profile(load_database, tmp_path):
+    database = load_database(tmp_path / "tuned.db")
+    with database.engine.connect() as connection:
+        pragma = lambda name: connection.exec_driver_sql(f"PRAGMA {name}").scalar()
+        assert pragma("journal_mode") == "wal"
+        assert pragma("synchronous") == 1  # NORMAL
+        assert pragma("busy_timeout") == DB_CONFIG["busy_timeout_ms"]
+
+
+def test_concurrent_writes_share_transactions(load_database, tmp_path):
+    database = load_database(tmp_path / "group.db")
+    for n in range(40):
+        database.create_job(f"job-{n}")
+    database.writer.linger = 0.02
+
+    threads = [
+        threading.Thread(target=database.update_job_status, args=(f"job-{n}", "completed"))
+        for n in range(40)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    # Every write is visible once its call returned
+    assert all(database.get_job(f"job-{n}")["status"] == "completed" for n in range(40))
+    stats = database.writer.stats()
+    assert stats["writes"] == 40
+    assert stats["transactions"] < 40
+
+
+def test_failing_write_only_fails_its_caller(load_database, tmp_path):
+    database = load_database(tmp_path / "isolated.db")
+    database.create_job("job-ok")
+    writer = GroupCommitWriter(database.Session, linger=0.05)
+
+    def bad(session):
+        raise sqlite3.IntegrityError("constraint failed")
+
+    good = writer.submit(lambda session: session.query(database.JobStatus).filter(
+        database.JobStatus.job_id == "job-ok"
+    ).update({database.JobStatus.status: "completed"}, synchronize_session=False))
+    failed = writer.submit(bad)
+
+    good.result(timeout=5)
+    with pytest.raises(sqlite3.IntegrityError):
+        failed.result(timeout=5)
+    assert database.get_job("job-ok")["status"] == "completed"
+
+
+def test_stop_commits_queued_writes_and_ends_the_thread(load_database, tmp_path):
+    database = load_database(tmp_path / "stopped.db")
+    database.create_job("job-1")
+    writer = GroupCommitWriter(database.Session, linger=0.05)
+
+    pending = writer.submit(lambda session: session.query(database.JobStatus).filter(
+        database.JobStatus.job_id == "job-1"
+    ).update({database.JobStatus.status: "completed"}, synchronize_session=False))
+    thread = writer._thread
+    writer.stop(timeout=5)
+
+    assert pending.done() and pending.exception() is None
+    assert not thread.is_alive()
+    assert database.get_job("job-1")["status"] == "completed"
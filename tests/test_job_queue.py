@@ -0,0 +1,95 @@
+import sys
+import time
+import threading
+from pathlib import Path
+
+import pytest
+
+# Add the project root to sys.path
+root_dir = Path(__file__).parent.parent
+sys.path.append(str(root_dir))
+
+from src.utils.job_queue import JobQueue, QueueFullError, WorkerPool
+
+
+@pytest.fixture
+def queue(tmp_path):
+    return JobQueue(str(tmp_path / "queue.db"), max_depth=3, lease_seconds=60, max_attempts=2)
+
+
+def test_jobs_are_claimed_in_order_and_completed(queue):
+    queue.enqueue("job-1", "ticket", [{"n": 1}, {"n": 2}])
+
+    first = queue.claim("w")
+    second = queue.claim("w")
+    assert (first.job_id, first.kind, first.payload, first.attempts) == ("job-1", "ticket", {"n": 1}, 1)
+    assert second.payload == {"n": 2}
+    assert queue.claim("w") is None
+
+    queue.complete(first)
+    assert queue.job_progress("job-1") == {"done": 1, "running": 1}
+    assert queue.depth() == 1
+
+
+def test_enqueue_beyond_max_depth_is_rejected_atomically(queue):
+    queue.enqueue("job-1", "ticket", [{}, {}])
+    with pytest.raises(QueueFullError):
+        queue.enqueue("job-2", "batch_chunk", [{}, {}])
+    assert queue.depth() == 2
+    assert queue.job_progress("job-2") == {}
+
+
+def test_failed_job_is_retried_until_attempts_run_out(queue):
+    queue.enqueue("job-1", "ticket", [{}])
+
+    assert queue.fail(queue.claim("w"), "boom") is True
+    job = queue.claim("w")
+    assert job.attempts == 2
+    assert queue.fail(job, "boom again") is False
+    assert queue.claim("w") is None
+    assert queue.stats()["failed"] == 1
+
+
+def test_running_jobs_survive_a_restart(tmp_path):
+    path = str(tmp_path / "queue.db")
+    crashed = JobQueue(path)
+    crashed.enqueue("job-1", "ticket", [{"n": 1}])
+    assert crashed.claim("w") is not None
+
+    restarted = JobQueue(path)
+    assert restarted.claim("w") is None
+    assert restarted.recover() == 1
+    assert restarted.claim("w").payload == {"n": 1}
+
+
+def test_expired_lease_is_handed_out_again(tmp_path):
+    queue = JobQueue(str(tmp_path / "queue.db"), lease_seconds=0.01)
+    queue.enqueue("job-1", "ticket", [{}])
+    queue.claim("hung")
+    time.sleep(0.05)
+    job = queue.claim("other")
+    assert job is not None and job.attempts == 2
+
+
+def test_worker_pool_runs_handlers(tmp_path):
+    queue = JobQueue(str(tmp_path / "queue.db"), max_attempts=1)
+    seen = []
+    lock = threading.Lock()
+
+    def handle(job):
+        if job.payload.get("fail"):
+            raise RuntimeError("bad ticket")
+        with lock:
+            seen.append(job.payload["n"])
+
+    queue.enqueue("job-1", "ticket", [{"n": n} for n in range(5)] + [{"fail": True}])
+    pool = WorkerPool(queue, {"ticket": handle}, workers=3, poll_interval=0.01)
+    pool.start()
+    deadline = time.time() + 5
+    while queue.depth() and time.time() < deadline:
+        time.sleep(0.01)
+    pool.stop()
+
+    assert sorted(seen) == list(range(5))
+    assert queue.stats()["done"] == 5
+    assert queue.stats()["failed"] == 1
@@ -0,0 +1,71 @@
+import sys
+from pathlib import Path
+
+# Add the project root to sys.path
+root_dir = Path(__file__).parent.parent
+sys.path.append(str(root_dir))
+
+from src.utils.json_stream import JSONStreamExtractor, extract_first_json_object
+
+
+def test_object_split_across_chunks():
+    """Test that an object spread over many tokens is detected when it closes."""
+    extractor = JSONStreamExtractor()
+    chunks = ["Here's the JSON:\n```json\n{\"a\": ", "{\"b\": \"}\"}", ", \"c\": [1, 2]", "}\n```", " more chatter"]
+
+    closed_at = None
+    for index, chunk in enumerate(chunks):
+        if extractor.feed(chunk):
+            closed_at = index
+            break
+
+    assert closed_at == 3
+    assert extractor.result() == {"a": {"b": "}"}, "c": [1, 2]}
+
+
+def test_stops_consuming_after_first_object():
+    """Test that chunks after the first object are never pulled from the stream."""
+    consumed = []
+
+    def stream():
+        for chunk in ['{"key1": "value1"}', ' {"other": 1}', " trailing"]:
+            consumed.append(chunk)
+            yield chunk
+
+    assert extract_first_json_object(stream()) == {"key1": "value1"}
+    assert len(consumed) == 1
+
+
+def test_repairs_single_quotes_and_trailing_commas():
+    """Test the repair pass for almost-JSON model output."""
+    text = "{\n 'key1': 'value1',\n 'key2': [1, 2, 3,],\n}"
+    assert extract_first_json_object([text]) == {"key1": "value1", "key2": [1, 2, 3]}
+
+
+def test_incomplete_object():
+    """Test that a truncated object yields an empty result."""
+    extractor = JSONStreamExtractor()
+    assert not extractor.feed('{"summary": "cut off')
+    assert not extractor.complete
+    assert extractor.result() == {}
+
+
+def test_skips_stray_braces_in_prose():
+    """Test that a balanced "{...}" that is not JSON does not end the scan."""
+    extractor = JSONStreamExtractor()
+    assert not extractor.feed("Fill in the {placeholder} fields:\n")
+    assert extractor.feed('{"team": "Billing", "note": "{x}"}')
+    assert extractor.result() == {"team": "Billing", "note": "{x}"}
+
+
+def test_apostrophes_are_not_string_delimiters():
+    """Test that an apostrophe in the prose does not hide the object's braces."""
+    extractor = JSONStreamExtractor()
+    assert not extractor.feed("Here's the customer's ticket analysis: ")
+    assert extractor.feed('{"summary": "It\'s about the customer\'s refund"}')
+    assert extractor.result() == {"summary": "It's about the customer's refund"}
+
+
+def test_rescans_inside_rejected_candidate():
+    """Test that an object nested in an unbalanced prose brace is still found."""
+    assert extract_first_json_object(['Note {see below: {"a": 1} and done}']) == {"a": 1}
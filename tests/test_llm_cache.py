@@ -0,0 +1,103 @@
+import sys
+import asyncio
+import time
+from pathlib import Path
+
+# Add the project root to sys.path
+root_dir = Path(__file__).parent.parent
+sys.path.append(str(root_dir))
+
+from langchain.prompts import PromptTemplate
+from langchain_core.language_models import FakeListLLM
+
+from src.agents.base_agent import ChainWrapper
+from src.utils.llm_cache import LLMResponseCache
+
+
+def test_memory_tier_lru_eviction():
+    """Test that the memory tier evicts the least recently used entry."""
+    cache = LLMResponseCache(max_memory_entries=2)
+    cache.set("a", "1")
+    cache.set("b", "2")
+    assert cache.get("a") == "1"  # "a" is now the most recently used
+    cache.set("c", "3")
+
+    assert cache.get("b") is None
+    assert cache.get("a") == "1"
+    assert cache.get("c") == "3"
+    assert cache.stats()["memory_hits"] == 3
+    assert cache.stats()["misses"] == 1
+
+
+def test_ttl_expiry():
+    """Test that expired entries are treated as misses."""
+    cache = LLMResponseCache(ttl_seconds=1)
+    cache.set("key", "value")
+    cache._memory["key"] = ("value", time.time() - 5)
+
+    assert cache.get("key") is None
+
+
+def test_disk_tier_survives_restart(tmp_path):
+    """Test that entries written to SQLite are served by a new cache instance."""
+    db_path = str(tmp_path / "cache.db")
+    key = LLMResponseCache.make_key("prompt", model="llama3", temperature=0.7)
+    LLMResponseCache(sqlite_path=db_path).set(key, "completion")
+
+    reopened = LLMResponseCache(sqlite_path=db_path)
+    assert reopened.get(key) == "completion"
+    assert reopened.stats()["disk_hits"] == 1
+    # The disk hit is promoted to the memory tier
+    assert reopened.get(key) == "completion"
+    assert reopened.stats()["memory_hits"] == 1
+
+
+def test_disk_tier_size_eviction(tmp_path):
+    """Test that the disk tier is trimmed to its maximum number of rows."""
+    cache = LLMResponseCache(sqlite_path=str(tmp_path / "cache.db"), max_disk_entries=3)
+    for i in range(10):
+        cache.set(f"key-{i}", str(i))
+
+    assert cache.stats()["disk_entries"] == 3
+
+
+def test_key_depends_on_model_and_temperature():
+    """Test that the key changes with the model and the temperature."""
+    base = LLMResponseCache.make_key("prompt", model="llama3", temperature=0.7)
+    assert base == LLMResponseCache.make_key("prompt", model="llama3", temperature=0.7)
+    assert base != LLMResponseCache.make_key("prompt", model="mistral", temperature=0.7)
+    assert base != LLMResponseCache.make_key("prompt", model="llama3", temperature=0.0)
+
+
+def test_chain_wrapper_serves_repeats_from_cache():
+    """Test that an identical rendered prompt only reaches the LLM once."""
+    prompt = PromptTemplate.from_template("Summarize: {conversation}")
+    llm = FakeListLLM(responses=["first", "second"])
+    chain = ChainWrapper(prompt, llm, cache=LLMResponseCache())
+
+    assert chain.run({"conversation": "hello"}) == "first"
+    assert chain.run({"conversation": "hello"}) == "first"
+    assert chain.run({"conversation": "other"}) == "second"
+    assert chain.cache.stats()["memory_hits"] == 1
+
+
+def test_chain_wrapper_arun_shares_cache_with_run():
+    """Test that the async path reads and writes the same cache entries."""
+    prompt = PromptTemplate.from_template("Route: {ticket_content}")
+    llm = FakeListLLM(responses=["async", "sync"])
+    chain = ChainWrapper(prompt, llm, cache=LLMResponseCache())
+
+    assert asyncio.run(chain.arun({"ticket_content": "refund"})) == "async"
+    assert chain.run({"ticket_content": "refund"}) == "async"
+
+
+def test_chain_wrapper_run_json_does_not_serve_run():
+    """Test that a completion cut off after its JSON object is not returned by run."""
+    prompt = PromptTemplate.from_template("Route: {ticket_content}")
+    llm = FakeListLLM(responses=['{"team": "Billing"} and some chatter', '{"team": "Billing"} and some chatter'])
+    chain = ChainWrapper(prompt, llm, cache=LLMResponseCache())
+
+    assert chain.run_json({"ticket_content": "refund"}) == '{"team": "Billing"}'
+    assert chain.run({"ticket_content": "refund"}) == '{"team": "Billing"} and some chatter'
+    assert chain.run_json({"ticket_content": "refund"}) == '{"team": "Billing"}'
+    assert chain.cache.stats()["memory_hits"] == 1
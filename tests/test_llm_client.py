@@ -0,0 +1,92 @@
+import sys
+import time
+import asyncio
+import threading
+from pathlib import Path
+
+# Add the project root to sys.path
+root_dir = Path(__file__).parent.parent
+sys.path.append(str(root_dir))
+
+from src.agents.summarizer_agent import SummarizerAgent
+from src.agents.router_agent import RouterAgent
+from src.utils.llm_client import LLMClientRegistry, LLMConcurrencyLimiter
+
+
+def test_registry_shares_clients_per_config():
+    """Test that identical configurations resolve to one client instance."""
+    registry = LLMClientRegistry()
+    first = registry.get(model="llama3", base_url="http://ollama:11434", temperature=0.7)
+    second = registry.get(model="llama3", base_url="http://ollama:11434", temperature=0.7)
+    other = registry.get(model="llama3", base_url="http://other:11434", temperature=0.7)
+
+    assert first is second
+    assert first is not other
+    assert registry.stats()["clients"] == 2
+
+
+def test_agents_share_one_client():
+    """Test that agents built from the same LLM_CONFIG share their client."""
+    assert SummarizerAgent().llm is RouterAgent().llm
+
+
+def test_limiter_bounds_threads():
+    """Test that blocking callers never exceed the concurrency limit."""
+    limiter = LLMConcurrencyLimiter(max_concurrency=2)
+
+    def call():
+        with limiter.slot():
+            time.sleep(0.02)
+
+    threads = [threading.Thread(target=call) for _ in range(6)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert limiter.peak_in_flight == 2
+    assert limiter.in_flight == 0
+
+
+def test_limiter_bounds_tasks():
+    """Test that async callers never exceed the concurrency limit."""
+    limiter = LLMConcurrencyLimiter(max_concurrency=3)
+
+    async def call():
+        async with limiter.aslot():
+            await asyncio.sleep(0.02)
+
+    async def main():
+        await asyncio.gather(*(call() for _ in range(10)))
+
+    asyncio.run(main())
+    assert limiter.peak_in_flight == 3
+    assert limiter.in_flight == 0
+
+
+def test_limiter_hands_slots_from_threads_to_tasks():
+    """Test that a slot released by a thread wakes a waiting task and cancelled waiters give theirs back."""
+    limiter = LLMConcurrencyLimiter(max_concurrency=1)
+
+    def hold():
+        with limiter.slot():
+            time.sleep(0.05)
+
+    async def call():
+        async with limiter.aslot():
+            await asyncio.sleep(0.01)
+
+    async def main():
+        thread = threading.Thread(target=hold)
+        thread.start()
+        await asyncio.sleep(0.01)
+        cancelled = asyncio.create_task(call())
+        waiting = asyncio.create_task(call())
+        await asyncio.sleep(0.01)
+        cancelled.cancel()
+        await asyncio.wait_for(waiting, timeout=1)
+        thread.join()
+
+    asyncio.run(main())
+    assert limiter.peak_in_flight == 1
+    assert limiter.in_flight == 0
@@ -0,0 +1,80 @@
+import sys
+from pathlib import Path
+
+# Add the project root to sys.path
+root_dir = Path(__file__).parent.parent
+sys.path.append(str(root_dir))
+
+from src.utils.near_duplicates import MinHasher, MinHashLSH, NearDuplicates, shingles
+
+CONVERSATION = (
+    "Customer: I can't access the admin dashboard since this morning. Every time I log in as "
+    "jane@example.com it says Access Denied, error code 403. I have admin rights and nothing changed "
+    "on our side. Agent: Thanks for reaching out, we are looking into your account permissions."
+)
+
+
+def jaccard(a, b):
+    a, b = shingles(a), shingles(b)
+    return len(a & b) / len(a | b)
+
+
+def test_shingles_mask_details_that_differ_between_copies():
+    copy = CONVERSATION.replace("jane@example.com", "bob@corp.io").replace("403", "401")
+    assert shingles(copy) == shingles(CONVERSATION)
+    assert shingles("Access Denied") == {"access denied"}
+    assert shingles("") == set()
+
+
+def test_minhash_estimates_jaccard_similarity():
+    hasher = MinHasher(num_perm=256)
+    edited = CONVERSATION.replace("since this morning", "since yesterday evening")
+    estimate = (hasher.signature(CONVERSATION) == hasher.signature(edited)).mean()
+    assert abs(estimate - jaccard(CONVERSATION, edited)) < 0.1
+    assert hasher.signature("  ") is None
+
+
+def test_lsh_finds_near_copies_only():
+    hasher = MinHasher()
+    index = MinHashLSH(bands=8)
+    index.add("dashboard", hasher.signature(CONVERSATION))
+    index.add("billing", hasher.signature("Customer: my invoice shows a double charge on my credit card."))
+
+    copy = CONVERSATION.replace("jane@example.com", "sam@example.org").replace("looking into", "checking")
+    similarity, ticket_id = index.query(hasher.signature(copy), threshold=0.8)
+    assert ticket_id == "dashboard" and similarity >= 0.8
+    assert index.query(hasher.signature(copy), threshold=0.8, exclude="dashboard") is None
+    assert index.query(hasher.signature("Customer: the mobile app crashes on startup."), threshold=0.5) is None
+
+    # Re-indexing a ticket replaces its signature
+    index.add("dashboard", hasher.signature("Customer: password reset emails never arrive."))
+    assert index.query(hasher.signature(copy), threshold=0.8) is None
+    assert len(index) == 2
+
+
+def test_near_copies_reuse_stored_results(load_database, tmp_path):
+    database = load_database(tmp_path / "duplicates.db")
+    database.create_job("job-1")
+    results = {
+        "summary": {"summary": "Admin dashboard access denied"},
+        "routing": {"team": "Security"},
+        "recommendations": {"recommended_solutions": ["Restore the admin role"]},
+        "estimation": {"estimated_time": "2 hours"},
+        "final_insights": "Restore the admin role.",
+    }
+    database.save_ticket({"ticket_id": "original", "conversation": CONVERSATION}, job_id="job-1")
+    database.update_ticket_results("original", results)
+
+    duplicates = NearDuplicates(MinHasher(), MinHashLSH(), threshold=0.8)
+    copy = CONVERSATION.replace("jane@example.com", "ops@example.net")
+    reused = duplicates.stored_results(copy, exclude="copy")
+    assert reused["routing"] == {"team": "Security"}
+    assert reused["final_insights"] == "Restore the admin role."
+    assert reused["duplicate_of"] == {"ticket_id": "original", "similarity": 1.0}
+    assert duplicates.stored_results(CONVERSATION, exclude="original") is None
+
+    # The provenance is stored with the duplicate's results
+    database.save_ticket({"ticket_id": "copy", "conversation": copy}, job_id="job-1")
+    database.update_ticket_results("copy", reused)
+    assert database.get_ticket("copy")["duplicate_of"] == "original"
+    assert database.get_ticket("original")["duplicate_of"] is None
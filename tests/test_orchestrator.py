@@ -64,7 +64,27 @@ def test_process_ticket(orchestrator):
     print("\nFinal Insights:", result["final_insights"])
 
 
+def test_fast_router_classifies_the_raw_conversation(orchestrator, monkeypatch):
+    """Test that the classifier sees the conversation it was trained on when the prompt is condensed."""
+    seen = []
+
+    class Router:
+        def route(self, conversation):
+            seen.append(conversation)
+            return None
+
+    monkeypatch.setattr(orchestrator.budget, "max_prompt_tokens", 10)
+    monkeypatch.setattr(orchestrator.router, "fast_router", Router())
+    conversation = "Customer: " + "my invoice shows the wrong amount. " * 200
+    context = {"ticket_data": {"conversation": conversation}, "usage": {}}
+    routing_input = orchestrator._routing_input(context, {"summary": {"summary": "Wrong invoice amount"}})
+
+    assert routing_input["ticket_content"] != conversation
+    assert orchestrator.router._fast_route(routing_input) is None
+    assert seen == [conversation]
+
+
 if __name__ == "__main__":
     # Run the test directly
     orchestrator = Orchestrator()
-    test_process_ticket(orchestrator) 
\ No newline at end of file
+    test_process_ticket(orchestrator) 
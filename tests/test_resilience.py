@@ -0,0 +1,129 @@
+import sys
+import time
+import asyncio
+import threading
+from pathlib import Path
+
+import pytest
+
+# Add the project root to sys.path
+root_dir = Path(__file__).parent.parent
+sys.path.append(str(root_dir))
+
+from src.utils.resilience import (
+    CircuitBreaker, CircuitOpenError, LatencyTracker, LLMTimeoutError, TicketDeadlineExceeded,
+    call_deadline, check_deadline, ticket_deadline, run_hedged, arun_hedged
+)
+
+
+def test_breaker_opens_and_recovers_through_trial_call():
+    breaker = CircuitBreaker("http://ollama", failure_threshold=2, reset_seconds=0.05)
+    breaker.record_failure()
+    breaker.check()
+    breaker.record_failure()
+    assert breaker.state == "open"
+    with pytest.raises(CircuitOpenError):
+        breaker.check()
+
+    time.sleep(0.06)
+    breaker.check()
+    # Only one trial call while half-open
+    assert not breaker.allow()
+    breaker.record_failure()
+    assert breaker.state == "open"
+
+    time.sleep(0.06)
+    breaker.check()
+    breaker.record_success()
+    assert breaker.stats() == {"state": "closed", "consecutive_failures": 0, "rejected": 2}
+
+
+def test_latency_percentile_needs_samples():
+    tracker = LatencyTracker()
+    for seconds in range(1, 101):
+        tracker.record(seconds / 100)
+    assert tracker.percentile(95) == pytest.approx(0.95, abs=0.011)
+    assert LatencyTracker().percentile(95) is None
+
+
+def test_ticket_deadline_caps_call_deadline():
+    with ticket_deadline(0.5):
+        assert call_deadline(10) - time.monotonic() <= 0.5
+        assert call_deadline(0.1) - time.monotonic() <= 0.1
+    assert call_deadline(None) is None
+    with ticket_deadline(0.01):
+        time.sleep(0.02)
+        with pytest.raises(TicketDeadlineExceeded):
+            call_deadline(10)
+
+
+def test_deadline_errors_tell_the_ticket_budget_from_the_call_timeout():
+    deadline = call_deadline(0.01)
+    time.sleep(0.02)
+    with pytest.raises(LLMTimeoutError) as raised:
+        check_deadline(deadline)
+    assert not isinstance(raised.value, TicketDeadlineExceeded)
+    with ticket_deadline(0.01):
+        deadline = call_deadline(10)
+        time.sleep(0.02)
+        with pytest.raises(TicketDeadlineExceeded):
+            check_deadline(deadline)
+
+
+def test_hedge_wins_over_slow_primary():
+    cancelled = threading.Event()
+
+    def primary(cancel):
+        cancel.wait(1)
+        cancelled.set()
+        return "primary"
+
+    start = time.monotonic()
+    assert run_hedged([primary, lambda cancel: "hedge"], hedge_delay=0.05) == "hedge"
+    assert time.monotonic() - start < 0.5
+    assert cancelled.wait(1)
+
+
+def test_failed_primary_fails_over_immediately():
+    def primary(cancel):
+        raise CircuitOpenError("open")
+
+    assert run_hedged([primary, lambda cancel: "hedge"], hedge_delay=10) == "hedge"
+    with pytest.raises(CircuitOpenError):
+        run_hedged([primary], hedge_delay=10)
+
+
+def test_hedged_attempts_reuse_pool_threads():
+    threads = set()
+
+    def attempt(cancel):
+        threads.add(threading.get_ident())
+        return "ok"
+
+    for _ in range(50):
+        assert run_hedged([attempt], hedge_delay=10) == "ok"
+    assert threading.get_ident() not in threads
+    assert len(threads) < 50
+
+
+def test_deadline_returns_while_call_hangs():
+    start = time.monotonic()
+    with pytest.raises(LLMTimeoutError):
+        run_hedged([lambda cancel: cancel.wait(5)], hedge_delay=10, deadline=time.monotonic() + 0.05)
+    assert time.monotonic() - start < 1
+
+
+def test_async_hedge_and_deadline():
+    async def slow():
+        await asyncio.sleep(5)
+        return "primary"
+
+    async def fast():
+        return "hedge"
+
+    async def main():
+        assert await arun_hedged([slow, fast], hedge_delay=0.02) == "hedge"
+        with pytest.raises(LLMTimeoutError):
+            await arun_hedged([slow], hedge_delay=10, deadline=time.monotonic() + 0.05)
+
+    asyncio.run(main())
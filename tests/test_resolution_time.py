@@ -0,0 +1,83 @@
+import sys
+import random
+from datetime import datetime, timedelta
+from pathlib import Path
+
+# Add the project root to sys.path
+root_dir = Path(__file__).parent.parent
+sys.path.append(str(root_dir))
+
+from src.utils.resolution_time import ResolutionEstimator, ResolutionTimeModel, format_hours, ticket_codes
+
+# Median hours to resolution by team
+TEAM_HOURS = {"billing": 4.0, "security": 24.0, "product": 72.0}
+
+
+def history(count, seed=0):
+    rng = random.Random(seed)
+    tickets = []
+    for _ in range(count):
+        team = rng.choice(sorted(TEAM_HOURS))
+        tickets.append({
+            "team": team,
+            "priority": rng.choice(["low", "high"]),
+            "urgency": "medium",
+            "sentiment": rng.choice(["negative", "neutral"]),
+            "conversation_chars": rng.randint(200, 2000),
+            # Log-normal around the team's median
+            "hours": TEAM_HOURS[team] * rng.lognormvariate(0, 0.5),
+        })
+    return tickets
+
+
+def test_ticket_codes_treat_unknown_values_alike():
+    assert ticket_codes("Billing", "HIGH", "low", "neutral", 0)[:4] == (1, 2, 0, 1)
+    assert ticket_codes(None, "urgent", "", "angry", 10)[:4] == ticket_codes("Legal", None, None, None, 10)[:4]
+    assert ticket_codes("billing", "low", "low", "neutral", 10 ** 12)[4] == 63
+
+
+def test_model_learns_quantiles_per_team():
+    model = ResolutionTimeModel.train(history(3000))
+    for team, median in TEAM_HOURS.items():
+        hours = model.predict(ticket_codes(team, "low", "medium", "neutral", 800))
+        assert 0.6 * median < hours[0.5] < 1.6 * median
+        # The 90th percentile of a log-normal with sigma 0.5 is about 1.9 times its median
+        assert hours[0.9] > 1.3 * hours[0.5]
+    # Unseen values still get an estimate
+    assert model.predict(ticket_codes("Customer Success", None, None, None, 0))[0.5] > 0
+
+
+def test_format_hours():
+    assert format_hours(0.25) == "15 minutes"
+    assert format_hours(6.54) == "6.5 hours"
+    assert format_hours(72) == "3.0 days"
+
+
+def test_estimator_trains_on_resolved_tickets(load_database, tmp_path):
+    database = load_database(tmp_path / "resolution.db")
+    database.create_job("job-1")
+    for n, ticket in enumerate(history(60)):
+        ticket_id = f"t{n}"
+        database.save_ticket({"ticket_id": ticket_id, "conversation": "x" * ticket["conversation_chars"]}, job_id="job-1")
+        database.update_ticket_results(ticket_id, {
+            "summary": {"urgency": ticket["urgency"], "sentiment": ticket["sentiment"]},
+            "routing": {"team": ticket["team"].title(), "priority": ticket["priority"]},
+        })
+        created_at = database.get_ticket(ticket_id)["created_at"]
+        database.resolve_ticket(ticket_id, datetime.fromisoformat(created_at) + timedelta(hours=ticket["hours"]))
+    database.save_ticket({"ticket_id": "open", "conversation": "still open"}, job_id="job-1")
+
+    stored = database.resolution_history()
+    assert len(stored) == 60
+    assert {ticket["team"] for ticket in stored} == set(TEAM_HOURS)
+
+    estimator = ResolutionEstimator(min_training_tickets=100)
+    assert not estimator.train()
+    assert estimator.estimate({"team": "Billing"}) is None
+
+    estimator.min_training_tickets = 50
+    assert estimator.train()
+    estimate = estimator.estimate({"team": "Security", "priority": "high", "conversation_chars": 900})
+    assert estimate["estimated_by"] == "model"
+    assert 0 < estimate["estimated_hours_p50"] <= estimate["estimated_hours_p90"]
+    assert estimate["confidence_interval"].startswith("90% resolved within")
@@ -0,0 +1,122 @@
+import sys
+import sqlite3
+from collections import Counter
+from pathlib import Path
+
+import pytest
+
+# Add the project root to sys.path
+root_dir = Path(__file__).parent.parent
+sys.path.append(str(root_dir))
+
+from src.utils.scheduler import AdmissionPolicy, LaneScheduler
+from src.utils.job_queue import JobQueue, QueueFullError
+from src.utils.broker import InMemoryBroker
+
+
+WEIGHTS = {"critical": 8, "high": 4, "normal": 2, "bulk": 1}
+
+
+def test_policy_assigns_lanes_and_tenants():
+    policy = AdmissionPolicy(priority_tiers=["enterprise"], tenant_fields=["tenant_id", "company"])
+
+    def ticket(**metadata):
+        return {"ticket_id": "t", "conversation": "", "metadata": metadata}
+
+    assert policy.lane_for(ticket(priority="critical")) == "critical"
+    assert policy.lane_for(ticket(urgency="high")) == "high"
+    assert policy.lane_for(ticket(subscription_tier="Enterprise")) == "high"
+    assert policy.lane_for(ticket(priority="low")) == "bulk"
+    assert policy.lane_for({"ticket_id": "t", "conversation": ""}) == "normal"
+    assert policy.tenant_for(ticket(company="ABC Corp")) == "ABC Corp"
+    assert policy.batch_tenant([ticket(tenant_id="a"), ticket(tenant_id="a")]) == "a"
+    assert policy.batch_tenant([ticket(tenant_id="a"), ticket(tenant_id="b")]) == ""
+
+
+def test_lanes_get_weighted_shares_under_load():
+    scheduler = LaneScheduler(WEIGHTS)
+    shares = Counter()
+    for _ in range(150):
+        lane = scheduler.order()[0]
+        scheduler.dispatched(lane)
+        shares[lane] += 1
+    assert shares == {"critical": 80, "high": 40, "normal": 20, "bulk": 10}
+
+
+def test_idle_lane_does_not_bank_credit():
+    scheduler = LaneScheduler(WEIGHTS)
+    # Only bulk work for a while
+    for _ in range(20):
+        scheduler.dispatched("bulk", skipped=["critical", "high", "normal"])
+
+    # Once every lane is busy, the lanes share by weight again rather than
+    # critical taking 160 jobs in a row on credit from its idle time
+    shares = Counter()
+    for _ in range(20):
+        lane = scheduler.order()[0]
+        scheduler.dispatched(lane)
+        shares[lane] += 1
+    assert shares["bulk"] >= 1
+    assert shares["critical"] <= 12
+
+
+def make_queue(tmp_path, **kwargs):
+    return JobQueue(str(tmp_path / "queue.db"), scheduler=LaneScheduler(WEIGHTS), **kwargs)
+
+
+def test_critical_tickets_overtake_a_bulk_backfill(tmp_path):
+    queue = make_queue(tmp_path)
+    queue.enqueue("batch-1", "batch_chunk", [{"n": n} for n in range(50)], lane="bulk")
+    queue.enqueue("job-1", "ticket", [{"n": "urgent"}], lane="critical")
+
+    first = queue.claim("w")
+    assert (first.job_id, first.lane) == ("job-1", "critical")
+    # The backfill still moves while nothing else is queued
+    assert queue.claim("w").lane == "bulk"
+    assert queue.stats()["lanes"]["bulk"]["queued"] == 49
+
+
+def test_tenant_concurrency_cap(tmp_path):
+    queue = make_queue(tmp_path, tenant_max_concurrency=2)
+    queue.enqueue("job-a", "ticket", [{}, {}, {}], tenant="acme")
+    queue.enqueue("job-b", "ticket", [{}], tenant="globex")
+
+    claimed = [queue.claim("w") for _ in range(4)]
+    assert [job.job_id if job else None for job in claimed] == ["job-a", "job-a", "job-b", None]
+
+    queue.complete(claimed[0])
+    assert queue.claim("w").job_id == "job-a"
+
+
+def test_bulk_jobs_leave_reserved_depth_free(tmp_path):
+    queue = make_queue(tmp_path, max_depth=5, reserved_depth=2)
+    queue.enqueue("batch-1", "batch_chunk", [{}, {}, {}], lane="bulk")
+    with pytest.raises(QueueFullError):
+        queue.enqueue("batch-2", "batch_chunk", [{}], lane="bulk")
+    queue.enqueue("job-1", "ticket", [{}, {}], lane="high")
+
+
+def test_queue_without_lanes_is_migrated(tmp_path):
+    path = tmp_path / "queue.db"
+    with sqlite3.connect(path) as conn:
+        conn.execute(
+            "CREATE TABLE job_queue (id INTEGER PRIMARY KEY AUTOINCREMENT, job_id TEXT NOT NULL, "
+            "kind TEXT NOT NULL, payload TEXT NOT NULL, status TEXT NOT NULL DEFAULT 'queued', "
+            "attempts INTEGER NOT NULL DEFAULT 0, worker TEXT, lease_expires REAL, error TEXT, "
+            "created_at REAL NOT NULL, updated_at REAL NOT NULL)"
+        )
+        conn.execute(
+            "INSERT INTO job_queue (job_id, kind, payload, created_at, updated_at) "
+            "VALUES ('job-old', 'ticket', '{}', 0, 0)"
+        )
+
+    job = make_queue(tmp_path).claim("w")
+    assert (job.job_id, job.lane) == ("job-old", "normal")
+
+
+def test_in_memory_broker_delivers_by_lane():
+    broker = InMemoryBroker()
+    broker.enqueue("batch-1", "batch_chunk", [{}], lane="bulk")
+    broker.enqueue("job-1", "ticket", [{}], lane="normal")
+    broker.enqueue("job-2", "ticket", [{}], lane="critical")
+    assert [broker._queue.get()[2].job_id for _ in range(3)] == ["job-2", "job-1", "batch-1"]
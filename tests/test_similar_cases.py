@@ -0,0 +1,85 @@
+import sys
+from pathlib import Path
+
+import numpy as np
+
+# Add the project root to sys.path
+root_dir = Path(__file__).parent.parent
+sys.path.append(str(root_dir))
+
+from src.utils.similar_cases import (
+    HashingEmbedder, SimilarCaseIndex, SimilarCases, case_from_results, format_similar_cases
+)
+
+
+def random_vectors(rows, dimensions, seed=0):
+    vectors = np.random.default_rng(seed).standard_normal((rows, dimensions)).astype(np.float32)
+    return vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+
+
+def test_index_finds_similar_text_and_excludes_self():
+    index = SimilarCaseIndex(HashingEmbedder(256))
+    texts = {
+        "t1": "Cannot access the admin dashboard, access denied after password reset",
+        "t2": "Invoice shows a double charge on my credit card this month",
+        "t3": "Admin dashboard access denied for my account",
+    }
+    for ticket_id, text in texts.items():
+        index.add(ticket_id, text, {"ticket_id": ticket_id})
+
+    matches = index.search("access denied on the admin dashboard", k=2)
+    assert {case["ticket_id"] for _, case in matches} == {"t1", "t3"}
+    assert matches[0][0] >= matches[1][0]
+    assert [case["ticket_id"] for _, case in index.search(texts["t3"], k=1, exclude="t3")] == ["t1"]
+    assert index.search("refund for a double charge", k=3, min_similarity=0.2)[0][1]["ticket_id"] == "t2"
+
+
+def test_ivf_search_agrees_with_exact_search():
+    vectors = random_vectors(5000, 32)
+    ids = [f"t{n}" for n in range(5000)]
+    cases = [{"ticket_id": ticket_id} for ticket_id in ids]
+    exact = SimilarCaseIndex(HashingEmbedder(32), ivf_threshold=10 ** 9)
+    ivf = SimilarCaseIndex(HashingEmbedder(32), ivf_threshold=1000, ivf_probes=16)
+    exact.add_vectors(ids, vectors, cases)
+    ivf.add_vectors(ids[:3000], vectors[:3000], cases[:3000])
+    ivf.add_vectors(ids[3000:], vectors[3000:], cases[3000:])
+    assert ivf.stats()["ivf_lists"] > 0
+
+    hits = 0
+    for query in random_vectors(50, 32, seed=1):
+        hits += exact.search_vector(query, k=1)[0][1] == ivf.search_vector(query, k=1)[0][1]
+    assert hits >= 40
+
+    # Replacing a ticket moves it to the list of its new vector
+    ivf.add_vectors(["t1"], vectors[4999:5000], [{"ticket_id": "t1"}])
+    assert ivf.search_vector(vectors[4999], k=2)[0][0] > 0.99
+    assert len(ivf) == 5000
+
+
+def test_completed_tickets_feed_the_index(load_database, tmp_path):
+    database = load_database(tmp_path / "cases.db")
+    database.create_job("job-1")
+    database.save_ticket({"ticket_id": "old", "conversation": "VPN disconnects every hour"}, job_id="job-1")
+    database.update_ticket_results("old", {
+        "summary": {"summary": "VPN connection drops hourly"},
+        "routing": {"team": "Technical Support"},
+        "recommendations": {"recommended_solutions": ["Update the VPN client"]},
+    })
+
+    cases = SimilarCases(SimilarCaseIndex(HashingEmbedder(256)), min_similarity=0.1)
+    assert cases.sync() == 1
+    database.add_results_listener(cases.add_ticket)
+    database.save_ticket({"ticket_id": "new", "conversation": "Billing address cannot be changed"}, job_id="job-1")
+    database.update_ticket_results("new", {"summary": {"summary": "Billing address update fails"}})
+    database.save_ticket({"ticket_id": "bad", "conversation": "VPN down"}, job_id="job-1")
+    database.update_ticket_results("bad", {"error": "Stages failed: summary"})
+    assert len(cases.index) == 2
+
+    history = cases.find("My VPN keeps disconnecting", {"summary": "VPN drops"}, exclude="new")
+    assert "Case old" in history and "Technical Support" in history and "Update the VPN client" in history
+    assert "Case new" not in history
+
+
+def test_format_similar_cases():
+    case = case_from_results("t9", {"summary": {"summary": "Login fails"}, "routing": {"team": "Security"}})
+    assert format_similar_cases([(0.912, case)]) == "- Case t9 (similarity 0.91, team Security): Login fails"
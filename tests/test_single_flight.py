@@ -0,0 +1,129 @@
+import sys
+import time
+import asyncio
+import threading
+from pathlib import Path
+
+import pytest
+
+# Add the project root to sys.path
+root_dir = Path(__file__).parent.parent
+sys.path.append(str(root_dir))
+
+from src.utils.resilience import LLMTimeoutError
+from src.utils.single_flight import SingleFlight
+
+
+def run_concurrently(count, target):
+    results = [None] * count
+
+    def run(index):
+        try:
+            results[index] = target()
+        except Exception as e:
+            results[index] = e
+
+    threads = [threading.Thread(target=run, args=(index,)) for index in range(count)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return results
+
+
+def test_identical_concurrent_calls_run_once():
+    flight = SingleFlight("test")
+    calls = []
+
+    def call():
+        calls.append(1)
+        time.sleep(0.1)
+        return "answer"
+
+    results = run_concurrently(8, lambda: flight.do("same", call))
+    assert results == ["answer"] * 8
+    assert len(calls) == 1
+    assert flight.stats() == {"leaders": 1, "followers": 7, "in_flight": 0}
+
+    # A call after the flight landed runs again
+    assert flight.do("same", call) == "answer"
+    assert len(calls) == 2
+
+
+def test_followers_share_the_leaders_error():
+    flight = SingleFlight("test")
+
+    def call():
+        time.sleep(0.1)
+        raise ValueError("backend returned garbage")
+
+    results = run_concurrently(4, lambda: flight.do("same", call))
+    assert all(isinstance(result, ValueError) for result in results)
+    assert flight.stats()["leaders"] == 1
+
+
+def test_follower_runs_the_call_when_the_leader_times_out():
+    flight = SingleFlight("test")
+    calls = []
+
+    def call():
+        calls.append(1)
+        time.sleep(0.1)
+        if len(calls) == 1:
+            raise LLMTimeoutError("Ticket deadline exceeded")
+        return "answer"
+
+    results = run_concurrently(2, lambda: flight.do("same", call))
+    assert sorted(map(repr, results)) == sorted([repr(LLMTimeoutError("Ticket deadline exceeded")), "'answer'"])
+    assert len(calls) == 2
+
+
+def test_follower_stops_waiting_at_its_deadline():
+    flight = SingleFlight("test")
+    leader = threading.Thread(target=flight.do, args=("same", lambda: time.sleep(0.3)))
+    leader.start()
+    time.sleep(0.05)
+    with pytest.raises(LLMTimeoutError):
+        flight.do("same", lambda: None, deadline=time.monotonic() + 0.05)
+    leader.join()
+
+
+def test_async_and_thread_callers_share_flights():
+    flight = SingleFlight("test")
+    calls = []
+
+    async def call():
+        calls.append(1)
+        await asyncio.sleep(0.1)
+        return "answer"
+
+    async def main():
+        thread_result = []
+        thread = threading.Thread(target=lambda: thread_result.append(flight.do("same", lambda: "thread")))
+        leader = asyncio.ensure_future(flight.ado("same", call))
+        await asyncio.sleep(0.02)
+        thread.start()
+        follower = await flight.ado("same", call)
+        await asyncio.get_running_loop().run_in_executor(None, thread.join)
+        return [await leader, follower, thread_result[0]]
+
+    assert asyncio.run(main()) == ["answer"] * 3
+    assert len(calls) == 1
+
+
+def test_cancelled_async_follower_leaves_the_flight_running():
+    flight = SingleFlight("test")
+
+    async def call():
+        await asyncio.sleep(0.1)
+        return "answer"
+
+    async def main():
+        leader = asyncio.ensure_future(flight.ado("same", call))
+        await asyncio.sleep(0.01)
+        follower = asyncio.ensure_future(flight.ado("same", call))
+        await asyncio.sleep(0.01)
+        follower.cancel()
+        return await leader
+
+    assert asyncio.run(main()) == "answer"
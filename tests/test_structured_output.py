@@ -0,0 +1,51 @@
+import sys
+from pathlib import Path
+
+# Add the project root to sys.path
+root_dir = Path(__file__).parent.parent
+sys.path.append(str(root_dir))
+
+from src.agents.summarizer_agent import SummaryResult
+from src.agents.data_product_agents import DataFlowDesign
+from src.utils.structured_output import json_schema_for, strip_format_instructions
+
+
+def test_schema_requires_every_field():
+    """Test that the derived schema lists every result field as required."""
+    schema = json_schema_for(SummaryResult)
+
+    assert schema["type"] == "object"
+    assert set(schema["required"]) == {"summary", "key_points", "action_items", "sentiment", "urgency"}
+    assert schema["properties"]["key_points"]["type"] == "array"
+
+
+def test_schema_for_nested_data_product_output():
+    """Test that nested data-product models end up in the schema definitions."""
+    schema = json_schema_for(DataFlowDesign)
+
+    assert "ingress_process" in schema["required"]
+    assert "IngressProcess" in schema["$defs"]
+
+
+def test_strip_format_instructions():
+    """Test that the prose JSON example is removed from a prompt template."""
+    template = """
+        Conversation:
+        {conversation}
+
+        Please provide your analysis in the following JSON format:
+        ```json
+        {{
+            "summary": "A concise summary of the customer conversation"
+        }}
+        ```
+        
+        Return only the JSON object with no other text before or after.
+        """
+
+    stripped = strip_format_instructions(template)
+
+    assert "Please provide your analysis as a single JSON object." in stripped
+    assert "```" not in stripped
+    assert "Return only" not in stripped
+    assert "{conversation}" in stripped